@@ -0,0 +1,66 @@
+"""
+Benchmark CLI start-up: total import time of a command in a fresh interpreter.
+
+Each run is `python -X importtime -m fresh_blt.cli COMMAND ...`, so the timings cover
+every module the command imports, and the slowest top-level imports are listed to show
+where start-up time goes. Eager imports of pandas, Faker and the grammar build once
+cost `fresh_blt info` roughly 900ms.
+
+Usage:
+    uv run python benchmarks/bench_cli_startup.py --repeat 5 info election.blt
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import subprocess
+import sys
+
+from rich.console import Console
+from rich.table import Table
+
+
+def import_times(args: list[str], env: dict[str, str]) -> dict[str, int]:
+    """Cumulative import time in microseconds of each top-level module `args` imports."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-m", "fresh_blt.cli", *args],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=True,
+    )
+    # Lines look like "import time:  self [us] | cumulative | <indent>name".
+    times: dict[str, int] = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if not name.startswith("  "):
+            times[name.strip()] = int(cumulative)
+    return times
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark CLI start-up import time.")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs; the fastest is kept")
+    parser.add_argument("--top", type=int, default=10, help="Slowest imports to list")
+    parser.add_argument("command", nargs="+", help="CLI arguments, e.g. info election.blt")
+    args = parser.parse_args()
+
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join(sys.path)}
+    runs = [import_times(args.command, env) for _ in range(args.repeat)]
+    best = min(runs, key=lambda times: sum(times.values()))
+
+    console = Console()
+    table = Table(title=f"Import time: fresh_blt {' '.join(args.command)}")
+    for column in ("Module", "Cumulative (ms)"):
+        table.add_column(column, justify="right" if column != "Module" else "left")
+    for name, microseconds in sorted(best.items(), key=lambda item: -item[1])[: args.top]:
+        table.add_row(name, f"{microseconds / 1000:.1f}")
+    table.add_row("[bold]Total[/bold]", f"[bold]{sum(best.values()) / 1000:.1f}[/bold]")
+    console.print(table)
+
+
+if __name__ == "__main__":
+    main()
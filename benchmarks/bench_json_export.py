@@ -0,0 +1,97 @@
+"""
+Benchmark JSON export throughput and size per serializer backend and schema.
+
+Usage:
+    uv run python benchmarks/bench_json_export.py --ballots 100000 --candidates 10
+"""
+
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+from typing import Any
+
+from faker import Faker
+from rich.console import Console
+from rich.table import Table
+
+from fresh_blt import export
+from fresh_blt.export import JSON_SCHEMAS, export_to_json
+from fresh_blt.fixtures import BLTProvider
+from fresh_blt.models.candidate import Candidate
+from fresh_blt.serializers import JSON_BACKENDS, get_json_backend
+
+
+def make_election(
+    num_candidates: int, num_ballots: int, seed: int
+) -> tuple[dict[str, Any], list[Candidate], list[dict[str, Any]]]:
+    """Generate election data in the shape returned by `load_blt`, without parsing."""
+    faker = Faker()
+    faker.seed_instance(seed)
+    faker.add_provider(BLTProvider)
+    data = faker.election(num_candidates=num_candidates, num_ballots=num_ballots)
+
+    candidates = [Candidate.from_dict(c) for c in data["candidates"]]
+    lookup = {c.id: c for c in candidates}
+    ballots = [
+        {
+            "weight": b["weight"],
+            "rankings": [[lookup[c["id"]] for c in level] for level in b["rankings"]],
+        }
+        for b in data["ballots"]
+    ]
+    election_info = {
+        "title": data["name"],
+        "num_candidates": num_candidates,
+        "num_positions": data["num_seats"],
+        "withdrawn_candidate_ids": [c.id for c in candidates if c.withdrawn],
+        "total_ballots": len(ballots),
+        "total_votes": sum(b["weight"] for b in ballots),
+    }
+    return election_info, candidates, ballots
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--ballots", type=int, default=50_000)
+    parser.add_argument("--candidates", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per case; the best is kept")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    console = Console()
+    console.print(f"Generating {args.ballots} ballots, {args.candidates} candidates...")
+    election = make_election(args.candidates, args.ballots, args.seed)
+    export.console.quiet = True
+
+    table = Table(title=f"JSON export, {args.ballots} ballots")
+    for column in ("Backend", "Schema", "Size (MB)", "Best time (s)", "MB/s"):
+        table.add_column(column, justify="right" if column != "Backend" else "left")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        output_path = Path(tmp_dir) / "export.json"
+        for backend in JSON_BACKENDS:
+            try:
+                get_json_backend(backend)
+            except ImportError:
+                table.add_row(backend, "-", "not installed", "-", "-")
+                continue
+            for schema in JSON_SCHEMAS:
+                timings = []
+                for _ in range(args.repeat):
+                    start = time.perf_counter()
+                    export_to_json(*election, output_path, schema=schema, backend=backend)
+                    timings.append(time.perf_counter() - start)
+                size_mb = output_path.stat().st_size / 1e6
+                best = min(timings)
+                table.add_row(
+                    backend, schema, f"{size_mb:.2f}", f"{best:.3f}", f"{size_mb / best:.1f}"
+                )
+
+    console.print(table)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+Benchmark .blt parser start-up with and without the compiled grammar cache.
+
+Each case runs in fresh interpreters, so the timings include everything a new CLI
+process or pool worker pays before it can parse.
+
+Usage:
+    uv run python benchmarks/bench_parser_startup.py --repeat 5 --workers 8
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from rich.console import Console
+from rich.table import Table
+
+from fresh_blt.cache import CACHE_DIR_ENV
+
+# Prints how long building the parser took in a new interpreter.
+BUILD_SNIPPET = """
+import time
+start = time.perf_counter()
+from fresh_blt.grammar import build_blt_parser
+build_blt_parser(cache={cache})
+print(time.perf_counter() - start)
+"""
+
+
+def time_build(cache: bool, env: dict[str, str]) -> float:
+    """Seconds to import the grammar module and build the parser in a new interpreter."""
+    result = subprocess.run(
+        [sys.executable, "-c", BUILD_SNIPPET.format(cache=cache)],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=True,
+    )
+    return float(result.stdout)
+
+
+def _build_in_worker(cache: bool) -> None:
+    from fresh_blt.grammar import build_blt_parser
+
+    build_blt_parser(cache=cache)
+
+
+def time_pool(cache: bool, workers: int) -> float:
+    """Seconds for a fresh spawn-based pool to have a parser ready in every worker."""
+    import multiprocessing
+
+    start = time.perf_counter()
+    with ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+        list(pool.map(_build_in_worker, [cache] * workers))
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per case; the best is kept")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    console = Console()
+    table = Table(title="Parser start-up")
+    for column in ("Case", "Best time (ms)"):
+        table.add_column(column, justify="right" if column != "Case" else "left")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        os.environ[CACHE_DIR_ENV] = tmp_dir
+        env = {**os.environ, "PYTHONPATH": os.pathsep.join(sys.path)}
+
+        uncached = min(time_build(False, env) for _ in range(args.repeat))
+        time_build(True, env)  # populate the cache
+        cached = min(time_build(True, env) for _ in range(args.repeat))
+        table.add_row("New process, grammar analysis", f"{uncached * 1000:.1f}")
+        table.add_row("New process, cached tables", f"{cached * 1000:.1f}")
+
+        for cache in (False, True):
+            best = min(time_pool(cache, args.workers) for _ in range(args.repeat))
+            label = "cached tables" if cache else "grammar analysis"
+            table.add_row(f"{args.workers}-worker pool, {label}", f"{best * 1000:.1f}")
+
+    console.print(table)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,363 @@
+"""
+Benchmark suite: per-stage time, throughput and peak memory over seeded corpora.
+
+Each case is a generated .blt file of a given size, candidate count and tie density,
+or with `--stress`, one of the adversarial corpora in `fresh_blt.fixtures.stress`
+(thousands of candidates, 500-deep rankings, huge tie groups, long names, huge
+weights, many withdrawn candidates, CRLF line endings). The suite validates and scans
+the file, loads it and runs the pipeline stages on the result, recording every stage
+instrumented with `fresh_blt.timing.stage`, nested ones included. Timings are the best
+of `--repeat` runs without memory tracing; peak memory comes from one extra run under
+`tracemalloc`. Results are written to a JSON file, which `compare` checks against a
+saved baseline.
+
+Usage:
+    uv run python benchmarks/bench_suite.py run --preset standard -o results.json
+    uv run python benchmarks/bench_suite.py run --preset quick --baseline baseline.json
+    uv run python benchmarks/bench_suite.py run --stress all --repeat 1 -o stress.json
+    uv run python benchmarks/bench_suite.py compare baseline.json results.json --threshold 0.1
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import sys
+import tempfile
+import time
+from collections.abc import Callable
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+from rich.console import Console
+from rich.table import Table
+
+from fresh_blt import export
+from fresh_blt.export import (
+    export_to_csv,
+    export_to_dataframes,
+    export_to_json,
+    write_blt,
+    write_blt_stream,
+)
+from fresh_blt.fixtures.stress import STRESS_PROFILES, write_stress_profile
+from fresh_blt.fixtures.vectorized import iter_ballot_arrays
+from fresh_blt.metadata import load_blt_metadata
+from fresh_blt.parse import load_blt
+from fresh_blt.stats import compute_stats
+from fresh_blt.timing import Timings, collect_timings, stage
+from fresh_blt.validate import validate_blt
+
+RESULTS_FORMAT_VERSION = 1
+DEFAULT_CORPUS_DIR = Path(__file__).parent / ".corpora"
+
+# Ballot counts per preset; each is run for every candidate count and tie rate.
+PRESETS = {
+    "quick": [1_000, 10_000],
+    "standard": [1_000, 10_000, 100_000, 1_000_000],
+    "full": [1_000, 10_000, 100_000, 1_000_000, 10_000_000],
+}
+
+# Stages reading the file itself, run before loading it.
+FILE_STAGES: dict[str, Callable[[Path], object]] = {
+    "validate_blt": validate_blt,
+    "load_blt_metadata": load_blt_metadata,
+}
+
+# Ballot-level pipeline stages after loading. The repo has no tabulation engine yet;
+# `compute_stats` is the aggregation pass. Add tabulators here as they land.
+PIPELINE: dict[str, Callable[[tuple[Any, Any, Any], Path], object]] = {
+    "export_to_json": lambda election, out: export_to_json(*election, out / "election.json"),
+    "export_to_csv": lambda election, out: export_to_csv(*election, out / "election"),
+    "export_to_dataframes": lambda election, out: export_to_dataframes(*election),
+    "write_blt": lambda election, out: write_blt(*election, out / "election.blt"),
+    "compute_stats": lambda election, out: compute_stats(election[1], election[2]),
+}
+
+# Stages reported in MB/s of the input file as well as ballots/s.
+INPUT_BOUND_STAGES = {"load_blt", "parse_blt_file", *FILE_STAGES}
+
+
+def corpus_path(
+    corpus_dir: Path, ballots: int, candidates: int, tie_rate: float, seed: int
+) -> Path:
+    """Generate the case's .blt file unless it already exists, and return its path."""
+    path = corpus_dir / f"b{ballots}_c{candidates}_t{tie_rate:g}_s{seed}.blt"
+    if not path.exists():
+        corpus_dir.mkdir(parents=True, exist_ok=True)
+        rng = np.random.default_rng([seed, ballots, candidates, int(tie_rate * 1000)])
+        tmp_path = path.with_name(f"{path.name}.tmp")
+        write_blt_stream(
+            tmp_path,
+            f"Benchmark {ballots} ballots",
+            [f"Candidate {i}" for i in range(1, candidates + 1)],
+            iter_ballot_arrays(candidates, ballots, rng, tie_rate=tie_rate),
+        )
+        tmp_path.replace(path)
+    return path
+
+
+def stress_corpus_path(corpus_dir: Path, profile: str, seed: int) -> Path:
+    """Generate the stress profile's .blt file unless it already exists, and return its path."""
+    path = corpus_dir / f"stress_{profile}_s{seed}.blt"
+    if not path.exists():
+        corpus_dir.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f"{path.name}.tmp")
+        write_stress_profile(tmp_path, profile, seed)
+        tmp_path.replace(path)
+    return path
+
+
+def run_pipeline(path: Path, out_dir: Path, trace_memory: bool) -> Timings:
+    """Run every stage once on the corpus at `path`."""
+    with collect_timings(trace_memory=trace_memory) as timings:
+        for name, run_file in FILE_STAGES.items():
+            with stage(name):
+                run_file(path)
+        with stage("load_blt"):
+            election = load_blt(path, use_cache=False)
+        for name, run in PIPELINE.items():
+            with stage(name):
+                run(election, out_dir)
+        del election
+    return timings
+
+
+def run_case(path: Path, ballots: int, repeat: int, memory: bool) -> dict[str, Any]:
+    """Benchmark one corpus: best-of-`repeat` timings plus, if `memory`, peak memory."""
+    file_mb = path.stat().st_size / 1e6
+    best: dict[str, dict[str, Any]] = {}
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        runs = [run_pipeline(path, Path(tmp_dir), trace_memory=False) for _ in range(repeat)]
+        traced = run_pipeline(path, Path(tmp_dir), trace_memory=True) if memory else None
+
+    for timings in runs:
+        for name in dict.fromkeys(metrics.name for metrics in timings.stages):
+            # Total over the stage's runs; a stage wrapping a same-named one counts once.
+            depth = min(metrics.depth for metrics in timings.by_name(name))
+            runs_of_stage = [m for m in timings.by_name(name) if m.depth == depth]
+            wall = sum(m.wall_seconds for m in runs_of_stage)
+            if name not in best or wall < best[name]["wall_seconds"]:
+                best[name] = {
+                    "depth": depth,
+                    "wall_seconds": wall,
+                    "cpu_seconds": sum(m.cpu_seconds for m in runs_of_stage),
+                }
+
+    for name, result in best.items():
+        wall = result["wall_seconds"]
+        result["ballots_per_second"] = ballots / wall if wall else None
+        if name in INPUT_BOUND_STAGES:
+            result["mb_per_second"] = file_mb / wall if wall else None
+        if traced is not None:
+            result["peak_memory_bytes"] = max(
+                (m.peak_memory_bytes or 0 for m in traced.by_name(name)), default=None
+            )
+    return {"file_bytes": path.stat().st_size, "stages": best}
+
+
+def run_suite(args: argparse.Namespace) -> dict[str, Any]:
+    console = Console(stderr=True)
+    export.console.quiet = True
+    cases = []
+
+    def run(name: str, make_corpus: Callable[[], Path], ballots: int, **details: Any) -> None:
+        console.print(f"[bold]{name}[/bold]")
+        start = time.perf_counter()
+        path = make_corpus()
+        console.print(f"  corpus ready in {time.perf_counter() - start:.1f}s")
+        result = run_case(path, ballots, args.repeat, args.memory)
+        cases.append({"name": name, "ballots": ballots, **details, **result})
+
+    if args.stress:
+        for profile in args.stress:
+            settings = STRESS_PROFILES[profile]
+            run(
+                f"stress {profile}",
+                lambda profile=profile: stress_corpus_path(args.corpus_dir, profile, args.seed),
+                settings["num_ballots"],
+                candidates=settings["num_candidates"],
+                stress_profile=profile,
+            )
+    else:
+        for ballots in args.ballots or PRESETS[args.preset]:
+            for candidates in args.candidates:
+                for tie_rate in args.tie_rates:
+                    run(
+                        f"{ballots} ballots, {candidates} candidates, ties {tie_rate:g}",
+                        lambda b=ballots, c=candidates, t=tie_rate: corpus_path(
+                            args.corpus_dir, b, c, t, args.seed
+                        ),
+                        ballots,
+                        candidates=candidates,
+                        tie_rate=tie_rate,
+                    )
+    return {
+        "version": RESULTS_FORMAT_VERSION,
+        "created": datetime.now(UTC).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "seed": args.seed,
+        "repeat": args.repeat,
+        "cases": cases,
+    }
+
+
+def results_table(results: dict[str, Any]) -> Table:
+    table = Table(title="Benchmark results")
+    for column in ("Case", "Stage", "Time (s)", "Ballots/s", "MB/s", "Peak memory (MB)"):
+        table.add_column(column, justify="left" if column in ("Case", "Stage") else "right")
+    for case in results["cases"]:
+        for i, (name, metrics) in enumerate(case["stages"].items()):
+            peak = metrics.get("peak_memory_bytes")
+            mb_per_second = metrics.get("mb_per_second")
+            table.add_row(
+                case["name"] if i == 0 else "",
+                "  " * metrics["depth"] + name,
+                f"{metrics['wall_seconds']:.3f}",
+                f"{metrics['ballots_per_second']:,.0f}" if metrics["ballots_per_second"] else "-",
+                f"{mb_per_second:.1f}" if mb_per_second else "",
+                f"{peak / 1e6:.1f}" if peak is not None else "-",
+            )
+    return table
+
+
+def compare_results(
+    baseline: dict[str, Any], current: dict[str, Any], threshold: float, min_seconds: float
+) -> tuple[Table, list[str]]:
+    """
+    Compare stage times and peak memory per case. A stage regresses when it got more
+    than `threshold` slower (or larger) than the baseline; stages faster than
+    `min_seconds` in both runs are too noisy to judge on time.
+    """
+    table = Table(title=f"Comparison (regression threshold {threshold:.0%})")
+    for column in ("Case", "Stage", "Baseline (s)", "Current (s)", "Time", "Peak memory"):
+        table.add_column(column, justify="left" if column in ("Case", "Stage") else "right")
+
+    baseline_cases = {case["name"]: case for case in baseline["cases"]}
+    regressions = []
+    for case in current["cases"]:
+        base_case = baseline_cases.get(case["name"])
+        if base_case is None:
+            continue
+        for name, metrics in case["stages"].items():
+            base = base_case["stages"].get(name)
+            if base is None:
+                continue
+            time_change = metrics["wall_seconds"] / base["wall_seconds"] - 1
+            slower = (
+                time_change > threshold
+                and max(metrics["wall_seconds"], base["wall_seconds"]) >= min_seconds
+            )
+            memory_cell = "-"
+            larger = False
+            if metrics.get("peak_memory_bytes") and base.get("peak_memory_bytes"):
+                memory_change = metrics["peak_memory_bytes"] / base["peak_memory_bytes"] - 1
+                larger = memory_change > threshold
+                memory_cell = f"{memory_change:+.0%}"
+                if larger:
+                    memory_cell = f"[red]{memory_cell}[/red]"
+                    regressions.append(f"{case['name']}: {name} peak memory {memory_change:+.0%}")
+            time_cell = f"{time_change:+.0%}"
+            if slower:
+                time_cell = f"[red]{time_cell}[/red]"
+                regressions.append(f"{case['name']}: {name} time {time_change:+.0%}")
+            table.add_row(
+                case["name"],
+                "  " * metrics["depth"] + name,
+                f"{base['wall_seconds']:.3f}",
+                f"{metrics['wall_seconds']:.3f}",
+                time_cell,
+                memory_cell,
+            )
+    return table, regressions
+
+
+def report_comparison(
+    baseline_path: Path, current: dict[str, Any], threshold: float, min_seconds: float
+) -> int:
+    console = Console()
+    baseline = json.loads(baseline_path.read_text(encoding="utf-8"))
+    table, regressions = compare_results(baseline, current, threshold, min_seconds)
+    console.print(table)
+    if regressions:
+        console.print(f"[red]✗ {len(regressions)} regressions against {baseline_path}:[/red]")
+        for regression in regressions:
+            console.print(f"  {regression}")
+        return 1
+    console.print(f"[green]✓ No regressions against {baseline_path}[/green]")
+    return 0
+
+
+def comma_separated(kind: type) -> Callable[[str], list[Any]]:
+    def parse(value: str) -> list[Any]:
+        return [kind(float(item)) if kind is int else kind(item) for item in value.split(",")]
+
+    return parse
+
+
+def stress_profiles(value: str) -> list[str]:
+    profiles = list(STRESS_PROFILES) if value == "all" else value.split(",")
+    unknown = [profile for profile in profiles if profile not in STRESS_PROFILES]
+    if unknown:
+        raise argparse.ArgumentTypeError(f"unknown stress profiles: {', '.join(unknown)}")
+    return profiles
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="Run the suite and write a results file")
+    run.add_argument("--preset", choices=PRESETS, default="quick", help="Ballot counts to run")
+    run.add_argument(
+        "--ballots",
+        type=comma_separated(int),
+        help="Ballot counts, e.g. 1e3,1e5 (overrides preset)",
+    )
+    run.add_argument("--candidates", type=comma_separated(int), default=[5, 20])
+    run.add_argument("--tie-rates", type=comma_separated(float), default=[0.0, 0.3])
+    run.add_argument(
+        "--stress",
+        type=stress_profiles,
+        help=f"Run stress corpora instead: all, or some of {','.join(STRESS_PROFILES)}",
+    )
+    run.add_argument("--repeat", type=int, default=3, help="Runs per case; the best is kept")
+    run.add_argument("--seed", type=int, default=42)
+    run.add_argument(
+        "--no-memory", dest="memory", action="store_false", help="Skip the peak memory run"
+    )
+    run.add_argument("--corpus-dir", type=Path, default=DEFAULT_CORPUS_DIR)
+    run.add_argument("-o", "--output", type=Path, default=Path("bench_results.json"))
+    run.add_argument("--baseline", type=Path, help="Compare the results against this file")
+
+    compare = commands.add_parser("compare", help="Flag regressions between two results files")
+    compare.add_argument("baseline", type=Path)
+    compare.add_argument("current", type=Path)
+
+    for command in (run, compare):
+        command.add_argument(
+            "--threshold", type=float, default=0.1, help="Relative slowdown that is a regression"
+        )
+        command.add_argument(
+            "--min-seconds", type=float, default=0.05, help="Ignore times below this as noise"
+        )
+    args = parser.parse_args()
+
+    if args.command == "compare":
+        current = json.loads(args.current.read_text(encoding="utf-8"))
+        sys.exit(report_comparison(args.baseline, current, args.threshold, args.min_seconds))
+
+    results = run_suite(args)
+    args.output.write_text(json.dumps(results, indent=2), encoding="utf-8")
+    Console().print(results_table(results))
+    Console(stderr=True).print(f"Results written to {args.output}")
+    if args.baseline is not None:
+        sys.exit(report_comparison(args.baseline, results, args.threshold, args.min_seconds))
+
+
+if __name__ == "__main__":
+    main()
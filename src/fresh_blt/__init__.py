@@ -1,14 +1,8 @@
 import logging
 
-# Configure system-wide logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    datefmt='%Y-%m-%d %H:%M:%S'
-)
-
-# Set up logger for the package
+# Set up logger for the package; applications (like the CLI) configure handlers and levels
 logger = logging.getLogger(__name__)
+logger.addHandler(logging.NullHandler())
 
 
 def main():
@@ -18,8 +12,14 @@ def main():
     return _main()
 
 
-# Import fixtures for easy access
-from .fixtures import BLTGenerators, BLTProvider
+def __getattr__(name: str):
+    # Fixtures pull in Faker, so they are imported on first access instead of with the package.
+    if name in ("BLTProvider", "BLTGenerators"):
+        from . import fixtures
+
+        return getattr(fixtures, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 __all__ = [
     "models",
@@ -0,0 +1,118 @@
+"""
+Batch export of many .blt files.
+
+Each contest is loaded and exported in its own worker process, so parsing, which is
+CPU-bound, runs in parallel across contests.
+"""
+
+from __future__ import annotations
+
+import logging
+from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from fresh_blt.compression import COMPRESSION_SUFFIXES, COMPRESSIONS
+from fresh_blt.export import EXPORT_SUFFIXES, console, export_with_format
+from fresh_blt.parse import load_blt
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class BatchResult:
+    """Outcome of exporting one contest. `error` is set instead of raising on failure."""
+
+    source: Path
+    outputs: list[Path] = field(default_factory=list)
+    error: str | None = None
+
+
+def find_blt_files(directory: Path) -> list[Path]:
+    """List the .blt files, compressed or not, directly inside `directory`, sorted by name."""
+    patterns = ["*.blt", *(f"*.blt{suffix}" for suffix in COMPRESSION_SUFFIXES.values())]
+    return sorted(
+        path for pattern in patterns for path in directory.glob(pattern) if path.is_file()
+    )
+
+
+def contest_name(source: Path) -> str:
+    """Name of a contest file without its .blt and compression suffixes."""
+    name = source.name
+    for suffix in COMPRESSION_SUFFIXES.values():
+        name = name.removesuffix(suffix)
+    return name.removesuffix(".blt")
+
+
+def export_file(
+    source: Path,
+    output_dir: Path,
+    format: str,
+    canonicalize: bool = False,
+    json_schema: str = "full",
+    compression: str | None = None,
+) -> BatchResult:
+    """Load and export a single contest into `output_dir`, named after its source file."""
+    output_path = output_dir / f"{contest_name(source)}{EXPORT_SUFFIXES[format.lower()]}"
+    try:
+        election_info, candidates, ballots = load_blt(source)
+        result = export_with_format(
+            election_info,
+            candidates,
+            ballots,
+            output_path,
+            format,
+            canonicalize,
+            json_schema,
+            compression,
+        )
+    except Exception as e:
+        logger.error(f"Failed to export {source}: {e}")
+        return BatchResult(source=source, error=str(e))
+
+    outputs = result if isinstance(result, list) else [result]
+    return BatchResult(source=source, outputs=outputs)
+
+
+def _silence_worker_console() -> None:
+    # Per-file messages from workers would interleave with the parent's progress display.
+    console.quiet = True
+
+
+def export_batch(
+    sources: list[Path],
+    output_dir: Path,
+    format: str,
+    canonicalize: bool = False,
+    json_schema: str = "full",
+    compression: str | None = None,
+    workers: int | None = None,
+) -> Iterator[BatchResult]:
+    """
+    Export `sources` into `output_dir` across a process pool of `workers` processes
+    (default: one per CPU). Results are yielded in completion order.
+    """
+    if format.lower() not in EXPORT_SUFFIXES:
+        raise ValueError(f"Unsupported format: {format}. Use 'json', 'csv' or 'blt'.")
+    if compression is not None and compression not in COMPRESSIONS:
+        raise ValueError(
+            f"Unsupported compression: {compression}. Use {', '.join(map(repr, COMPRESSIONS))}."
+        )
+
+    output_dir.mkdir(parents=True, exist_ok=True)
+    with ProcessPoolExecutor(max_workers=workers, initializer=_silence_worker_console) as pool:
+        futures = [
+            pool.submit(
+                export_file,
+                source,
+                output_dir,
+                format,
+                canonicalize,
+                json_schema,
+                compression,
+            )
+            for source in sources
+        ]
+        for future in as_completed(futures):
+            yield future.result()
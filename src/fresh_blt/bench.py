@@ -0,0 +1,331 @@
+"""
+On-host benchmark for capacity planning.
+
+`run_bench` generates a synthetic election through the fixtures, then times each stage
+of the pipeline on it (parse, load from the binary cache, statistics, JSON and CSV
+export) and reports ballots and megabytes per second. It then exports copies of a
+smaller sample with increasing worker counts to see how the parallel paths (`export
+--batch`, `watch`, `serve`, `generate`) scale on this machine, and recommends a worker
+count from that scaling and the memory a worker needs, measured with `tracemalloc`
+on a second parse.
+
+Everything runs locally, in a temporary directory.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import shutil
+import tempfile
+import time
+import tracemalloc
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any
+
+# A worker count is worth it while it gets at least this share of the best throughput.
+SCALING_EFFICIENCY = 0.9
+# Share of available memory the recommended workers may use between them.
+MEMORY_HEADROOM = 0.8
+SCALING_SAMPLE_BALLOTS = 2000
+
+
+@dataclass
+class StageResult:
+    """Time for one stage, with the number of bytes it read or wrote if meaningful."""
+
+    name: str
+    seconds: float
+    ballots: int
+    bytes: int | None = None
+
+    @property
+    def ballots_per_second(self) -> float:
+        return self.ballots / self.seconds if self.seconds else float("inf")
+
+    @property
+    def mb_per_second(self) -> float | None:
+        if self.bytes is None:
+            return None
+        return self.bytes / 1e6 / self.seconds if self.seconds else float("inf")
+
+
+@dataclass
+class ScalingResult:
+    """Throughput of a batch export of `files` sample files with `workers` processes."""
+
+    workers: int
+    files: int
+    seconds: float
+
+    @property
+    def files_per_second(self) -> float:
+        return self.files / self.seconds if self.seconds else float("inf")
+
+
+@dataclass
+class BenchReport:
+    """Everything `run_bench` measured, with its worker recommendation."""
+
+    ballots: int
+    candidates: int
+    file_bytes: int
+    cpu_count: int
+    stages: list[StageResult] = field(default_factory=list)
+    scaling: list[ScalingResult] = field(default_factory=list)
+    memory_per_worker: int | None = None
+    available_memory: int | None = None
+    recommended_workers: int = 1
+    recommendation: str = ""
+
+    def to_dict(self) -> dict[str, Any]:
+        """JSON-ready form of the report, throughputs included."""
+        report = asdict(self)
+        for stage, result in zip(self.stages, report["stages"], strict=True):
+            result["ballots_per_second"] = stage.ballots_per_second
+            result["mb_per_second"] = stage.mb_per_second
+        for scaling, result in zip(self.scaling, report["scaling"], strict=True):
+            result["files_per_second"] = scaling.files_per_second
+        return report
+
+
+def _timed(func: Callable[[], Any]) -> tuple[Any, float]:
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+
+
+def _traced_peak(func: Callable[[], Any]) -> int:
+    """Peak memory traced by `tracemalloc` while `func` ran, above what was in use before."""
+    started = not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        before = tracemalloc.get_traced_memory()[0]
+        func()
+        return tracemalloc.get_traced_memory()[1] - before
+    finally:
+        if started:
+            tracemalloc.stop()
+
+
+def available_memory() -> int | None:
+    """Memory currently available to new processes in bytes, where the platform reports it."""
+    try:
+        return os.sysconf("SC_AVPHYS_PAGES") * os.sysconf("SC_PAGE_SIZE")
+    except (AttributeError, ValueError, OSError):
+        return None
+
+
+def worker_counts(max_workers: int) -> list[int]:
+    """1, 2, 4, ... up to and including `max_workers`."""
+    counts = []
+    workers = 1
+    while workers < max_workers:
+        counts.append(workers)
+        workers *= 2
+    counts.append(max_workers)
+    return counts
+
+
+def recommend_workers(
+    scaling: list[ScalingResult],
+    memory_per_worker: int | None,
+    available: int | None,
+) -> tuple[int, str]:
+    """
+    The fewest workers reaching `SCALING_EFFICIENCY` of the best measured throughput,
+    capped so that that many workers fit in `MEMORY_HEADROOM` of the available memory.
+
+    Returns:
+        Tuple of (worker count, reason)
+    """
+    if not scaling:
+        return 1, "no scaling measurements"
+    best = max(result.files_per_second for result in scaling)
+    workers = min(
+        result.workers for result in scaling if result.files_per_second >= SCALING_EFFICIENCY * best
+    )
+    reason = (
+        f"{workers} {'worker reaches' if workers == 1 else 'workers reach'} "
+        f"{SCALING_EFFICIENCY:.0%} of the best measured throughput"
+    )
+
+    if memory_per_worker and available:
+        fit = max(1, int(available * MEMORY_HEADROOM // memory_per_worker))
+        if fit < workers:
+            workers = fit
+            reason = (
+                f"only {fit} {'worker fits' if fit == 1 else 'workers fit'} in {MEMORY_HEADROOM:.0%} of available memory "
+                f"at about {memory_per_worker / 2**20:.0f} MiB each for files this size"
+            )
+    return workers, reason
+
+
+def measure_scaling(
+    source: Path, directory: Path, max_workers: int, counts: list[int] | None = None
+) -> list[ScalingResult]:
+    """Batch-export `2 * max_workers` copies of `source` once per worker count."""
+    from fresh_blt.batch import export_batch
+
+    copies = []
+    for i in range(2 * max_workers):
+        copy = directory / f"sample_{i}.blt"
+        shutil.copyfile(source, copy)
+        copies.append(copy)
+
+    results = []
+    for workers in counts or worker_counts(max_workers):
+        output_dir = directory / f"scaling_{workers}"
+        start = time.perf_counter()
+        outcomes = list(export_batch(copies, output_dir, "json", workers=workers))
+        seconds = time.perf_counter() - start
+        failed = [outcome for outcome in outcomes if outcome.error is not None]
+        if failed:
+            raise RuntimeError(f"Batch export failed: {failed[0].error}")
+        results.append(ScalingResult(workers, len(copies), seconds))
+        shutil.rmtree(output_dir)
+    return results
+
+
+def run_bench(
+    num_ballots: int,
+    num_candidates: int,
+    seed: int = 0,
+    max_workers: int | None = None,
+    directory: Path | None = None,
+    on_stage: Callable[[str], None] | None = None,
+) -> BenchReport:
+    """
+    Benchmark the pipeline on a generated election of `num_ballots` ballots.
+
+    Args:
+        num_ballots: Ballots in the generated election
+        num_candidates: Candidates in the generated election
+        seed: Seed for the generated election
+        max_workers: Most workers to try for the parallel paths (default: one per CPU)
+        directory: Where to write the files (default: a temporary directory)
+        on_stage: Called with each step's name before it runs, e.g. to show progress
+
+    Returns:
+        The measurements and worker recommendation
+    """
+    if directory is None:
+        with tempfile.TemporaryDirectory(prefix="fresh_blt_bench_") as tmp_dir:
+            return run_bench(
+                num_ballots, num_candidates, seed, max_workers, Path(tmp_dir), on_stage
+            )
+    with _isolated(directory):
+        return _run_bench(num_ballots, num_candidates, seed, max_workers, directory, on_stage)
+
+
+@contextmanager
+def _isolated(directory: Path) -> Iterator[None]:
+    """
+    Keep the benchmark's cache files in `directory` and its per-file log messages and
+    export notices out of the output (and the timings), for this process and its workers.
+    """
+    from fresh_blt.cache import CACHE_DIR_ENV
+    from fresh_blt.export import console
+
+    package_logger = logging.getLogger("fresh_blt")
+    saved = (os.environ.get(CACHE_DIR_ENV), package_logger.level, console.quiet)
+    os.environ[CACHE_DIR_ENV] = str(directory / "cache")
+    if package_logger.getEffectiveLevel() < logging.WARNING:
+        package_logger.setLevel(logging.WARNING)
+    console.quiet = True
+    try:
+        yield
+    finally:
+        cache_dir, level, quiet = saved
+        if cache_dir is None:
+            os.environ.pop(CACHE_DIR_ENV, None)
+        else:
+            os.environ[CACHE_DIR_ENV] = cache_dir
+        package_logger.setLevel(level)
+        console.quiet = quiet
+
+
+def _run_bench(
+    num_ballots: int,
+    num_candidates: int,
+    seed: int,
+    max_workers: int | None,
+    directory: Path,
+    on_stage: Callable[[str], None] | None,
+) -> BenchReport:
+    from fresh_blt.cache import write_cache
+    from fresh_blt.export import export_to_csv, export_to_json
+    from fresh_blt.fixtures.generators import seeded_faker
+    from fresh_blt.parse import load_blt
+    from fresh_blt.stats import compute_stats
+
+    notify = on_stage or (lambda name: None)
+    cpu_count = os.cpu_count() or 1
+    max_workers = max_workers or cpu_count
+    path = directory / "bench.blt"
+    stages = []
+
+    notify("generate")
+    faker = seeded_faker(seed)
+    _, seconds = _timed(lambda: faker.stream_blt_file(path, num_candidates, num_ballots))
+    file_bytes = path.stat().st_size
+    stages.append(StageResult("generate", seconds, num_ballots, file_bytes))
+
+    notify("parse")
+    parsed, seconds = _timed(lambda: load_blt(path, use_cache=False))
+    stages.append(StageResult("parse", seconds, num_ballots, file_bytes))
+
+    notify("load")
+    cache_bytes = write_cache(path, *parsed).stat().st_size
+    del parsed
+    (info, candidates, ballots), seconds = _timed(lambda: load_blt(path))
+    stages.append(StageResult("load (binary cache)", seconds, num_ballots, cache_bytes))
+
+    notify("stats")
+    _, seconds = _timed(lambda: compute_stats(candidates, ballots))
+    stages.append(StageResult("stats", seconds, num_ballots))
+
+    notify("export json")
+    json_path, seconds = _timed(
+        lambda: export_to_json(info, candidates, ballots, directory / "bench.json")
+    )
+    stages.append(StageResult("export json", seconds, num_ballots, json_path.stat().st_size))
+
+    notify("export csv")
+    csv_paths, seconds = _timed(
+        lambda: export_to_csv(info, candidates, ballots, directory / "bench")
+    )
+    csv_bytes = sum(csv_path.stat().st_size for csv_path in csv_paths)
+    stages.append(StageResult("export csv", seconds, num_ballots, csv_bytes))
+
+    # A worker holds one parsed file at a time, so it needs about what parsing this one
+    # takes. Traced on a separate parse, since tracing slows the timed one down.
+    notify("parse memory")
+    memory_per_worker = _traced_peak(lambda: load_blt(path, use_cache=False))
+
+    notify("scaling")
+    sample = directory / "sample.blt"
+    seeded_faker(seed).stream_blt_file(
+        sample, num_candidates, min(num_ballots, SCALING_SAMPLE_BALLOTS)
+    )
+    scaling = measure_scaling(sample, directory, max_workers)
+
+    available = available_memory()
+    workers, reason = recommend_workers(scaling, memory_per_worker, available)
+    return BenchReport(
+        ballots=num_ballots,
+        candidates=num_candidates,
+        file_bytes=file_bytes,
+        cpu_count=cpu_count,
+        stages=stages,
+        scaling=scaling,
+        memory_per_worker=memory_per_worker,
+        available_memory=available,
+        recommended_workers=workers,
+        recommendation=reason,
+    )
@@ -0,0 +1,150 @@
+"""
+Binary cache of parsed .blt files.
+
+A cache file is an uncompressed `.npz` archive holding the `BallotArrays` of an
+election plus a JSON metadata record (format version, source fingerprint, election
+info and candidates). Loading one skips the grammar parse entirely, and the ballots
+stay in their arrays until something reads them as dicts. Weights outside
+the int64 range are stored as decimal strings, since `.npz` cannot hold Python
+integers without pickling.
+
+Cache files live in a per-user directory and are named after the source path. A
+cache is only used while the source path, size, mtime and content hash all still
+match the fingerprint recorded when it was written.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+from collections.abc import Sequence
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from fresh_blt.timing import stage
+
+if TYPE_CHECKING:
+    from fresh_blt.models.candidate import Candidate
+
+logger = logging.getLogger(__name__)
+
+CACHE_FORMAT_VERSION = 2
+CACHE_SUFFIX = ".bltc.npz"
+CACHE_DIR_ENV = "FRESH_BLT_CACHE_DIR"
+
+_ARRAY_FIELDS = ("weights", "level_offsets", "id_offsets", "candidate_ids")
+
+
+def cache_dir() -> Path:
+    """
+    User cache directory for fresh_blt. Honors `FRESH_BLT_CACHE_DIR`, then
+    `XDG_CACHE_HOME`, then falls back to `~/.cache/fresh_blt`.
+    """
+    if override := os.environ.get(CACHE_DIR_ENV):
+        return Path(override)
+    xdg_cache = os.environ.get("XDG_CACHE_HOME")
+    base = Path(xdg_cache) if xdg_cache else Path.home() / ".cache"
+    return base / "fresh_blt"
+
+
+def cache_path_for(blt_path: Path) -> Path:
+    """Location of the cache file for `blt_path`."""
+    key = hashlib.sha256(str(blt_path.resolve()).encode("utf-8")).hexdigest()[:32]
+    return cache_dir() / f"{key}{CACHE_SUFFIX}"
+
+
+def fingerprint(blt_path: Path) -> dict[str, Any]:
+    """Identity of a source file: resolved path, size, mtime and SHA-256 of its content."""
+    stat = blt_path.stat()
+    with open(blt_path, "rb") as f:
+        digest = hashlib.file_digest(f, "sha256").hexdigest()
+    return {
+        "path": str(blt_path.resolve()),
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "sha256": digest,
+    }
+
+
+def write_cache(
+    blt_path: Path,
+    election_info: dict[str, Any],
+    candidates: list[Candidate],
+    ballots: Sequence[dict[str, Any]],
+) -> Path:
+    """Write the cache file for `blt_path` from already-parsed data."""
+    import numpy as np
+
+    from fresh_blt.columnar import BallotArrays
+
+    arrays = BallotArrays.from_ballots(ballots)
+    meta = {
+        "format_version": CACHE_FORMAT_VERSION,
+        "source": fingerprint(blt_path),
+        "election_info": election_info,
+        "candidates": [{"id": c.id, "name": c.name, "withdrawn": c.withdrawn} for c in candidates],
+    }
+
+    fields = {name: getattr(arrays, name) for name in _ARRAY_FIELDS}
+    if arrays.weights.dtype == object:
+        fields["weights"] = arrays.weights.astype(str)
+
+    output_path = cache_path_for(blt_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    # Write beside the target and rename so readers never see a partial file.
+    tmp_path = output_path.with_name(f".{output_path.name}.{os.getpid()}.tmp")
+    with stage("write_cache"), open(tmp_path, "wb") as f:
+        np.savez(
+            f,
+            meta=np.array(json.dumps(meta)),
+            **fields,
+        )
+    tmp_path.replace(output_path)
+
+    logger.info(f"Wrote cache for {blt_path} to {output_path}")
+    return output_path
+
+
+def load_cache(
+    blt_path: Path,
+) -> tuple[dict[str, Any], list[Candidate], Sequence[dict[str, Any]]] | None:
+    """
+    Load cached data for `blt_path` in the same shape as `load_blt_data`, or return
+    `None` if there is no cache file or it is stale, unreadable or from another
+    format version. The ballots stay columnar: they come back as `LazyBallots`, which
+    build each ballot dict only when it is accessed.
+    """
+    path = cache_path_for(blt_path)
+    if not path.is_file() or not blt_path.is_file():
+        return None
+
+    import numpy as np
+
+    from fresh_blt.columnar import BallotArrays, LazyBallots, weight_array
+    from fresh_blt.models.candidate import Candidate
+
+    try:
+        with np.load(path, allow_pickle=False) as data:
+            meta = json.loads(str(data["meta"]))
+            if meta.get("format_version") != CACHE_FORMAT_VERSION:
+                logger.info(f"Ignoring cache {path}: unsupported format version")
+                return None
+            if meta["source"] != fingerprint(blt_path):
+                logger.info(f"Ignoring stale cache {path}")
+                return None
+            fields = {name: data[name] for name in _ARRAY_FIELDS}
+            if fields["weights"].dtype.kind == "U":
+                fields["weights"] = weight_array([int(w) for w in fields["weights"].tolist()])
+            arrays = BallotArrays(**fields)
+    except (OSError, ValueError, KeyError) as e:
+        logger.warning(f"Ignoring unreadable cache {path}: {e}")
+        return None
+
+    candidate_list = [Candidate.from_dict(c) for c in meta["candidates"]]
+    candidate_lookup = {candidate.id: candidate for candidate in candidate_list}
+    ballot_list = LazyBallots(arrays, candidate_lookup)
+
+    logger.info(f"Loaded {len(ballot_list)} ballots for {blt_path} from cache {path}")
+    return meta["election_info"], candidate_list, ballot_list
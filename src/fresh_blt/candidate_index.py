@@ -0,0 +1,136 @@
+"""
+Inverted index from candidates to the ballots that rank them.
+
+`CandidateIndex` sorts every ranking entry of the columnar ballots by candidate, so
+each candidate's postings (the ballots ranking them, and at which preference level)
+are one contiguous slice. A candidate's full preference profile (how often, and with
+what weight, they are ranked at each level, their average rank and how often they are
+ranked at all) then costs time proportional to their postings rather than to every
+ballot, and all profiles together cost one pass over the entries.
+
+Ranks are preference levels counted from 1, so candidates tied on a ballot share a
+rank, and are weighted by ballot weight like `ElectionStats.first_preferences`.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+from dataclasses import dataclass
+from typing import Any
+
+import numpy as np
+from numpy.typing import NDArray
+
+from fresh_blt.columnar import BallotArrays, weight_totals
+from fresh_blt.models.candidate import Candidate
+from fresh_blt.timing import stage
+
+
+@dataclass(frozen=True)
+class CandidateProfile:
+    """
+    How a candidate is ranked. `level_ballots[k]` and `level_weights[k]` count the
+    ballots, and their weight, ranking the candidate at rank `k + 1`; `average_rank`
+    is the weighted mean rank, or `None` if no ballot ranks them.
+    """
+
+    candidate: Candidate
+    ballots: int
+    weight: int
+    level_ballots: list[int]
+    level_weights: list[int]
+    average_rank: float | None
+
+
+@dataclass(frozen=True)
+class CandidateIndex:
+    """
+    Postings per candidate, in a compressed-sparse-row layout: candidate `c` owns
+    entries `offsets[c - 1]:offsets[c]` of `ballots` (ballot positions, ascending)
+    and `levels` (zero-based preference levels). A ballot ranking a candidate more
+    than once posts only their first level.
+    """
+
+    candidates: list[Candidate]
+    weights: NDArray[Any]
+    offsets: NDArray[np.int64]
+    ballots: NDArray[np.integer[Any]]
+    levels: NDArray[np.integer[Any]]
+
+    @classmethod
+    def from_arrays(cls, arrays: BallotArrays, candidates: list[Candidate]) -> CandidateIndex:
+        """Index columnar ballots whose candidate IDs run from 1 to `len(candidates)`."""
+        with stage("build_candidate_index"):
+            return cls._from_arrays(arrays, candidates)
+
+    @classmethod
+    def from_ballots(
+        cls, ballots: Sequence[dict[str, Any]], candidates: list[Candidate]
+    ) -> CandidateIndex:
+        """Index the ballot dicts returned by `load_blt`."""
+        return cls.from_arrays(BallotArrays.from_ballots(ballots), candidates)
+
+    @classmethod
+    def _from_arrays(cls, arrays: BallotArrays, candidates: list[Candidate]) -> CandidateIndex:
+        ballot_of_id, level_of_id = arrays.positions()
+        candidate_ids = arrays.candidate_ids
+        # A stable sort keeps each candidate's postings in ballot order, and then in
+        # level order within a ballot; NumPy radix-sorts 16-bit keys in linear time.
+        if len(candidates) < 2**16:
+            candidate_ids = candidate_ids.astype(np.uint16)
+        order = np.argsort(candidate_ids, kind="stable")
+        sorted_ids = candidate_ids[order]
+        sorted_ballots = ballot_of_id[order]
+
+        first = np.ones(len(order), dtype=bool)
+        first[1:] = (sorted_ids[1:] != sorted_ids[:-1]) | (
+            sorted_ballots[1:] != sorted_ballots[:-1]
+        )
+        if not first.all():
+            order, sorted_ids, sorted_ballots = (
+                order[first],
+                sorted_ids[first],
+                sorted_ballots[first],
+            )
+
+        counts = np.bincount(sorted_ids, minlength=len(candidates) + 1)[1:]
+        ballot_dtype = np.int32 if len(arrays) < 2**31 else np.int64
+        return cls(
+            candidates=candidates,
+            weights=arrays.weights,
+            offsets=np.concatenate(([0], np.cumsum(counts))).astype(np.int64),
+            ballots=sorted_ballots.astype(ballot_dtype),
+            levels=level_of_id[order].astype(np.int32),
+        )
+
+    def postings(
+        self, candidate_id: int
+    ) -> tuple[NDArray[np.integer[Any]], NDArray[np.integer[Any]]]:
+        """Positions of the ballots ranking the candidate, and the level on each."""
+        start, end = self.offsets[candidate_id - 1], self.offsets[candidate_id]
+        return self.ballots[start:end], self.levels[start:end]
+
+    def ranked_count(self, candidate_id: int) -> int:
+        """Number of ballots ranking the candidate at all."""
+        return int(self.offsets[candidate_id] - self.offsets[candidate_id - 1])
+
+    def profile(self, candidate_id: int) -> CandidateProfile:
+        """The candidate's preference profile, in time proportional to their postings."""
+        ballots, levels = self.postings(candidate_id)
+        weights = self.weights[ballots]
+        level_weights = weight_totals(levels, weights)
+        weight = sum(level_weights)
+        rank_total = sum(rank * w for rank, w in enumerate(level_weights, start=1))
+        return CandidateProfile(
+            candidate=self.candidates[candidate_id - 1],
+            ballots=len(ballots),
+            weight=weight,
+            level_ballots=np.bincount(levels).tolist(),
+            level_weights=level_weights,
+            average_rank=rank_total / weight if weight else None,
+        )
+
+    def profiles(self) -> list[CandidateProfile]:
+        """Profiles of every candidate, by ID, in one pass over the postings."""
+        with stage("candidate_profiles"):
+            return [self.profile(candidate.id) for candidate in self.candidates]
@@ -1,24 +1,32 @@
 from __future__ import annotations
 
+import cProfile
+import json
+import logging
+from collections.abc import Sequence
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 import typer
 from rich.console import Console
 from rich.panel import Panel
 from rich.table import Table
 
-from fresh_blt.export import export_with_format
+from fresh_blt.cache import write_cache
+from fresh_blt.metadata import load_blt_metadata
 from fresh_blt.models.candidate import Candidate
-from fresh_blt.parse import (
-    extract_candidates,
-    extract_header_info,
-    extract_title,
-    parse_ballots,
-    parse_blt_file,
-)
+from fresh_blt.parse import load_blt
+from fresh_blt.stats import ElectionStats, compute_stats
+from fresh_blt.timing import Timings, collect_timings
+
+if TYPE_CHECKING:
+    from fresh_blt.candidate_index import CandidateProfile
 
 console = Console()
+LOG_LEVELS = ("debug", "info", "warning", "error")
+LOG_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+# Diagnostics go to stderr so they never mix with machine-readable output.
+err_console = Console(stderr=True)
 app = typer.Typer(
     name="fresh-blt",
     help="A CLI tool for parsing and analyzing Opavote .blt files",
@@ -32,51 +40,158 @@ BLT_FILE_ARG = typer.Argument(..., help="Path to the .blt file")
 WITHDRAWN_ONLY_OPTION = typer.Option(False, help="Show only withdrawn candidates")
 ACTIVE_ONLY_OPTION = typer.Option(False, help="Show only active candidates")
 LIMIT_OPTION = typer.Option(10, help="Maximum number of ballots to display")
+OFFSET_OPTION = typer.Option(
+    0, min=0, help="Number of ballots to skip; instant with a line index (convert --to index)"
+)
 SHOW_RANKINGS_OPTION = typer.Option(False, help="Show detailed rankings for each ballot")
 OUTPUT_OPTION = typer.Option(..., "-o", "--output", help="Output file path")
-FORMAT_OPTION = typer.Option("json", "-f", "--format", help="Export format (json, csv)")
-
-
-def load_blt_data(file_path: Path) -> tuple[dict[str, Any], list[Candidate], list[dict[str, Any]]]:
-    """Load and parse .blt file data."""
-    try:
-        blt_tree = parse_blt_file(file_path)
+JSON_SCHEMA_OPTION = typer.Option(
+    "full", help="JSON layout: full, or compact with rankings as candidate IDs"
+)
+COMPRESS_OPTION = typer.Option(
+    None, "--compress", help="Compress output files (gzip, bz2, xz, zstd)"
+)
+OPTIONAL_BLT_FILE_ARG = typer.Argument(None, help="Path to the .blt file")
+BATCH_OPTION = typer.Option(
+    None, "--batch", help="Export every .blt file in this directory into the output directory"
+)
+WORKERS_OPTION = typer.Option(None, help="Number of worker processes (default: one per CPU)")
+FORMAT_OPTION = typer.Option("json", "-f", "--format", help="Export format (json, csv, blt)")
+CANONICALIZE_OPTION = typer.Option(
+    False, help="For blt output: merge duplicate ballots, sort ballots and order ties by ID"
+)
+JSON_REPORT_OPTION = typer.Option(False, "--json", help="Print a machine-readable JSON report")
+PROFILES_OPTION = typer.Option(
+    False, "--profiles", help="Also show how often each candidate is ranked at each rank"
+)
+PROFILE_RANKS_OPTION = typer.Option(5, min=1, help="Ranks shown individually with --profiles")
+MAX_ERRORS_OPTION = typer.Option(1000, min=1, help="Maximum number of errors to list")
+REPORT_FORMAT_OPTION = typer.Option(
+    None, "-f", "--format", help="Also export in this format (json, csv, blt); repeatable"
+)
+REPORT_OUTPUT_OPTION = typer.Option(
+    None, "-o", "--output", help="Output path prefix for exports; suffixes are added per format"
+)
+TO_OPTION = typer.Option(..., "--to", help="Target representation (cache, index)")
+HOST_OPTION = typer.Option("127.0.0.1", help="Interface to listen on")
+PORT_OPTION = typer.Option(8765, help="TCP port to listen on")
+SOCKET_OPTION = typer.Option(None, "--socket", help="Listen on this Unix socket instead of a port")
+MEMORY_BUDGET_OPTION = typer.Option(
+    512, min=1, help="Memory budget in MiB for parsed elections kept in memory"
+)
+WATCH_DIR_ARG = typer.Argument(..., help="Directory of .blt files to watch")
+WATCH_FORMAT_OPTION = typer.Option("json", "--export", help="Export format (json, csv, blt)")
+WATCH_OUT_OPTION = typer.Option(..., "--out", help="Output directory for exports and state")
+INTERVAL_OPTION = typer.Option(2.0, min=0.1, help="Seconds between directory scans")
+ONCE_OPTION = typer.Option(False, "--once", help="Export changed files once and exit")
+COUNT_OPTION = typer.Option(1, min=1, help="Number of files to generate")
+GENERATE_BALLOTS_OPTION = typer.Option(10_000, min=0, help="Ballots per file")
+GENERATE_CANDIDATES_OPTION = typer.Option(10, min=1, help="Candidates per file")
+SEATS_OPTION = typer.Option(1, min=1, help="Seats per election")
+MODEL_OPTION = typer.Option(
+    "uniform",
+    help="Voter preference model (uniform, mallows, plackett-luce, spatial-1d, spatial-2d)",
+)
+SEED_OPTION = typer.Option(None, help="Master seed; the same seed gives the same files")
+GENERATE_OUT_OPTION = typer.Option(Path("."), "-o", "--out", help="Directory to write files to")
+PATTERN_OPTION = typer.Option(
+    "election_{}.blt", help="File name pattern; {} is replaced by the file number"
+)
+BENCH_BALLOTS_OPTION = typer.Option(
+    "1e5", "--ballots", help="Ballots in the generated election, e.g. 1e6"
+)
+MAX_WORKERS_OPTION = typer.Option(
+    None, min=1, help="Most workers to try for the parallel paths (default: one per CPU)"
+)
+BENCH_SEED_OPTION = typer.Option(0, help="Seed for the generated election")
+QUERIES_ARG = typer.Argument(
+    ..., help="Queries such as 'Adam > Basil', '#3 in top 2' or 'Carla and not Dave'"
+)
+LOG_LEVEL_OPTION = typer.Option(
+    "info", help=f"Level of log messages printed to stderr ({', '.join(LOG_LEVELS)})"
+)
+TIMINGS_OPTION = typer.Option(
+    False, "--timings", help="Print wall-clock, CPU and peak memory per stage to stderr"
+)
+TRACE_MEMORY_OPTION = typer.Option(
+    True, help="Trace peak memory for --timings; tracing slows allocation-heavy stages"
+)
+PROFILE_OPTION = typer.Option(
+    None, "--profile", help="Run the command under cProfile and write stats to this file"
+)
 
-        # Extract basic information
-        num_candidates, num_positions, withdrawn_candidate_ids = extract_header_info(blt_tree)
-        title = extract_title(blt_tree)
 
-        # Extract candidates
-        candidate_list = extract_candidates(blt_tree, withdrawn_candidate_ids)
-        candidate_lookup = {candidate.id: candidate for candidate in candidate_list}
+@app.callback()
+def main_options(
+    ctx: typer.Context,
+    log_level: str = LOG_LEVEL_OPTION,
+    timings: bool = TIMINGS_OPTION,
+    trace_memory: bool = TRACE_MEMORY_OPTION,
+    profile: Path | None = PROFILE_OPTION,
+) -> None:
+    """A CLI tool for parsing and analyzing Opavote .blt files"""
+    if log_level.lower() not in LOG_LEVELS:
+        raise typer.BadParameter(f"Use one of {', '.join(LOG_LEVELS)}", param_hint="'--log-level'")
+    # Only the package's own loggers follow --log-level; other libraries stay at WARNING.
+    logging.basicConfig(format=LOG_FORMAT, datefmt="%Y-%m-%d %H:%M:%S")
+    logging.getLogger("fresh_blt").setLevel(log_level.upper())
+
+    if profile is not None:
+        profiler = cProfile.Profile()
+        ctx.call_on_close(lambda: write_profile(profiler, profile))
+        profiler.enable()
+    if timings:
+        collected = ctx.with_resource(collect_timings(trace_memory))
+        ctx.call_on_close(lambda: err_console.print(timings_table(collected)))
+
+
+def write_profile(profiler: cProfile.Profile, profile_path: Path) -> None:
+    profiler.disable()
+    profiler.dump_stats(profile_path)
+    err_console.print(f"[green]✓ Wrote profile to {profile_path}[/green]")
+
+
+def timings_table(timings: Timings) -> Table:
+    table = Table(title="Stage Timings")
+    table.add_column("Stage", style="cyan")
+    table.add_column("Wall (s)", justify="right", style="green")
+    table.add_column("CPU (s)", justify="right", style="yellow")
+    table.add_column("Peak memory (MiB)", justify="right", style="magenta")
+
+    for metrics in timings.stages:
+        peak = metrics.peak_memory_bytes
+        table.add_row(
+            "  " * metrics.depth + metrics.name,
+            f"{metrics.wall_seconds:.3f}",
+            f"{metrics.cpu_seconds:.3f}",
+            "-" if peak is None else f"{peak / 2**20:.1f}",
+        )
+    table.add_row("total", f"{timings.total_seconds():.3f}", "", "", style="bold")
+    return table
 
-        # Parse ballots
-        ballot_list = parse_ballots(blt_tree, candidate_lookup)
 
-        blt_data = {
-            "title": title,
-            "num_candidates": num_candidates,
-            "num_positions": num_positions,
-            "withdrawn_candidate_ids": withdrawn_candidate_ids,
-            "total_ballots": len(ballot_list),
-            "total_votes": sum(ballot["weight"] for ballot in ballot_list),
-        }
+def load_blt_data(
+    file_path: Path,
+) -> tuple[dict[str, Any], list[Candidate], Sequence[dict[str, Any]]]:
+    """Load and parse .blt file data, using a fresh binary cache when one exists."""
+    try:
+        return load_blt(file_path)
+    except Exception as e:
+        console.print(f"[red]Error loading .blt file: {e}[/red]")
+        raise typer.Exit(1) from None
 
-        return blt_data, candidate_list, ballot_list
 
+def load_blt_info(file_path: Path) -> tuple[dict[str, Any], list[Candidate]]:
+    """Load election info and candidates only, without parsing ballots."""
+    try:
+        return load_blt_metadata(file_path)
     except Exception as e:
         console.print(f"[red]Error loading .blt file: {e}[/red]")
         raise typer.Exit(1) from None
 
 
-@app.command()
-def info(
-    file_path: Path = BLT_FILE_ARG,
-) -> None:
-    """Display basic information about a .blt file."""
-    blt_data, candidate_list, _ = load_blt_data(file_path)
-
-    # Create info panel
+def info_panel(file_name: str, blt_data: dict[str, Any], candidate_list: list[Candidate]) -> Panel:
+    """Panel with the basic election information shown by `info`."""
     info_text = f"""
 [bold]Election Title:[/bold] {blt_data["title"]}
 [bold]Candidates:[/bold] {blt_data["num_candidates"]} ({len([c for c in candidate_list if c.withdrawn])} withdrawn)
@@ -85,12 +200,110 @@ def info(
 [bold]Total Votes:[/bold] {blt_data["total_votes"]}
 """
 
-    panel = Panel(
+    return Panel(
         info_text.strip(),
-        title=f"[bold blue].blt File: {file_path.name}[/bold blue]",
+        title=f"[bold blue].blt File: {file_name}[/bold blue]",
         border_style="blue",
     )
-    console.print(panel)
+
+
+def candidates_table(candidate_list: list[Candidate], title_suffix: str = "") -> Table:
+    """Table of candidate IDs, names and status shown by `candidates`."""
+    table = Table(title=f"Candidates{title_suffix}")
+    table.add_column("ID", style="cyan", no_wrap=True)
+    table.add_column("Name", style="white")
+    table.add_column("Status", style="green")
+
+    for candidate in candidate_list:
+        status = "[red]Withdrawn[/red]" if candidate.withdrawn else "[green]Active[/green]"
+        table.add_row(str(candidate.id), candidate.name, status)
+
+    return table
+
+
+def stats_panel(candidate_list: list[Candidate], election_stats: ElectionStats) -> Panel:
+    """Panel with candidate, ballot and first-preference statistics shown by `stats`."""
+    active_candidates = [c for c in candidate_list if not c.withdrawn]
+    first_preferences = election_stats.first_preferences
+    total_weight = election_stats.total_votes
+
+    stats_text = f"""
+[bold]Election Statistics[/bold]
+
+[bold]Candidates:[/bold]
+  • Total: {len(candidate_list)}
+  • Active: {len(active_candidates)}
+  • Withdrawn: {len(candidate_list) - len(active_candidates)}
+
+[bold]Ballots:[/bold]
+  • Total ballots: {election_stats.total_ballots}
+  • Total vote weight: {total_weight}
+  • Ballots with ties: {election_stats.ballots_with_ties}
+  • Longest ranking: {election_stats.max_rankings} preferences
+
+[bold]First Preferences:[/bold]
+"""
+
+    # Sort candidates by first preference votes
+    sorted_candidates = sorted(
+        active_candidates, key=lambda c: first_preferences[c.id], reverse=True
+    )
+
+    for candidate in sorted_candidates:
+        percentage = (
+            (first_preferences[candidate.id] / total_weight * 100) if total_weight > 0 else 0
+        )
+        stats_text += (
+            f"  • {candidate.name}: {first_preferences[candidate.id]} votes ({percentage:.1f}%)\n"
+        )
+
+    return Panel(
+        stats_text.strip(),
+        title="[bold blue]Election Statistics[/bold blue]",
+        border_style="blue",
+    )
+
+
+def profiles_table(profiles: list[CandidateProfile], total_weight: int, ranks: int) -> Table:
+    """
+    Table of how many ballots rank each candidate, their weight, the candidate's
+    average rank and the vote weight at each of the first `ranks` ranks, shown by
+    `stats --profiles`.
+    """
+    from rich.markup import escape
+
+    table = Table(
+        title="Preference Profiles", caption="Votes by rank; tied candidates share a rank"
+    )
+    table.add_column("Candidate", style="white")
+    rank_columns = [f"#{rank}" for rank in range(1, ranks + 1)]
+    for column in ("Ballots", "Votes", "% of votes", "Avg rank", *rank_columns, "Later"):
+        table.add_column(column, justify="right")
+
+    for profile in profiles:
+        name = escape(profile.candidate.name)
+        if profile.candidate.withdrawn:
+            name += " [red](withdrawn)[/red]"
+        level_weights = profile.level_weights + [0] * (ranks - len(profile.level_weights))
+        table.add_row(
+            name,
+            f"{profile.ballots:,}",
+            f"{profile.weight:,}",
+            f"{profile.weight / total_weight:.1%}" if total_weight else "-",
+            "-" if profile.average_rank is None else f"{profile.average_rank:.2f}",
+            *(f"{weight:,}" for weight in level_weights[:ranks]),
+            f"{sum(level_weights[ranks:]):,}",
+        )
+    return table
+
+
+@app.command()
+def info(
+    file_path: Path = BLT_FILE_ARG,
+) -> None:
+    """Display basic information about a .blt file."""
+    blt_data, candidate_list = load_blt_info(file_path)
+    console.print(info_panel(file_path.name, blt_data, candidate_list))
 
 
 @app.command()
@@ -113,29 +326,24 @@ def candidates(
         candidates_to_show = candidate_list
         title_suffix = ""
 
-    # Create candidates table
-    table = Table(title=f"Candidates{title_suffix}")
-    table.add_column("ID", style="cyan", no_wrap=True)
-    table.add_column("Name", style="white")
-    table.add_column("Status", style="green")
-
-    for candidate in candidates_to_show:
-        status = "[red]Withdrawn[/red]" if candidate.withdrawn else "[green]Active[/green]"
-        table.add_row(str(candidate.id), candidate.name, status)
-
-    console.print(table)
+    console.print(candidates_table(candidates_to_show, title_suffix))
 
 
 @app.command()
 def ballots(
     file_path: Path = BLT_FILE_ARG,
     limit: int = LIMIT_OPTION,
+    offset: int = OFFSET_OPTION,
     show_rankings: bool = SHOW_RANKINGS_OPTION,
 ) -> None:
     """Display ballot information."""
-    blt_data, candidate_list, ballot_list = load_blt_data(file_path)
+    from fresh_blt.line_index import read_ballots
 
-    candidate_lookup = {c.id: c for c in candidate_list}
+    try:
+        page = read_ballots(file_path, offset=offset, limit=limit)
+    except Exception as e:
+        console.print(f"[red]Error loading .blt file: {e}[/red]")
+        raise typer.Exit(1) from None
 
     # Create ballots table
     table = Table(title="Ballots")
@@ -146,27 +354,32 @@ def ballots(
     else:
         table.add_column("Preferences", style="white")
 
-    for i, ballot in enumerate(ballot_list[:limit]):
+    for i, ballot in enumerate(page.ballots, page.offset):
         weight = ballot["weight"]
         rankings = ballot["rankings"]
 
         if show_rankings:
             ranking_text = []
             for rank, candidates in enumerate(rankings, 1):
-                candidate_names = [candidate_lookup[c.id].name for c in candidates]
+                candidate_names = [c.name for c in candidates]
                 ranking_text.append(f"{rank}: {', '.join(candidate_names)}")
             preferences = "\n".join(ranking_text)
         else:
             # Show first preference only
             first_pref = []
             if rankings and rankings[0]:
-                first_pref = [candidate_lookup[c.id].name for c in rankings[0]]
+                first_pref = [c.name for c in rankings[0]]
             preferences = ", ".join(first_pref) if first_pref else "No preferences"
 
         table.add_row(str(i + 1), str(weight), preferences)
 
-    if len(ballot_list) > limit:
-        console.print(f"[dim]Showing first {limit} of {len(ballot_list)} ballots[/dim]")
+    if page.ballots and (page.has_more or page.offset > 0):
+        shown = f"{page.offset + 1}-{page.offset + len(page.ballots)}"
+        if page.total is not None:
+            console.print(f"[dim]Showing ballots {shown} of {page.total}[/dim]")
+        else:
+            more = "; more follow" if page.has_more else ""
+            console.print(f"[dim]Showing ballots {shown}{more}[/dim]")
 
     console.print(table)
 
@@ -174,78 +387,108 @@ def ballots(
 @app.command()
 def stats(
     file_path: Path = BLT_FILE_ARG,
+    profiles: bool = PROFILES_OPTION,
+    profile_ranks: int = PROFILE_RANKS_OPTION,
 ) -> None:
     """Display statistical analysis of the election."""
     blt_data, candidate_list, ballot_list = load_blt_data(file_path)
+    election_stats = compute_stats(candidate_list, ballot_list)
+    console.print(stats_panel(candidate_list, election_stats))
 
-    # Calculate statistics
-    active_candidates = [c for c in candidate_list if not c.withdrawn]
-
-    # First preference analysis
-    first_preferences = {}
-    for candidate in active_candidates:
-        first_preferences[candidate.id] = 0
-
-    total_weight = 0
-    for ballot in ballot_list:
-        weight = ballot["weight"]
-        total_weight += weight
-        rankings = ballot["rankings"]
-
-        if rankings and rankings[0]:
-            # Only count preferences for active (non-withdrawn) candidates
-            for candidate in rankings[0]:
-                if not candidate.withdrawn and candidate.id in first_preferences:
-                    first_preferences[candidate.id] += weight
-
-    # Create stats panel
-    stats_text = f"""
-[bold]Election Statistics[/bold]
-
-[bold]Candidates:[/bold]
-  • Total: {len(candidate_list)}
-  • Active: {len(active_candidates)}
-  • Withdrawn: {len([c for c in candidate_list if c.withdrawn])}
-
-[bold]Ballots:[/bold]
-  • Total ballots: {len(ballot_list)}
-  • Total vote weight: {total_weight}
+    if profiles:
+        from fresh_blt.candidate_index import CandidateIndex
 
-[bold]First Preferences:[/bold]
-"""
+        index = CandidateIndex.from_ballots(ballot_list, candidate_list)
+        console.print(profiles_table(index.profiles(), election_stats.total_votes, profile_ranks))
 
-    # Sort candidates by first preference votes
-    sorted_candidates = sorted(
-        active_candidates, key=lambda c: first_preferences[c.id], reverse=True
-    )
 
-    for candidate in sorted_candidates:
-        percentage = (
-            (first_preferences[candidate.id] / total_weight * 100) if total_weight > 0 else 0
-        )
-        stats_text += (
-            f"  • {candidate.name}: {first_preferences[candidate.id]} votes ({percentage:.1f}%)\n"
-        )
+@app.command()
+def report(
+    file_path: Path = BLT_FILE_ARG,
+    export_formats: list[str] | None = REPORT_FORMAT_OPTION,
+    output: Path | None = REPORT_OUTPUT_OPTION,
+    canonicalize: bool = CANONICALIZE_OPTION,
+    json_schema: str = JSON_SCHEMA_OPTION,
+    compress: str | None = COMPRESS_OPTION,
+) -> None:
+    """Show info, candidates and statistics, and optionally export, from a single parse."""
+    if export_formats and output is None:
+        console.print("[red]✗ --output is required with --format[/red]")
+        raise typer.Exit(1)
 
-    panel = Panel(
-        stats_text.strip(),
-        title="[bold blue]Election Statistics[/bold blue]",
-        border_style="blue",
-    )
-    console.print(panel)
+    blt_data, candidate_list, ballot_list = load_blt_data(file_path)
+    election_stats = compute_stats(candidate_list, ballot_list)
+
+    console.print(info_panel(file_path.name, blt_data, candidate_list))
+    console.print(candidates_table(candidate_list))
+    console.print(stats_panel(candidate_list, election_stats))
+
+    if not export_formats or output is None:
+        return
+
+    from fresh_blt.export import EXPORT_SUFFIXES, export_with_format
+
+    for format in export_formats:
+        suffix = EXPORT_SUFFIXES.get(format.lower(), "")
+        output_path = output.with_name(f"{output.name}{suffix}")
+        try:
+            result = export_with_format(
+                blt_data,
+                candidate_list,
+                ballot_list,
+                output_path,
+                format,
+                canonicalize,
+                json_schema,
+                compress,
+            )
+        except ValueError as e:
+            console.print(f"[red]✗ {e}[/red]")
+            raise typer.Exit(1) from None
+        if isinstance(result, list):
+            console.print(f"[green]✓ Exported data to {len(result)} CSV files[/green]")
+        else:
+            console.print(f"[green]✓ Exported data to {result}[/green]")
 
 
 @app.command()
 def export(
-    file_path: Path = BLT_FILE_ARG,
+    file_path: Path | None = OPTIONAL_BLT_FILE_ARG,
     output: Path = OUTPUT_OPTION,
     format: str = FORMAT_OPTION,
+    canonicalize: bool = CANONICALIZE_OPTION,
+    json_schema: str = JSON_SCHEMA_OPTION,
+    compress: str | None = COMPRESS_OPTION,
+    batch: Path | None = BATCH_OPTION,
+    workers: int | None = WORKERS_OPTION,
 ) -> None:
-    """Export .blt data to JSON or CSV format."""
+    """Export .blt data to JSON, CSV or BLT format."""
+    if batch is not None:
+        if file_path is not None:
+            console.print("[red]✗ Provide either a .blt file or --batch DIR, not both[/red]")
+            raise typer.Exit(1)
+        export_directory(batch, output, format, canonicalize, json_schema, compress, workers)
+        return
+
+    if file_path is None:
+        console.print("[red]✗ Provide a .blt file or --batch DIR[/red]")
+        raise typer.Exit(1)
+
+    from fresh_blt.export import export_with_format
+
     blt_data, candidate_list, ballot_list = load_blt_data(file_path)
 
     try:
-        result = export_with_format(blt_data, candidate_list, ballot_list, output, format)
+        result = export_with_format(
+            blt_data,
+            candidate_list,
+            ballot_list,
+            output,
+            format,
+            canonicalize,
+            json_schema,
+            compress,
+        )
 
         if format.lower() == "csv" and isinstance(result, list):
             # result is a list of files for CSV format
@@ -262,6 +505,61 @@ def export(
         raise typer.Exit(1) from None
 
 
+def export_directory(
+    directory: Path,
+    output_dir: Path,
+    format: str,
+    canonicalize: bool,
+    json_schema: str,
+    compression: str | None,
+    workers: int | None,
+) -> None:
+    """Export every contest in `directory` in parallel, with one progress bar and a summary."""
+    from rich.progress import BarColumn, MofNCompleteColumn, Progress, TimeElapsedColumn
+
+    from fresh_blt.batch import export_batch, find_blt_files
+
+    if not directory.is_dir():
+        console.print(f"[red]✗ Not a directory: {directory}[/red]")
+        raise typer.Exit(1)
+
+    sources = find_blt_files(directory)
+    if not sources:
+        console.print(f"[yellow]No .blt files found in {directory}[/yellow]")
+        return
+
+    failures = []
+    exported = 0
+    try:
+        with Progress(
+            "[progress.description]{task.description}",
+            BarColumn(),
+            MofNCompleteColumn(),
+            TimeElapsedColumn(),
+            console=console,
+        ) as progress:
+            task = progress.add_task("Exporting contests", total=len(sources))
+            for result in export_batch(
+                sources, output_dir, format, canonicalize, json_schema, compression, workers
+            ):
+                if result.error is None:
+                    exported += 1
+                else:
+                    failures.append(result)
+                progress.advance(task)
+    except ValueError as e:
+        console.print(f"[red]✗ {e}[/red]")
+        raise typer.Exit(1) from None
+
+    console.print(
+        f"[green]✓ Exported {exported} of {len(sources)} contests to {output_dir}[/green]"
+    )
+    for failure in sorted(failures, key=lambda r: r.source):
+        console.print(f"[red]✗ {failure.source.name}: {failure.error}[/red]")
+    if failures:
+        raise typer.Exit(1)
+
+
 @app.command()
 def dataframe(
     file_path: Path = BLT_FILE_ARG,
@@ -302,31 +600,297 @@ def dataframe(
 @app.command()
 def validate(
     file_path: Path = BLT_FILE_ARG,
+    json_report: bool = JSON_REPORT_OPTION,
+    max_errors: int = MAX_ERRORS_OPTION,
 ) -> None:
-    """Validate the .blt file structure and data."""
+    """Validate the .blt file structure and data, reporting every error with its line."""
+    from fresh_blt.validate import validate_blt
+
     try:
-        blt_data, candidate_list, ballot_list = load_blt_data(file_path)
+        report = validate_blt(file_path, max_errors=max_errors)
+    except Exception as e:
+        console.print(f"[red]✗ Validation failed: {e}[/red]")
+        raise typer.Exit(1) from None
 
-        console.print("[green]✓ .blt file structure is valid[/green]")
-        console.print(f"[green]✓ Found {blt_data['num_candidates']} candidates[/green]")
-        console.print(f"[green]✓ Found {blt_data['total_ballots']} ballots[/green]")
+    if json_report:
+        typer.echo(json.dumps(report.to_dict(), indent=2))
+        if not report.is_valid:
+            raise typer.Exit(1)
+        return
 
-        # Additional validation checks
-        candidate_ids = {c.id for c in candidate_list}
-        for ballot in ballot_list:
-            for ranking in ballot["rankings"]:
-                for candidate in ranking:
-                    if candidate.id not in candidate_ids:
-                        console.print(f"[red]✗ Invalid candidate ID {candidate.id} in ballot[/red]")
-                        raise typer.Exit(1)
+    if not report.is_valid:
+        console.print(f"[red]✗ Validation failed: {report.error_count} errors[/red]")
+        for issue in report.errors:
+            console.print(f"  line {issue.line}: {issue.message}", markup=False)
+        if report.error_count > len(report.errors):
+            console.print(f"  ... {report.error_count - len(report.errors)} more errors not shown")
+        raise typer.Exit(1)
 
-        console.print("[green]✓ All ballot references are valid[/green]")
-        console.print("[green]✓ Validation completed successfully[/green]")
+    console.print("[green]✓ .blt file structure is valid[/green]")
+    console.print(f"[green]✓ Found {report.num_candidates} candidates[/green]")
+    console.print(f"[green]✓ Found {report.total_ballots} ballots[/green]")
+    console.print("[green]✓ All ballot references are valid[/green]")
+    console.print("[green]✓ Validation completed successfully[/green]")
 
-    except Exception as e:
-        console.print(f"[red]✗ Validation failed: {e}[/red]")
+
+@app.command()
+def convert(
+    file_path: Path = BLT_FILE_ARG,
+    to: str = TO_OPTION,
+) -> None:
+    """Convert a .blt file to another representation."""
+    target = to.lower()
+    if target not in ("cache", "index"):
+        console.print(f"[red]✗ Unsupported conversion target: {to}. Use 'cache' or 'index'.[/red]")
+        raise typer.Exit(1)
+
+    if target == "index":
+        from fresh_blt.line_index import build_line_index
+
+        try:
+            index_path = build_line_index(file_path)
+        except (OSError, ValueError) as e:
+            console.print(f"[red]✗ Index write failed: {e}[/red]")
+            raise typer.Exit(1) from None
+        console.print(f"[green]✓ Wrote line index to {index_path}[/green]")
+        return
+
+    blt_data, candidate_list, ballot_list = load_blt_data(file_path)
+
+    try:
+        cache_path = write_cache(file_path, blt_data, candidate_list, ballot_list)
+    except OSError as e:
+        console.print(f"[red]✗ Cache write failed: {e}[/red]")
         raise typer.Exit(1) from None
 
+    console.print(f"[green]✓ Wrote cache to {cache_path}[/green]")
+
+
+@app.command()
+def watch(
+    directory: Path = WATCH_DIR_ARG,
+    export_format: str = WATCH_FORMAT_OPTION,
+    out: Path = WATCH_OUT_OPTION,
+    canonicalize: bool = CANONICALIZE_OPTION,
+    json_schema: str = JSON_SCHEMA_OPTION,
+    compress: str | None = COMPRESS_OPTION,
+    workers: int | None = WORKERS_OPTION,
+    interval: float = INTERVAL_OPTION,
+    once: bool = ONCE_OPTION,
+) -> None:
+    """Export new and changed .blt files in a directory as they appear."""
+    from fresh_blt.batch import BatchResult
+    from fresh_blt.watch import Watcher
+
+    if not directory.is_dir():
+        console.print(f"[red]✗ Not a directory: {directory}[/red]")
+        raise typer.Exit(1)
+
+    try:
+        watcher = Watcher(
+            directory, out, export_format, canonicalize, json_schema, compress, workers
+        )
+    except ValueError as e:
+        console.print(f"[red]✗ {e}[/red]")
+        raise typer.Exit(1) from None
+
+    def report_result(result: BatchResult) -> None:
+        if result.error is None:
+            console.print(f"[green]✓ Exported {result.source.name}[/green]")
+        else:
+            console.print(f"[red]✗ {result.source.name}: {result.error}[/red]")
+
+    if once:
+        results = list(watcher.poll())
+        for result in sorted(results, key=lambda r: r.source):
+            report_result(result)
+        console.print(f"Processed {len(results)} changed files")
+        if any(result.error is not None for result in results):
+            raise typer.Exit(1)
+        return
+
+    console.print(f"Watching {directory} every {interval:g}s; press Ctrl+C to stop")
+    try:
+        watcher.run(interval, report_result)
+    except KeyboardInterrupt:
+        pass
+
+
+@app.command()
+def serve(
+    host: str = HOST_OPTION,
+    port: int = PORT_OPTION,
+    socket: Path | None = SOCKET_OPTION,
+    memory_budget: int = MEMORY_BUDGET_OPTION,
+    workers: int | None = WORKERS_OPTION,
+) -> None:
+    """Serve info, stats and ballot pages over local HTTP/JSON, keeping elections parsed."""
+    from fresh_blt.server import run_server
+
+    address = socket if socket is not None else f"http://{host}:{port}"
+    console.print(f"[green]Serving on {address}; press Ctrl+C to stop[/green]")
+    try:
+        run_server(host, port, socket, memory_budget * 1024 * 1024, workers)
+    except KeyboardInterrupt:
+        pass
+    except OSError as e:
+        console.print(f"[red]✗ Cannot listen on {address}: {e}[/red]")
+        raise typer.Exit(1) from None
+
+
+@app.command()
+def generate(
+    count: int = COUNT_OPTION,
+    ballots: int = GENERATE_BALLOTS_OPTION,
+    candidates: int = GENERATE_CANDIDATES_OPTION,
+    seats: int = SEATS_OPTION,
+    model: str = MODEL_OPTION,
+    seed: int | None = SEED_OPTION,
+    out: Path = GENERATE_OUT_OPTION,
+    pattern: str = PATTERN_OPTION,
+    compress: str | None = COMPRESS_OPTION,
+    workers: int | None = WORKERS_OPTION,
+) -> None:
+    """Generate random .blt files, e.g. as benchmark corpora."""
+    from fresh_blt.fixtures import BLTGenerators
+    from fresh_blt.fixtures.preferences import PREFERENCE_MODELS
+
+    if model not in PREFERENCE_MODELS:
+        console.print(
+            f"[red]✗ Unknown preference model: {model}. Use {', '.join(PREFERENCE_MODELS)}.[/red]"
+        )
+        raise typer.Exit(1)
+
+    out.mkdir(parents=True, exist_ok=True)
+    try:
+        paths = BLTGenerators(seed=seed).batch_generate(
+            count,
+            str(out / pattern),
+            num_candidates=candidates,
+            num_ballots=ballots,
+            num_seats=seats,
+            workers=workers,
+            compression=compress,
+            model=PREFERENCE_MODELS[model],
+        )
+    except ValueError as e:
+        console.print(f"[red]✗ {e}[/red]")
+        raise typer.Exit(1) from None
+
+    console.print(
+        f"[green]✓ Generated {len(paths)} files of {ballots} ballots each in {out}[/green]"
+    )
+
+
+@app.command()
+def bench(
+    ballots: str = BENCH_BALLOTS_OPTION,
+    candidates: int = GENERATE_CANDIDATES_OPTION,
+    seed: int = BENCH_SEED_OPTION,
+    max_workers: int | None = MAX_WORKERS_OPTION,
+    json_report: bool = JSON_REPORT_OPTION,
+) -> None:
+    """Benchmark parsing, loading, stats and export on this machine and suggest a worker count."""
+    from fresh_blt.bench import run_bench
+
+    try:
+        num_ballots = int(float(ballots))
+    except ValueError:
+        num_ballots = -1
+    if num_ballots < 1:
+        console.print(f"[red]✗ --ballots must be a positive number, got {ballots}[/red]")
+        raise typer.Exit(1)
+
+    with err_console.status("Benchmarking...") as status:
+        report = run_bench(
+            num_ballots,
+            candidates,
+            seed,
+            max_workers,
+            on_stage=lambda name: status.update(f"Benchmarking: {name}..."),
+        )
+
+    if json_report:
+        typer.echo(json.dumps(report.to_dict(), indent=2))
+        return
+
+    table = Table(
+        title=f"{num_ballots:,} ballots, {candidates} candidates "
+        f"({report.file_bytes / 1e6:.1f} MB .blt file)"
+    )
+    for column in ("Stage", "Time (s)", "Ballots/s", "MB/s"):
+        table.add_column(column, justify="left" if column == "Stage" else "right")
+    for stage_result in report.stages:
+        mb_per_second = stage_result.mb_per_second
+        table.add_row(
+            stage_result.name,
+            f"{stage_result.seconds:.3f}",
+            f"{stage_result.ballots_per_second:,.0f}",
+            "-" if mb_per_second is None else f"{mb_per_second:.1f}",
+        )
+    console.print(table)
+
+    scaling_table = Table(title="Batch export scaling")
+    for column in ("Workers", "Files/s", "Speed-up"):
+        scaling_table.add_column(column, justify="right")
+    single = report.scaling[0].files_per_second
+    for result in report.scaling:
+        scaling_table.add_row(
+            str(result.workers),
+            f"{result.files_per_second:.2f}",
+            f"{result.files_per_second / single:.2f}x",
+        )
+    console.print(scaling_table)
+    console.print(
+        f"[green]Recommended workers: {report.recommended_workers}[/green] "
+        f"({report.recommendation}; CPU count {report.cpu_count})"
+    )
+
+
+@app.command()
+def query(
+    file_path: Path = BLT_FILE_ARG,
+    queries: list[str] = QUERIES_ARG,
+    json_report: bool = JSON_REPORT_OPTION,
+) -> None:
+    """
+    Count the ballots, and their weight, matching each query.
+
+    `A` matches ballots ranking A anywhere, `A > B` those ranking A above B (or B not
+    at all), `A = B` those tying them, and `A in top 3` those ranking A in their first
+    three preferences. Combine with `and`, `or`, `not` and parentheses. Refer to
+    candidates by name, quoted if it contains a keyword or symbol, by unique name
+    prefix, or as #ID.
+    """
+    from rich.markup import escape
+
+    from fresh_blt.query import BallotIndex, QueryError
+
+    blt_data, candidate_list, ballot_list = load_blt_data(file_path)
+    index = BallotIndex.from_ballots(ballot_list, candidate_list)
+    try:
+        results = [index.query(text) for text in queries]
+    except QueryError as e:
+        console.print(f"[red]✗ {escape(str(e))}[/red]")
+        raise typer.Exit(1) from None
+
+    if json_report:
+        typer.echo(json.dumps([result.to_dict() for result in results], indent=2))
+        return
+
+    table = Table(title=f"{blt_data['title']}: {len(index):,} ballots")
+    for column in ("Query", "Ballots", "% ballots", "Weight", "% weight"):
+        table.add_column(column, justify="left" if column == "Query" else "right")
+    for result in results:
+        table.add_row(
+            escape(result.query),
+            f"{result.ballots:,}",
+            f"{result.ballot_share:.1%}",
+            f"{result.weight:,}",
+            f"{result.weight_share:.1%}",
+        )
+    console.print(table)
+
 
 def main() -> None:
     """Main CLI entry point."""
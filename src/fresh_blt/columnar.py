@@ -0,0 +1,211 @@
+"""
+Columnar representation of parsed ballots.
+
+Stores ballots as flat NumPy arrays in a compressed-sparse-row layout instead of
+nested lists of `Candidate` objects, so they can be saved, loaded and scanned
+without per-ranking Python objects. `LazyBallots` puts the usual ballot-dict
+interface in front of the arrays for code that still wants dicts.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterator, Sequence
+from dataclasses import dataclass
+from typing import Any, overload
+
+import numpy as np
+from numpy.typing import NDArray
+
+from fresh_blt.models.candidate import Candidate
+
+INT64_MIN = -(2**63)
+INT64_MAX = 2**63 - 1
+
+
+def weight_array(weights: list[int]) -> NDArray[Any]:
+    """
+    `weights` as an int64 array, or as an object array of Python integers if any
+    weight is outside the int64 range (the grammar allows arbitrary-precision weights).
+    """
+    if weights and (max(weights) > INT64_MAX or min(weights) < INT64_MIN):
+        return np.array(weights, dtype=object)
+    return np.array(weights, dtype=np.int64)
+
+
+def exact_sum(weights: NDArray[Any]) -> int:
+    """Sum of `weights`, in Python integers if an int64 sum could overflow."""
+    if not len(weights):
+        return 0
+    if int(weights.max()) * len(weights) < 2**63:
+        return int(weights.sum())
+    return sum(weights.tolist())
+
+
+def weight_totals(
+    groups: NDArray[np.integer[Any]], weights: NDArray[Any], size: int = 0
+) -> list[int]:
+    """
+    Total of `weights` for each value of `groups`, as a list at least `size` long, in
+    Python integers if int64 totals could overflow.
+    """
+    size = max(size, int(groups.max()) + 1 if len(groups) else 0)
+    if weights.dtype != object and exact_sum(weights) < 2**63:
+        totals = np.zeros(size, dtype=np.int64)
+        np.add.at(totals, groups, weights)
+        return totals.tolist()
+    object_totals = np.zeros(size, dtype=object)
+    np.add.at(object_totals, groups, weights.astype(object))
+    return object_totals.tolist()
+
+
+@dataclass(frozen=True)
+class BallotArrays:
+    """
+    Ballots as three levels of offsets into a flat array of candidate IDs.
+
+    Ballot `i` owns preference levels `level_offsets[i]:level_offsets[i + 1]`, and
+    level `j` owns candidates `candidate_ids[id_offsets[j]:id_offsets[j + 1]]`.
+    Tied candidates share a level. `weights` is int64 unless some weight does not fit,
+    in which case it is an object array of Python integers.
+    """
+
+    weights: NDArray[Any]
+    level_offsets: NDArray[np.int64]
+    id_offsets: NDArray[np.int64]
+    candidate_ids: NDArray[np.int32]
+
+    def __len__(self) -> int:
+        return len(self.weights)
+
+    @classmethod
+    def from_ballots(cls, ballots: Sequence[dict[str, Any]]) -> BallotArrays:
+        """
+        Build arrays from the ballot dicts returned by `parse_ballots`. `LazyBallots`
+        hand back the arrays they were built on.
+        """
+        if isinstance(ballots, LazyBallots):
+            return ballots.arrays
+        weights: list[int] = []
+        level_offsets: list[int] = [0]
+        id_offsets: list[int] = [0]
+        candidate_ids: list[int] = []
+
+        for ballot in ballots:
+            weights.append(ballot["weight"])
+            for level in ballot["rankings"]:
+                candidate_ids.extend(candidate.id for candidate in level)
+                id_offsets.append(len(candidate_ids))
+            level_offsets.append(len(id_offsets) - 1)
+
+        return cls(
+            weights=weight_array(weights),
+            level_offsets=np.array(level_offsets, dtype=np.int64),
+            id_offsets=np.array(id_offsets, dtype=np.int64),
+            candidate_ids=np.array(candidate_ids, dtype=np.int32),
+        )
+
+    @classmethod
+    def concatenate(cls, parts: list[BallotArrays]) -> BallotArrays:
+        """Join ballot arrays end to end, in order."""
+        if not parts:
+            return cls.from_ballots([])
+        level_offsets = [np.zeros(1, dtype=np.int64)]
+        id_offsets = [np.zeros(1, dtype=np.int64)]
+        levels = ids = 0
+        for part in parts:
+            level_offsets.append(part.level_offsets[1:] + levels)
+            id_offsets.append(part.id_offsets[1:] + ids)
+            levels += len(part.id_offsets) - 1
+            ids += len(part.candidate_ids)
+        return cls(
+            weights=np.concatenate([part.weights for part in parts]),
+            level_offsets=np.concatenate(level_offsets),
+            id_offsets=np.concatenate(id_offsets),
+            candidate_ids=np.concatenate([part.candidate_ids for part in parts]),
+        )
+
+    def ballot_range(self, start: int, stop: int) -> BallotArrays:
+        """Ballots `start:stop` as arrays of their own, with offsets starting at 0."""
+        first_level, end_level = self.level_offsets[start], self.level_offsets[stop]
+        first_id, end_id = self.id_offsets[first_level], self.id_offsets[end_level]
+        return BallotArrays(
+            weights=self.weights[start:stop],
+            level_offsets=self.level_offsets[start : stop + 1] - first_level,
+            id_offsets=self.id_offsets[first_level : end_level + 1] - first_id,
+            candidate_ids=self.candidate_ids[first_id:end_id],
+        )
+
+    def positions(self) -> tuple[NDArray[np.int64], NDArray[np.int64]]:
+        """Ballot index and zero-based preference level of each entry of `candidate_ids`."""
+        ids_per_level = np.diff(self.id_offsets)
+        ballot_of_level = np.repeat(np.arange(len(self)), np.diff(self.level_offsets))
+        level_rank = np.arange(len(ids_per_level)) - self.level_offsets[ballot_of_level]
+        return np.repeat(ballot_of_level, ids_per_level), np.repeat(level_rank, ids_per_level)
+
+    def to_ballots(self, candidate_lookup: dict[int, Candidate]) -> list[dict[str, Any]]:
+        """Rebuild ballot dicts, sharing `Candidate` objects from `candidate_lookup`."""
+        weights = self.weights.tolist()
+        level_offsets = self.level_offsets.tolist()
+        id_offsets = self.id_offsets.tolist()
+        candidates = [candidate_lookup[cid] for cid in self.candidate_ids.tolist()]
+
+        levels = [candidates[id_offsets[j] : id_offsets[j + 1]] for j in range(len(id_offsets) - 1)]
+        return [
+            {"weight": weight, "rankings": levels[level_offsets[i] : level_offsets[i + 1]]}
+            for i, weight in enumerate(weights)
+        ]
+
+
+class LazyBallots(Sequence[dict[str, Any]]):
+    """
+    Read-only sequence of ballot dicts backed by `BallotArrays`, building each dict
+    only when it is accessed.
+
+    Loading from the binary cache returns these, so a reload costs reading the arrays
+    rather than one dict per ballot. Code that can work on `arrays` directly (statistics,
+    indexes, `BallotArrays.from_ballots`) never builds the dicts at all. Compares equal
+    to a list of the same ballot dicts.
+    """
+
+    # Ballots rebuilt per `to_ballots` call while iterating.
+    ITER_CHUNK_SIZE = 10_000
+
+    def __init__(self, arrays: BallotArrays, candidate_lookup: dict[int, Candidate]) -> None:
+        self.arrays = arrays
+        self.candidate_lookup = candidate_lookup
+
+    def __len__(self) -> int:
+        return len(self.arrays)
+
+    @overload
+    def __getitem__(self, index: int) -> dict[str, Any]: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[dict[str, Any]]: ...
+
+    def __getitem__(self, index: int | slice) -> dict[str, Any] | list[dict[str, Any]]:
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step == 1:
+                return self.arrays.ballot_range(start, max(start, stop)).to_ballots(
+                    self.candidate_lookup
+                )
+            return [self[i] for i in range(start, stop, step)]
+        position = index + len(self) if index < 0 else index
+        if not 0 <= position < len(self):
+            raise IndexError("ballot index out of range")
+        return self.arrays.ballot_range(position, position + 1).to_ballots(self.candidate_lookup)[0]
+
+    def __iter__(self) -> Iterator[dict[str, Any]]:
+        for start in range(0, len(self), self.ITER_CHUNK_SIZE):
+            yield from self[start : start + self.ITER_CHUNK_SIZE]
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, LazyBallots | list):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other, strict=True))
+        return NotImplemented
+
+    __hash__ = None  # pyright: ignore[reportAssignmentType]
+
+    def __repr__(self) -> str:
+        return f"LazyBallots({len(self)} ballots)"
@@ -0,0 +1,128 @@
+"""
+Transparent compression for .blt input and export output.
+
+Compressed input is recognized by its magic bytes, or by its suffix when the file is
+too short to tell, and decompressed as a stream, so archives can be read without
+unpacking them to disk first. gzip, bz2 and xz use the standard library; zstd needs
+the optional `zstandard` package (`pip install "fresh_blt[zstd]"`). gzip output carries
+no timestamp or file name, so equal content gives byte-identical files.
+"""
+
+from __future__ import annotations
+
+import bz2
+import gzip
+import io
+import lzma
+from pathlib import Path
+from typing import IO, Any
+
+COMPRESSIONS = ("gzip", "bz2", "xz", "zstd")
+
+COMPRESSION_SUFFIXES = {"gzip": ".gz", "bz2": ".bz2", "xz": ".xz", "zstd": ".zst"}
+
+_MAGIC_BYTES = {
+    b"\x1f\x8b": "gzip",
+    b"BZh": "bz2",
+    b"\xfd7zXZ\x00": "xz",
+    b"\x28\xb5\x2f\xfd": "zstd",
+}
+
+
+def detect_compression(path: Path) -> str | None:
+    """Return the compression of `path` (one of `COMPRESSIONS`), or `None` for plain files."""
+    with open(path, "rb") as f:
+        head = f.read(6)
+    for magic, compression in _MAGIC_BYTES.items():
+        if head.startswith(magic):
+            return compression
+    if len(head) < 6:
+        for compression, suffix in COMPRESSION_SUFFIXES.items():
+            if path.suffix == suffix:
+                return compression
+    return None
+
+
+class _ReproducibleGzipFile(gzip.GzipFile):
+    """
+    Gzip writer that leaves the file name out of the header and sets its mtime to 0,
+    so the same content always compresses to the same bytes.
+    """
+
+    def __init__(self, path: Path, mode: str) -> None:
+        self._raw = open(path, mode)
+        try:
+            super().__init__(filename="", mode=mode, fileobj=self._raw, mtime=0)
+        except BaseException:
+            self._raw.close()
+            raise
+
+    def close(self) -> None:
+        try:
+            super().close()
+        finally:
+            self._raw.close()
+
+
+def open_stream(
+    path: Path,
+    mode: str = "rb",
+    compression: str | None = None,
+    encoding: str | None = None,
+    newline: str | None = None,
+) -> IO[Any]:
+    """
+    Open `path` like `open()`, (de)compressing with `compression` if it is set. Text
+    modes (`"rt"`, `"wt"`) take `encoding` and `newline` as `open()` does.
+    """
+    if compression is None:
+        return open(path, mode, encoding=encoding, newline=newline)
+    if compression not in COMPRESSIONS:
+        raise ValueError(
+            f"Unsupported compression: {compression}. Use {', '.join(map(repr, COMPRESSIONS))}."
+        )
+
+    if "b" in mode:
+        encoding = newline = None
+    elif "t" not in mode:
+        # The compression modules default to binary; text must be requested explicitly.
+        mode = f"{mode}t"
+
+    if compression == "gzip":
+        if "r" in mode:
+            # GzipFile is a binary file object, though typeshed does not declare it IO.
+            return gzip.open(path, mode, encoding=encoding, newline=newline)  # pyright: ignore[reportReturnType]
+        binary = _ReproducibleGzipFile(path, mode.replace("t", "").replace("b", "") + "b")
+        if "t" in mode:
+            return io.TextIOWrapper(binary, encoding=encoding, newline=newline)
+        return binary  # pyright: ignore[reportReturnType]
+    if compression == "bz2":
+        return bz2.open(path, mode, encoding=encoding, newline=newline)
+    if compression == "xz":
+        return lzma.open(path, mode, encoding=encoding, newline=newline)
+
+    try:
+        import zstandard
+    except ImportError as e:
+        raise ImportError(
+            'zstd compression requires the zstandard package: pip install "fresh_blt[zstd]"'
+        ) from e
+    return zstandard.open(path, mode, encoding=encoding, newline=newline)
+
+
+def read_blt_text(path: Path) -> str:
+    """Read a possibly compressed .blt file as text."""
+    with open_stream(path, "rt", detect_compression(path), encoding="utf-8") as f:
+        return f.read()
+
+
+def compressed_path(path: Path, compression: str | None) -> Path:
+    """Append the suffix for `compression` to `path`, unless it is already there."""
+    if compression is None:
+        return path
+    if compression not in COMPRESSION_SUFFIXES:
+        raise ValueError(
+            f"Unsupported compression: {compression}. Use {', '.join(map(repr, COMPRESSIONS))}."
+        )
+    suffix = COMPRESSION_SUFFIXES[compression]
+    return path if path.suffix == suffix else path.with_name(f"{path.name}{suffix}")
@@ -1,21 +1,37 @@
 from __future__ import annotations
 
-import json
 import logging
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
-import pandas as pd
 from rich.console import Console
 
+from fresh_blt.compression import compressed_path, open_stream
 from fresh_blt.models.candidate import Candidate
+from fresh_blt.serializers import get_json_backend
+from fresh_blt.timing import stage
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+    from fresh_blt.columnar import BallotArrays
 
 console = Console()
 logger = logging.getLogger(__name__)
 
+BLT_WRITE_CHUNK_SIZE = 10_000
+
+# Output suffix per export format, used when deriving output paths for batch exports.
+EXPORT_SUFFIXES = {"json": ".json", "csv": ".csv", "blt": ".blt"}
+JSON_SCHEMAS = ("full", "compact")
+
 
 def create_candidates_dataframe(candidates: list[Candidate]) -> pd.DataFrame:
     """Create a pandas DataFrame from candidates data."""
+    import pandas as pd
+
     data = []
     for candidate in candidates:
         data.append(
@@ -30,9 +46,11 @@ def create_candidates_dataframe(candidates: list[Candidate]) -> pd.DataFrame:
 
 
 def create_ballots_dataframe(
-    ballots: list[dict[str, Any]], candidates: list[Candidate]
+    ballots: Sequence[dict[str, Any]], candidates: list[Candidate]
 ) -> pd.DataFrame:
     """Create a pandas DataFrame from ballots data."""
+    import pandas as pd
+
     candidate_lookup = {c.id: c.name for c in candidates}
 
     data = []
@@ -61,38 +79,54 @@ def create_ballots_dataframe(
 
 def create_election_dataframe(election_info: dict[str, Any]) -> pd.DataFrame:
     """Create a pandas DataFrame from election info."""
+    import pandas as pd
+
     return pd.DataFrame([election_info])
 
 
 def export_to_csv(
     election_info: dict[str, Any],
     candidates: list[Candidate],
-    ballots: list[dict[str, Any]],
+    ballots: Sequence[dict[str, Any]],
     output_path: Path,
+    compression: str | None = None,
 ) -> list[Path]:
-    """Export election data to multiple CSV files."""
-    output_files = []
+    """
+    Export election data to multiple CSV files, each compressed with `compression`
+    if set.
+
+    The election, candidates and ballots files are built and written concurrently on
+    a small thread pool so their I/O overlaps.
+    """
 
-    # Export election info
-    election_file = output_path.with_stem(f"{output_path.stem}_election").with_suffix(".csv")
-    election_df = create_election_dataframe(election_info)
-    election_df.to_csv(election_file, index=False)
-    output_files.append(election_file)
-    console.print(f"[green]✓ Exported election info to {election_file}[/green]")
-
-    # Export candidates
-    candidates_file = output_path.with_stem(f"{output_path.stem}_candidates").with_suffix(".csv")
-    candidates_df = create_candidates_dataframe(candidates)
-    candidates_df.to_csv(candidates_file, index=False)
-    output_files.append(candidates_file)
-    console.print(f"[green]✓ Exported candidates to {candidates_file}[/green]")
-
-    # Export ballots
-    ballots_file = output_path.with_stem(f"{output_path.stem}_ballots").with_suffix(".csv")
-    ballots_df = create_ballots_dataframe(ballots, candidates)
-    ballots_df.to_csv(ballots_file, index=False)
-    output_files.append(ballots_file)
-    console.print(f"[green]✓ Exported ballots to {ballots_file}[/green]")
+    def csv_path(kind: str) -> Path:
+        path = output_path.with_stem(f"{output_path.stem}_{kind}").with_suffix(".csv")
+        return compressed_path(path, compression)
+
+    election_file = csv_path("election")
+    candidates_file = csv_path("candidates")
+    ballots_file = csv_path("ballots")
+
+    writers: list[tuple[Path, str, Callable[[], pd.DataFrame]]] = [
+        (election_file, "election info", lambda: create_election_dataframe(election_info)),
+        (candidates_file, "candidates", lambda: create_candidates_dataframe(candidates)),
+        (ballots_file, "ballots", lambda: create_ballots_dataframe(ballots, candidates)),
+    ]
+
+    def write(path: Path, build: Callable[[], pd.DataFrame]) -> Path:
+        with open_stream(path, "wt", compression, encoding="utf-8", newline="") as f:
+            build().to_csv(f, index=False)
+        return path
+
+    with stage("write_csv"), ThreadPoolExecutor(max_workers=len(writers)) as pool:
+        futures = [pool.submit(write, path, build) for path, _, build in writers]
+
+    # Report in a fixed order once every writer has finished; result() re-raises failures.
+    output_files = []
+    for future, (_, label, _) in zip(futures, writers, strict=True):
+        output_file = future.result()
+        output_files.append(output_file)
+        console.print(f"[green]✓ Exported {label} to {output_file}[/green]")
 
     return output_files
 
@@ -100,22 +134,53 @@ def export_to_csv(
 def export_to_json(
     election_info: dict[str, Any],
     candidates: list[Candidate],
-    ballots: list[dict[str, Any]],
+    ballots: Sequence[dict[str, Any]],
     output_path: Path,
+    schema: str = "full",
+    backend: str = "auto",
+    compression: str | None = None,
 ) -> Path:
-    """Export election data to a single JSON file."""
-    json_candidates = [candidate.model_dump() for candidate in candidates]
+    """
+    Export election data to a single JSON file, compressed with `compression` if set.
 
-    json_ballots = []
-    for i, ballot in enumerate(ballots):
-        json_ballot = {
-            "ballot_id": i + 1,
-            "weight": ballot["weight"],
-            "rankings": [
-                [candidate.model_dump() for candidate in ranking] for ranking in ballot["rankings"]
-            ],
-        }
-        json_ballots.append(json_ballot)
+    The `full` schema embeds a complete candidate dict at every ranking position and is
+    indented. The `compact` schema is unindented, lists ballots in file order without
+    `ballot_id`, and writes rankings as lists of candidate IDs. `backend` selects the
+    encoder, see `fresh_blt.serializers.get_json_backend`.
+    """
+    if schema not in JSON_SCHEMAS:
+        raise ValueError(f"Unsupported JSON schema: {schema}. Use 'full' or 'compact'.")
+    serializer = get_json_backend(backend)
+
+    with stage("build_json"):
+        if schema == "compact":
+            json_candidates = [
+                {"id": c.id, "name": c.name, "withdrawn": c.withdrawn} for c in candidates
+            ]
+            json_ballots = [
+                {
+                    "weight": ballot["weight"],
+                    "rankings": [[c.id for c in ranking] for ranking in ballot["rankings"]],
+                }
+                for ballot in ballots
+            ]
+        else:
+            json_candidates = [candidate.model_dump() for candidate in candidates]
+            # Dump each candidate once and share the dicts across every ranking that cites it.
+            candidate_dumps = {
+                c.id: dump for c, dump in zip(candidates, json_candidates, strict=True)
+            }
+            json_ballots = [
+                {
+                    "ballot_id": i + 1,
+                    "weight": ballot["weight"],
+                    "rankings": [
+                        [candidate_dumps.get(c.id) or c.model_dump() for c in ranking]
+                        for ranking in ballot["rankings"]
+                    ],
+                }
+                for i, ballot in enumerate(ballots)
+            ]
 
     export_data = {
         "election_info": election_info,
@@ -130,35 +195,236 @@ def export_to_json(
         },
     }
 
-    with open(output_path, "w", encoding="utf-8") as f:
-        json.dump(export_data, f, indent=2, ensure_ascii=False)
+    output_path = compressed_path(output_path, compression)
+    with stage("serialize_json"), open_stream(output_path, "wb", compression) as f:
+        serializer.dump(export_data, f, schema == "full")
 
     console.print(f"[green]✓ Exported JSON data to {output_path}[/green]")
     return output_path
 
 
+def canonicalize_ballots(
+    ballots: Sequence[dict[str, Any]],
+    aggregate: bool = False,
+    sort_ballots: bool = False,
+    normalize_ties: bool = False,
+) -> Sequence[dict[str, Any]]:
+    """
+    Return a canonical copy of `ballots`.
+
+    `normalize_ties` orders tied candidates by ID, `aggregate` merges ballots with
+    identical rankings (summing weights, keeping first-seen order), and `sort_ballots`
+    orders ballots by their rankings, then by descending weight. Ties are normalized
+    before aggregating so `1=2` and `2=1` count as the same ballot.
+    """
+    result = ballots
+    if normalize_ties:
+        result = [
+            {
+                "weight": ballot["weight"],
+                "rankings": [sorted(level, key=lambda c: c.id) for level in ballot["rankings"]],
+            }
+            for ballot in result
+        ]
+
+    if aggregate:
+        merged: dict[tuple[tuple[int, ...], ...], dict[str, Any]] = {}
+        for ballot in result:
+            key = _ranking_key(ballot)
+            if key in merged:
+                merged[key]["weight"] += ballot["weight"]
+            else:
+                merged[key] = {"weight": ballot["weight"], "rankings": ballot["rankings"]}
+        result = list(merged.values())
+
+    if sort_ballots:
+        result = sorted(result, key=lambda b: (_ranking_key(b), -b["weight"]))
+
+    return result
+
+
+def _ranking_key(ballot: dict[str, Any]) -> tuple[tuple[int, ...], ...]:
+    return tuple(tuple(c.id for c in level) for level in ballot["rankings"])
+
+
+def _blt_quote(text: str) -> str:
+    # Quoted names cannot span lines; quotes and backslashes are escaped as the
+    # grammar's ESCAPED_STRING expects, and `unquote_name` reverses that.
+    if "\n" in text or "\r" in text:
+        raise ValueError(f"Cannot write name to .blt (contains a newline): {text!r}")
+    escaped = text.replace("\\", "\\\\").replace('"', '\\"')
+    return f'"{escaped}"'
+
+
+def iter_blt_lines(
+    election_info: dict[str, Any],
+    candidates: list[Candidate],
+    ballots: Sequence[dict[str, Any]],
+) -> Iterator[str]:
+    """Yield the lines of a .blt file, each terminated by a newline."""
+    yield f"{election_info['num_candidates']} {election_info['num_positions']}\n"
+
+    # The grammar expects one withdrawn entry per line.
+    for candidate_id in election_info["withdrawn_candidate_ids"]:
+        yield f"-{candidate_id}\n"
+
+    for ballot in ballots:
+        # Empty preference levels cannot be represented in .blt and are dropped by the parser.
+        levels = ["=".join(str(c.id) for c in level) for level in ballot["rankings"] if level]
+        yield f"{ballot['weight']} {' '.join(levels)} 0\n"
+
+    yield "0\n"
+    for candidate in sorted(candidates, key=lambda c: c.id):
+        yield f"{_blt_quote(candidate.name)}\n"
+    yield f"{_blt_quote(election_info['title'])}\n"
+
+
+def write_blt(
+    election_info: dict[str, Any],
+    candidates: list[Candidate],
+    ballots: Sequence[dict[str, Any]],
+    output_path: Path,
+    aggregate: bool = False,
+    sort_ballots: bool = False,
+    normalize_ties: bool = False,
+    compression: str | None = None,
+) -> Path:
+    """
+    Write election data as a .blt file that parses back to the same data.
+
+    Output is streamed in chunks of `BLT_WRITE_CHUNK_SIZE` lines rather than built as
+    one string, through `compression` if set. The canonicalization flags are described
+    in `canonicalize_ballots`. Raises `ValueError` for names that the .blt grammar
+    cannot represent.
+    """
+    ballots = canonicalize_ballots(ballots, aggregate, sort_ballots, normalize_ties)
+
+    output_path = compressed_path(output_path, compression)
+    with (
+        stage("write_blt"),
+        open_stream(output_path, "wt", compression, encoding="utf-8", newline="\n") as f,
+    ):
+        chunk: list[str] = []
+        for line in iter_blt_lines(election_info, candidates, ballots):
+            chunk.append(line)
+            if len(chunk) >= BLT_WRITE_CHUNK_SIZE:
+                f.write("".join(chunk))
+                chunk.clear()
+        f.write("".join(chunk))
+
+    console.print(f"[green]✓ Exported BLT data to {output_path}[/green]")
+    return output_path
+
+
+def format_ballot_arrays(arrays: BallotArrays) -> str:
+    """The .blt ballot lines for `arrays`, as one string."""
+    import numpy as np
+
+    candidate_ids = arrays.candidate_ids
+    # Each candidate is written with the separator that follows it: "=" inside a tie,
+    # " " at the end of its level. Looking both up in one table keeps the per-candidate
+    # work to a list index.
+    level_end = np.zeros(len(candidate_ids), dtype=np.int64)
+    level_end[arrays.id_offsets[1:] - 1] = 1
+    tokens = [
+        token
+        for candidate_id in range(int(candidate_ids.max(initial=0)) + 1)
+        for token in (f"{candidate_id}=", f"{candidate_id} ")
+    ]
+    ballot_text = [tokens[code] for code in (candidate_ids * 2 + level_end).tolist()]
+
+    # Offsets of each ballot's first candidate in `ballot_text`.
+    starts = arrays.id_offsets[arrays.level_offsets].tolist()
+    return "".join(
+        [
+            f"{weight} {''.join(ballot_text[start:end])}0\n"
+            for weight, start, end in zip(arrays.weights.tolist(), starts, starts[1:], strict=False)
+        ]
+    )
+
+
+def write_blt_stream(
+    output_path: Path,
+    title: str,
+    candidate_names: list[str],
+    ballot_batches: Iterable[BallotArrays],
+    num_positions: int = 1,
+    withdrawn_candidate_ids: Iterable[int] = (),
+    compression: str | None = None,
+    line_ending: str = "\n",
+) -> Path:
+    """
+    Write a .blt file from batches of `BallotArrays`, formatting and writing each batch
+    as it arrives so that no more than one batch is held in memory. Candidate IDs in
+    the ballots are 1-based positions in `candidate_names`. Lines end with
+    `line_ending` ("\r\n" for Windows-style files). Compressed with `compression` if set.
+
+    Raises:
+        ValueError: For names that the .blt grammar cannot represent
+    """
+    quoted_names = [_blt_quote(name) for name in [*candidate_names, title]]
+    output_path = compressed_path(output_path, compression)
+    with (
+        stage("write_blt"),
+        open_stream(output_path, "wt", compression, encoding="utf-8", newline=line_ending) as f,
+    ):
+        f.write(f"{len(candidate_names)} {num_positions}\n")
+        f.writelines(f"-{candidate_id}\n" for candidate_id in withdrawn_candidate_ids)
+        for arrays in ballot_batches:
+            f.write(format_ballot_arrays(arrays))
+        f.write("0\n")
+        f.writelines(f"{name}\n" for name in quoted_names)
+    return output_path
+
+
 def export_to_dataframes(
-    election_info: dict[str, Any], candidates: list[Candidate], ballots: list[dict[str, Any]]
+    election_info: dict[str, Any], candidates: list[Candidate], ballots: Sequence[dict[str, Any]]
 ) -> dict[str, pd.DataFrame]:
     """Create and return pandas DataFrames for all election data."""
-    return {
-        "election": create_election_dataframe(election_info),
-        "candidates": create_candidates_dataframe(candidates),
-        "ballots": create_ballots_dataframe(ballots, candidates),
-    }
+    with stage("build_dataframes"):
+        return {
+            "election": create_election_dataframe(election_info),
+            "candidates": create_candidates_dataframe(candidates),
+            "ballots": create_ballots_dataframe(ballots, candidates),
+        }
 
 
 def export_with_format(
     election_info: dict[str, Any],
     candidates: list[Candidate],
-    ballots: list[dict[str, Any]],
+    ballots: Sequence[dict[str, Any]],
     output_path: Path,
     format: str,
+    canonicalize: bool = False,
+    json_schema: str = "full",
+    compression: str | None = None,
 ) -> list[Path] | Path:
-    """Export election data in the specified format."""
+    """
+    Export election data in the specified format, compressed with `compression` if
+    set. `canonicalize` applies all canonicalizations of `write_blt` and only affects
+    the `blt` format; `json_schema` only affects the `json` format.
+    """
     if format.lower() == "json":
-        return export_to_json(election_info, candidates, ballots, output_path)
+        return export_to_json(
+            election_info,
+            candidates,
+            ballots,
+            output_path,
+            json_schema,
+            compression=compression,
+        )
     elif format.lower() == "csv":
-        return export_to_csv(election_info, candidates, ballots, output_path)
+        return export_to_csv(election_info, candidates, ballots, output_path, compression)
+    elif format.lower() == "blt":
+        return write_blt(
+            election_info,
+            candidates,
+            ballots,
+            output_path,
+            aggregate=canonicalize,
+            sort_ballots=canonicalize,
+            normalize_ties=canonicalize,
+            compression=compression,
+        )
     else:
-        raise ValueError(f"Unsupported format: {format}. Use 'json' or 'csv'.")
+        raise ValueError(f"Unsupported format: {format}. Use 'json', 'csv' or 'blt'.")
@@ -8,8 +8,21 @@ for testing and development purposes.
 
 from .blt_provider import BLTProvider
 from .generators import BLTGenerators
+from .preferences import Mallows, PlackettLuce, PreferenceModel, Spatial, Uniform
+from .stress import STRESS_PROFILES, write_stress_blt, write_stress_profile
+from .vectorized import generate_ballot_arrays, iter_ballot_arrays
 
 __all__ = [
     "BLTProvider",
     "BLTGenerators",
+    "Mallows",
+    "PlackettLuce",
+    "PreferenceModel",
+    "STRESS_PROFILES",
+    "Spatial",
+    "Uniform",
+    "generate_ballot_arrays",
+    "iter_ballot_arrays",
+    "write_stress_blt",
+    "write_stress_profile",
 ]
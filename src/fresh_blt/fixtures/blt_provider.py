@@ -7,14 +7,19 @@ This module provides a Faker provider that can generate:
 - Individual components (candidates, ballots)
 """
 
+from pathlib import Path
 from typing import Any
 
+import numpy as np
 from faker.providers import BaseProvider
 
 from fresh_blt.models.ballot import Ballot
 from fresh_blt.models.candidate import Candidate
 from fresh_blt.models.election import Election
 
+from .preferences import PreferenceModel
+from .vectorized import generate_ballot_arrays, iter_ballot_arrays
+
 
 class BLTProvider(BaseProvider):
     """
@@ -167,6 +172,41 @@ class BLTProvider(BaseProvider):
             "num_seats": num_seats,
         }
 
+    def fast_election(
+        self,
+        num_candidates: int | None = None,
+        num_ballots: int | None = None,
+        withdrawn_rate: float = 0.1,
+        num_seats: int = 1,
+        model: PreferenceModel | None = None,
+    ) -> dict[str, Any]:
+        """
+        Generate a complete election dataset like `election`, drawing the ballots with
+        NumPy in batches (see `fresh_blt.fixtures.vectorized`). Much faster for large
+        elections, with the same ranking, tie and weight distributions; `model` draws
+        the orderings from a preference model instead (see `fresh_blt.fixtures.preferences`).
+        """
+        # int() so the type checker narrows away None; Faker's return types are unknown.
+        if num_candidates is None:
+            num_candidates = int(self.generator.random_int(min=3, max=8))
+        if num_ballots is None:
+            num_ballots = int(self.generator.random_int(min=20, max=200))
+
+        candidates = [
+            self.candidate(candidate_id=i + 1, withdrawn_rate=withdrawn_rate)
+            for i in range(num_candidates)
+        ]
+        # Seed NumPy from Faker so seed_instance() makes the ballots reproducible too.
+        rng = np.random.default_rng(self.generator.random.getrandbits(64))
+        arrays = generate_ballot_arrays(num_candidates, num_ballots, rng, model=model)
+
+        return {
+            "name": self.election_name(),
+            "candidates": candidates,
+            "ballots": arrays.to_ballots({c["id"]: c for c in candidates}),  # pyright: ignore
+            "num_seats": num_seats,
+        }
+
     def close_election(
         self,
         num_candidates: int = 5,
@@ -311,6 +351,41 @@ class BLTProvider(BaseProvider):
 
         return content
 
+    def stream_blt_file(
+        self,
+        filepath: str | Path,
+        num_candidates: int,
+        num_ballots: int,
+        withdrawn_rate: float = 0.1,
+        num_seats: int = 1,
+        compression: str | None = None,
+        batch_size: int | None = None,
+        model: PreferenceModel | None = None,
+    ) -> Path:
+        """
+        Generate a .blt file of `num_ballots` ballots without holding them in memory:
+        ballots are drawn in batches of `batch_size` (see `fast_election`, also for
+        `model`) and each batch is written as soon as it is drawn. Returns the path written.
+        """
+        from fresh_blt.export import write_blt_stream
+
+        candidates = [
+            self.candidate(candidate_id=i + 1, withdrawn_rate=withdrawn_rate)
+            for i in range(num_candidates)
+        ]
+        rng = np.random.default_rng(self.generator.random.getrandbits(64))
+        return write_blt_stream(
+            Path(filepath),
+            self.election_name(),
+            [c["name"] for c in candidates],
+            iter_ballot_arrays(
+                num_candidates, num_ballots, rng, batch_size=batch_size, model=model
+            ),
+            num_positions=num_seats,
+            withdrawn_candidate_ids=[c["id"] for c in candidates if c["withdrawn"]],
+            compression=compression,
+        )
+
     def election_object(self, election_data: dict[str, Any] | None = None):
         """Generate an Election model instance."""
         if election_data is None:
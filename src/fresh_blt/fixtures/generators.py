@@ -4,18 +4,75 @@ High-level generators for common election scenarios.
 This module provides convenient generators for specific types of elections.
 """
 
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
 from faker import Faker
 
+from fresh_blt.compression import COMPRESSIONS, compressed_path, open_stream
+
 from .blt_provider import BLTProvider
+from .preferences import PreferenceModel
+
+
+def seeded_faker(seed: int | None = None) -> Faker:
+    """Faker instance with the BLT provider, seeded if `seed` is given."""
+    faker = Faker()
+    if seed is not None:
+        faker.seed_instance(seed)
+    faker.add_provider(BLTProvider)
+    return faker
+
+
+def derive_seeds(seed: int | None, count: int) -> list[int]:
+    """
+    Independent per-file seeds derived from a master `seed` (fresh entropy if `None`).
+    File i always gets the same seed, however the files are spread over workers.
+    """
+    return [
+        int(child.generate_state(1, np.uint64)[0])
+        for child in np.random.SeedSequence(seed).spawn(count)
+    ]
+
+
+def _generate_file(
+    path: str,
+    seed: int,
+    num_candidates: int | None,
+    num_ballots: int | None,
+    num_seats: int,
+    compression: str | None,
+    model: PreferenceModel | None,
+) -> str:
+    faker = seeded_faker(seed)
+    if num_candidates is None:
+        num_candidates = faker.random_int(min=3, max=8)
+    if num_ballots is None:
+        num_ballots = faker.random_int(min=20, max=200)
+    return str(
+        faker.stream_blt_file(
+            path,
+            num_candidates,
+            num_ballots,
+            num_seats=num_seats,
+            compression=compression,
+            model=model,
+        )
+    )
 
 
 class BLTGenerators:
     """Collection of generators for specific election scenarios."""
 
     def __init__(self, faker=None, seed: int | None = None):
+        self.seed = seed
+        self.custom_faker = faker is not None
+        if faker is None:
+            faker = seeded_faker(seed)
+        elif seed is not None:
+            faker.seed_instance(seed)
         self.faker = faker
-        if seed:
-            pass  # Set seed if provided
 
     def small_election(self) -> str:
         """Generate a small 3-4 candidate election."""
@@ -35,14 +92,77 @@ class BLTGenerators:
             self.faker.election(num_candidates=6, num_ballots=80, num_seats=num_seats)
         )
 
-    def batch_generate(self, count: int, pattern: str = "test_election_{}.blt") -> list[str]:
-        """Generate multiple .blt files."""
-        files = []
-        for i in range(count):
-            filename = pattern.format(i + 1)
-            self.faker.blt_file(filename)
-            files.append(filename)
-        return files
+    def batch_generate(
+        self,
+        count: int,
+        pattern: str = "test_election_{}.blt",
+        num_candidates: int | None = None,
+        num_ballots: int | None = None,
+        num_seats: int = 1,
+        workers: int | None = 1,
+        compression: str | None = None,
+        model: PreferenceModel | None = None,
+    ) -> list[str]:
+        """
+        Generate multiple .blt files, named by formatting `pattern` with 1 to `count`.
+
+        Each file is streamed from its own seed derived from the generator's seed, in a
+        pool of `workers` processes (`None`: one per CPU), so the files are identical
+        whatever the worker count; `model` is the preference model for the orderings (see
+        `BLTProvider.fast_election`). A generator given its own `faker` instead draws
+        each file in turn from it as an `election`, in this process and without a model.
+        Unset sizes are drawn per file as in `election`. Returns the paths written, in
+        order.
+
+        Raises:
+            ValueError: If the compression is not supported, `pattern` would give
+                several files the same name, or the generator was given its own `faker`
+                together with a `model` or more than one worker
+        """
+        if compression is not None and compression not in COMPRESSIONS:
+            raise ValueError(
+                f"Unsupported compression: {compression}. Use {', '.join(map(repr, COMPRESSIONS))}."
+            )
+        if count > 1 and pattern.format(1) == pattern.format(2):
+            raise ValueError(f"File name pattern {pattern!r} needs a {{}} for the file number")
+        paths = [pattern.format(i + 1) for i in range(count)]
+        if self.custom_faker:
+            if workers != 1 or model is not None:
+                raise ValueError(
+                    "Parallel or model-based batches draw from derived seeds and cannot use "
+                    "the faker passed to BLTGenerators; use workers=1 and no model"
+                )
+            return [
+                self._write_election(path, num_candidates, num_ballots, num_seats, compression)
+                for path in paths
+            ]
+        jobs = [
+            (path, seed, num_candidates, num_ballots, num_seats, compression, model)
+            for path, seed in zip(paths, derive_seeds(self.seed, count), strict=True)
+        ]
+        if workers == 1:
+            return [_generate_file(*job) for job in jobs]
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(_generate_file, *zip(*jobs, strict=True)))
+
+    def _write_election(
+        self,
+        path: str,
+        num_candidates: int | None,
+        num_ballots: int | None,
+        num_seats: int,
+        compression: str | None,
+    ) -> str:
+        election = self.faker.election(
+            num_candidates=num_candidates, num_ballots=num_ballots, num_seats=num_seats
+        )
+        if compression is None:
+            self.faker.blt_file(path, election)
+            return path
+        output_path = compressed_path(Path(path), compression)
+        with open_stream(output_path, "wt", compression, encoding="utf-8") as f:
+            f.write(self.faker.blt_content(election))
+        return str(output_path)
 
     def generate_withdrawn_candidates(self, withdrawn_count: int) -> str:
         """Generate election with specific number of withdrawn candidates."""
@@ -57,10 +177,7 @@ class BLTGenerators:
 # Convenience functions
 def generate_small_election(seed: int | None = None) -> str:
     """Convenience function for small election generation."""
-    faker = Faker()
-    if seed:
-        faker.seed_instance(seed)
-    faker.add_provider(BLTProvider)
+    faker = seeded_faker(seed)
     return faker.blt_content(faker.election(num_candidates=4, num_ballots=25))
 
 
@@ -68,8 +185,5 @@ def generate_test_election(
     num_candidates: int = 4, num_ballots: int = 50, seed: int | None = None
 ) -> str:
     """Convenience function for test election generation."""
-    faker = Faker()
-    if seed:
-        faker.seed_instance(seed)
-    faker.add_provider(BLTProvider)
+    faker = seeded_faker(seed)
     return faker.blt_content(faker.election(num_candidates=num_candidates, num_ballots=num_ballots))
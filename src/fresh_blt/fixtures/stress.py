@@ -0,0 +1,180 @@
+"""
+Adversarial stress corpora.
+
+The Faker fixtures stay small and well-behaved. The corpora here push every dimension
+of the format to its extremes, so that complexity blowups in parsers, exporters and
+aggregations (say, quadratic tie handling) show up in benchmarks:
+
+- a thousand or more candidates, most of them withdrawn;
+- rankings hundreds of preferences deep;
+- tie groups of hundreds of candidates joined with `=`;
+- candidate names thousands of characters long, full of non-ASCII text, digits, `=`
+  and other characters the grammar must keep inside the quotes;
+- weights far beyond 32 bits;
+- Windows line endings.
+
+`STRESS_PROFILES` names corpora that each stress one dimension, plus `everything`,
+which stresses them all at once. `write_stress_blt` accepts the same settings
+directly.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from fresh_blt.columnar import BallotArrays
+
+# Keeps each batch's (ballots x candidates) working arrays to a few tens of MB.
+STRESS_BATCH_CELLS = 1 << 22
+
+# Characters mixed into names: .blt syntax outside quotes, non-ASCII letters, emoji.
+NAME_ALPHABET = list("abcdefghij ABCDEFGHIJ 0123456789 =-#.,;:/\\ äöüßéèñçøåæ ΩЖ中文 🗳")
+
+# Sizes stress structure rather than volume (the benchmark presets cover volume), and
+# keep each profile's traced benchmark run within a few GB.
+STRESS_PROFILES: dict[str, dict[str, Any]] = {
+    "many-candidates": {"num_candidates": 2000, "num_ballots": 10_000, "max_depth": 50},
+    "deep-rankings": {"num_candidates": 1000, "num_ballots": 5_000, "max_depth": 500},
+    "big-ties": {
+        "num_candidates": 1000,
+        "num_ballots": 5_000,
+        "max_depth": 500,
+        "tie_heavy_rate": 0.5,
+    },
+    "long-names": {"num_candidates": 1000, "num_ballots": 5_000, "name_length": 10_000},
+    "huge-weights": {"num_candidates": 20, "num_ballots": 20_000, "max_weight": 2**53},
+    "many-withdrawn": {"num_candidates": 1000, "num_ballots": 10_000, "withdrawn_rate": 0.9},
+    "crlf": {"num_candidates": 20, "num_ballots": 20_000, "line_ending": "\r\n"},
+    # Smaller, since exports repeat each name at every preference that ranks it.
+    "everything": {
+        "num_candidates": 1000,
+        "num_ballots": 2_000,
+        "max_depth": 500,
+        "tie_heavy_rate": 0.3,
+        "name_length": 200,
+        "max_weight": 2**53,
+        "withdrawn_rate": 0.5,
+        "line_ending": "\r\n",
+    },
+}
+
+
+def stress_ballot_batch(
+    rng: np.random.Generator,
+    num_candidates: int,
+    num_ballots: int,
+    max_depth: int,
+    tie_heavy_rate: float = 0.0,
+    max_weight: int = 1,
+) -> BallotArrays:
+    """
+    Draw `num_ballots` ballots ranking 1 to `max_depth` candidates each.
+
+    A `tie_heavy_rate` share of ballots tie their first `max_depth // 4` preferences
+    into one group and the rest into groups averaging 50 candidates; other ballots tie
+    10% of adjacent preferences. Weights are uniform in 1 to `max_weight`.
+    """
+    max_depth = min(max_depth, num_candidates)
+    weights = rng.integers(1, max_weight, size=num_ballots, endpoint=True, dtype=np.int64)
+    depth = rng.integers(1, max_depth, size=num_ballots, endpoint=True)
+    # Each preference past the first starts a new level unless it ties the previous one.
+    tie_heavy = rng.random(num_ballots) < tie_heavy_rate
+    new_level_rate = np.where(tie_heavy, 1 / 50, 0.9)
+    level_starts = rng.random((num_ballots, max_depth)) < new_level_rate[:, None]
+    level_starts[:, 0] = True
+    level_starts[tie_heavy, 1 : max(1, max_depth // 4)] = False
+
+    ranked = np.arange(max_depth) < depth[:, None]
+    # The first `max_depth` columns of a random permutation per ballot; argsort of
+    # random keys costs the same as permuting but allows taking a prefix.
+    order = np.argsort(rng.random((num_ballots, num_candidates)), axis=1)[:, :max_depth] + 1
+    ranked_ids = order[ranked].astype(np.int32)
+    level_starts &= ranked
+    return BallotArrays(
+        weights=weights,
+        level_offsets=np.concatenate(([0], np.cumsum(level_starts.sum(axis=1)))).astype(np.int64),
+        id_offsets=np.append(np.flatnonzero(level_starts[ranked]), ranked_ids.size).astype(
+            np.int64
+        ),
+        candidate_ids=ranked_ids,
+    )
+
+
+def stress_name(rng: np.random.Generator, index: int, length: int) -> str:
+    """A name of about `length` characters, unique through its `index` prefix."""
+    prefix = f"Candidate {index} "
+    filler = rng.choice(NAME_ALPHABET, size=max(0, length - len(prefix)))
+    return prefix + "".join(filler.tolist())
+
+
+def write_stress_blt(
+    path: str | Path,
+    num_candidates: int = 1000,
+    num_ballots: int = 10_000,
+    max_depth: int = 20,
+    tie_heavy_rate: float = 0.0,
+    name_length: int = 20,
+    max_weight: int = 1,
+    withdrawn_rate: float = 0.0,
+    line_ending: str = "\n",
+    seed: int | None = None,
+) -> Path:
+    """
+    Write a stress corpus to `path`, streaming ballots in batches. The same seed and
+    arguments always give the same file.
+
+    Args:
+        path: Where to write the .blt file
+        num_candidates: Number of candidates
+        num_ballots: Number of ballots
+        max_depth: Most preferences on a ballot; depths are uniform from 1
+        tie_heavy_rate: Share of ballots made of very large tie groups
+        name_length: Approximate length of candidate names, in characters
+        max_weight: Largest ballot weight; weights are uniform from 1
+        withdrawn_rate: Share of candidates withdrawn
+        line_ending: Line terminator, e.g. "\\r\\n"
+        seed: Seed for the random draws
+
+    Returns:
+        The path written
+    """
+    from fresh_blt.export import write_blt_stream
+
+    rng = np.random.default_rng(seed)
+    names = [stress_name(rng, i, name_length) for i in range(1, num_candidates + 1)]
+    withdrawn = np.flatnonzero(rng.random(num_candidates) < withdrawn_rate) + 1
+    batch_size = max(1, STRESS_BATCH_CELLS // max(1, num_candidates))
+    batches = (
+        stress_ballot_batch(
+            rng,
+            num_candidates,
+            min(batch_size, num_ballots - start),
+            max_depth,
+            tie_heavy_rate,
+            max_weight,
+        )
+        for start in range(0, num_ballots, batch_size)
+    )
+    return write_blt_stream(
+        Path(path),
+        f"Stress test: {num_candidates} candidates, {num_ballots} ballots",
+        names,
+        batches,
+        withdrawn_candidate_ids=withdrawn.tolist(),
+        line_ending=line_ending,
+    )
+
+
+def write_stress_profile(path: str | Path, profile: str, seed: int | None = None) -> Path:
+    """
+    Write the corpus for one of `STRESS_PROFILES` to `path`.
+
+    Raises:
+        ValueError: If the profile is unknown
+    """
+    if profile not in STRESS_PROFILES:
+        raise ValueError(f"Unknown stress profile: {profile}. Use {', '.join(STRESS_PROFILES)}.")
+    return write_stress_blt(path, **STRESS_PROFILES[profile], seed=seed)
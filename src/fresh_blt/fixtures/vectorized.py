@@ -0,0 +1,168 @@
+"""
+Vectorized ballot generation with NumPy.
+
+`BLTProvider.ballot` builds one ballot at a time through Faker, which is far slower
+than parsing the result. The generators here draw the rankings, truncation depths,
+tie groupings and weights for a whole batch of ballots at once and return them as
+`BallotArrays`, with the same statistical knobs as `BLTProvider.ballot`:
+
+- `full_ranking_rate` of ballots rank every candidate; the rest rank a uniform 1 to
+  all-but-one of them;
+- at each preference level with more than one candidate left, a tie of 2 or 3
+  candidates starts with probability `tie_rate`;
+- `weighted_rate` of ballots get a weight from 2 to `max_weight`, the rest weight 1.
+
+By default each ballot ranks a uniformly shuffled ordering of the candidates; pass a
+`PreferenceModel` from `fresh_blt.fixtures.preferences` as `model` to draw orderings
+with the duplicate rates and transfer patterns of real electorates instead.
+
+Candidates are numbered 1 to `num_candidates`. Batches hold at most
+`DEFAULT_BATCH_SIZE` ballots and `BATCH_CELLS` ballot-candidate cells unless a
+`batch_size` is given. The same seed and arguments, including `batch_size`, always
+give the same ballots.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterator
+
+import numpy as np
+
+from fresh_blt.columnar import BallotArrays
+
+from .preferences import OrderSampler, PreferenceModel, Uniform
+
+FULL_RANKING_RATE = 0.7
+TIE_RATE = 0.3
+WEIGHTED_RATE = 0.15
+MAX_WEIGHT = 10
+DEFAULT_BATCH_SIZE = 65_536
+
+# Keeps each batch's (ballots x candidates) working arrays, and the spatial models'
+# (ballots x candidates x dimensions) distances, to a few tens of MB.
+BATCH_CELLS = 1 << 20
+
+
+def default_batch_size(num_candidates: int) -> int:
+    """Ballots per batch for `num_candidates` candidates."""
+    return max(1, min(DEFAULT_BATCH_SIZE, BATCH_CELLS // max(1, num_candidates)))
+
+
+def random_ballot_batch(
+    rng: np.random.Generator,
+    num_candidates: int,
+    num_ballots: int,
+    full_ranking_rate: float = FULL_RANKING_RATE,
+    tie_rate: float = TIE_RATE,
+    weighted_rate: float = WEIGHTED_RATE,
+    max_weight: int = MAX_WEIGHT,
+    draw_orders: OrderSampler | None = None,
+) -> BallotArrays:
+    """
+    Draw `num_ballots` random ballots from `rng` in one batch, ranking orderings from
+    `draw_orders` (a `PreferenceModel.sampler`), uniformly shuffled by default.
+    """
+    weights = np.where(
+        rng.random(num_ballots) < weighted_rate,
+        rng.integers(2, max_weight + 1, size=num_ballots),
+        1,
+    ).astype(np.int64)
+    if num_candidates == 0:
+        return BallotArrays(
+            weights=weights,
+            level_offsets=np.zeros(num_ballots + 1, dtype=np.int64),
+            id_offsets=np.zeros(1, dtype=np.int64),
+            candidate_ids=np.zeros(0, dtype=np.int32),
+        )
+
+    if draw_orders is None:
+        draw_orders = Uniform().sampler(rng, num_candidates)
+    order = draw_orders(num_ballots)
+    depth = np.where(
+        rng.random(num_ballots) < full_ranking_rate,
+        num_candidates,
+        rng.integers(1, max(1, num_candidates - 1) + 1, size=num_ballots),
+    )
+
+    # Walk every ballot's preference levels in lockstep, marking where each level
+    # starts; at most `num_candidates` steps, each vectorized over the batch.
+    level_starts = np.zeros((num_ballots, num_candidates), dtype=bool)
+    position = np.zeros(num_ballots, dtype=np.int64)
+    while (open_ballots := np.flatnonzero(position < depth)).size:
+        current = position[open_ballots]
+        level_starts[open_ballots, current] = True
+        remaining = depth[open_ballots] - current
+        tied = (remaining > 1) & (rng.random(open_ballots.size) < tie_rate)
+        tie_size = np.minimum(rng.integers(2, 4, size=open_ballots.size), remaining)
+        position[open_ballots] = current + np.where(tied, tie_size, 1)
+
+    ranked = np.arange(num_candidates) < depth[:, None]
+    ranked_ids = order[ranked]
+    return BallotArrays(
+        weights=weights,
+        level_offsets=np.concatenate(([0], np.cumsum(level_starts.sum(axis=1)))).astype(np.int64),
+        id_offsets=np.append(np.flatnonzero(level_starts[ranked]), ranked_ids.size).astype(
+            np.int64
+        ),
+        candidate_ids=ranked_ids,
+    )
+
+
+def iter_ballot_arrays(
+    num_candidates: int,
+    num_ballots: int,
+    seed: int | np.random.Generator | None = None,
+    full_ranking_rate: float = FULL_RANKING_RATE,
+    tie_rate: float = TIE_RATE,
+    weighted_rate: float = WEIGHTED_RATE,
+    max_weight: int = MAX_WEIGHT,
+    batch_size: int | None = None,
+    model: PreferenceModel | None = None,
+) -> Iterator[BallotArrays]:
+    """
+    Generate `num_ballots` random ballots in batches of at most `batch_size` (default
+    `default_batch_size(num_candidates)`), so memory stays bounded however many ballots
+    and candidates are drawn. Orderings come from `model` (default `Uniform`), whose
+    per-election parameters are drawn once for all batches.
+    """
+    batch_size = batch_size or default_batch_size(num_candidates)
+    rng = np.random.default_rng(seed)
+    draw_orders = (model or Uniform()).sampler(rng, num_candidates)
+    for start in range(0, num_ballots, batch_size):
+        yield random_ballot_batch(
+            rng,
+            num_candidates,
+            min(batch_size, num_ballots - start),
+            full_ranking_rate,
+            tie_rate,
+            weighted_rate,
+            max_weight,
+            draw_orders,
+        )
+
+
+def generate_ballot_arrays(
+    num_candidates: int,
+    num_ballots: int,
+    seed: int | np.random.Generator | None = None,
+    full_ranking_rate: float = FULL_RANKING_RATE,
+    tie_rate: float = TIE_RATE,
+    weighted_rate: float = WEIGHTED_RATE,
+    max_weight: int = MAX_WEIGHT,
+    model: PreferenceModel | None = None,
+) -> BallotArrays:
+    """Generate `num_ballots` random ballots as a single `BallotArrays`."""
+    return BallotArrays.concatenate(
+        list(
+            iter_ballot_arrays(
+                num_candidates,
+                num_ballots,
+                seed,
+                full_ranking_rate,
+                tie_rate,
+                weighted_rate,
+                max_weight,
+                model=model,
+            )
+        )
+    )
@@ -1,33 +1,146 @@
-from lark import Lark
+"""
+Lark grammar for .blt files.
+
+The parser is built on first use rather than at import time, so commands that never
+parse (or that load from the binary cache) do not pay for compiling the grammar.
+The compiled LALR tables are pickled into the user cache directory, keyed on the
+grammar hash and the Lark version, so later processes (including every worker in a
+pool) load them instead of re-running the grammar analysis.
+"""
+
+from __future__ import annotations
+
+import functools
+import hashlib
+import logging
+import re
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from fresh_blt.cache import cache_dir
+
+if TYPE_CHECKING:
+    from lark import Lark, Transformer, Tree
+
+logger = logging.getLogger(__name__)
 
 blt_grammar = r"""
-start: header _NL withdrawn? ballots "0" _NL candidate_names title _NL?
+start: header _NL withdrawn? ballots "0" _NL names
 
 header: INT INT
 
+// Withdrawn candidates are negative IDs, as in the .blt format; the metadata scan
+// and line index find the withdrawn lines by their leading "-".
 withdrawn: (withdrawn_entry _NL)+
-withdrawn_entry: SIGNED_INT
+withdrawn_entry: NEGATIVE_INT
 
 ballots: ballot_line+
 ballot_line: INT ballot_prefs "0"? _NL
 ballot_prefs: ballot_pref+
 ballot_pref: INT ("=" INT)*
 
-candidate_names: (NAME _NL)+
-title: NAME
+// The last name is the title; it is split off into `candidate_names` and `title`
+// after parsing, since LALR(1) cannot tell them apart until the end of the file.
+names: (NAME _NL)+ NAME _NL?
 
 NAME: ESCAPED_STRING | WORD
 
 WORD: /[^\s"']+/
 
+NEGATIVE_INT: "-" INT
+
 _NL: NEWLINE
 
 %import common.INT
-%import common.SIGNED_INT
 %import common.ESCAPED_STRING
 %import common.WS_INLINE
 %import common.NEWLINE
 %ignore WS_INLINE
 """
 
-blt_parser = Lark(blt_grammar, start="start")
+
+_NAME_ESCAPE = re.compile(r'\\([\\"])')
+_TIE_SPACING = re.compile(rb"\s*=\s*")
+
+
+def unquote_name(token: str) -> str:
+    """
+    The name a NAME token stands for: a quoted name loses its quotes and has `\\"`
+    and `\\\\` unescaped, and any other backslash kept as is.
+    """
+    if len(token) >= 2 and token[0] == token[-1] == '"':
+        return _NAME_ESCAPE.sub(r"\1", token[1:-1])
+    return token
+
+
+def split_ballot_line(line: bytes) -> list[bytes]:
+    """
+    The whitespace-separated fields of a ballot line (the weight, then one field per
+    preference level), with spaced ties such as `1 = 2` joined into `1=2`, since the
+    grammar ignores whitespace around `=`.
+    """
+    if b"=" in line:
+        line = _TIE_SPACING.sub(b"=", line)
+    return line.split()
+
+
+def grammar_cache_path() -> Path:
+    """Location of the compiled parser for the current grammar and Lark version."""
+    import lark
+
+    grammar_hash = hashlib.sha256(blt_grammar.encode("utf-8")).hexdigest()[:16]
+    return cache_dir() / f"grammar-{grammar_hash}-lark-{lark.__version__}.pickle"
+
+
+def _title_splitter() -> Transformer[Any, Tree[Any]]:
+    from lark import Transformer, Tree
+
+    class SplitTitle(Transformer[Any, Tree[Any]]):
+        """Rebuild the `candidate_names` and `title` subtrees from `names`."""
+
+        def start(self, children: list[Any]) -> Tree[Any]:
+            *sections, names = children
+            return Tree(
+                "start",
+                [
+                    *sections,
+                    Tree("candidate_names", names.children[:-1]),
+                    Tree("title", names.children[-1:]),
+                ],
+            )
+
+    return SplitTitle()
+
+
+def build_blt_parser(cache: bool = True) -> Lark:
+    """
+    Build the .blt parser, loading the compiled tables from the grammar cache when
+    `cache` is set and writing them there on a miss.
+    """
+    from lark import Lark
+
+    cache_path: str | bool = False
+    if cache:
+        path = grammar_cache_path()
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            cache_path = str(path)
+        except OSError as e:
+            logger.warning(f"Not caching compiled grammar: {e}")
+
+    return Lark(
+        blt_grammar, start="start", parser="lalr", transformer=_title_splitter(), cache=cache_path
+    )
+
+
+@functools.cache
+def get_blt_parser() -> Lark:
+    """Return the .blt parser, building it on the first call."""
+    return build_blt_parser()
+
+
+def __getattr__(name: str) -> Any:
+    # `blt_parser` stays importable as a module attribute, built on first access.
+    if name == "blt_parser":
+        return get_blt_parser()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
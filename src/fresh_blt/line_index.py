@@ -0,0 +1,211 @@
+"""
+Paged ballot reading with an optional sidecar index of ballot byte offsets.
+
+`read_ballots` reads the candidate names from the tail of the file and then parses
+only the ballot lines it returns, stopping as soon as the page is full. Without an
+index, reaching ballot N still means skipping N lines; with a fresh sidecar index
+(`NAME.blt.idx`, written by `build_line_index`) the start of ballot N is a single
+8-byte read, so any page of a huge file loads in constant time.
+
+The index records the source file's size and modification time and is ignored once
+either changes. Indexes need an uncompressed .blt file, since they point at byte
+offsets in it.
+"""
+
+from __future__ import annotations
+
+import logging
+import mmap
+import re
+import struct
+from array import array
+from collections.abc import Sequence
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from fresh_blt.compression import detect_compression
+from fresh_blt.grammar import split_ballot_line
+from fresh_blt.metadata import LayoutMismatchError, map_blt, scan_layout
+from fresh_blt.models.candidate import Candidate
+from fresh_blt.timing import stage
+
+logger = logging.getLogger(__name__)
+
+INDEX_SUFFIX = ".idx"
+INDEX_MAGIC = b"BLTIDX01"
+
+# magic, source size, source mtime_ns, number of ballots; then one uint64 offset per ballot
+_HEADER = struct.Struct("<8sQqQ")
+_OFFSET = struct.Struct("<Q")
+
+# A ballot line starts with its weight; blank lines between ballots are skipped.
+_BALLOT_START_RE = re.compile(rb"\n[ \t]*\d")
+
+
+@dataclass(frozen=True)
+class BallotPage:
+    """
+    A run of ballots starting at ballot `offset` (0-based).
+
+    `total` is the number of ballots in the file when a fresh index or a full parse
+    supplied it, otherwise `None`; `has_more` says whether ballots follow this page.
+    """
+
+    candidates: list[Candidate]
+    ballots: Sequence[dict[str, Any]]
+    offset: int
+    total: int | None
+    has_more: bool
+
+
+def index_path_for(blt_path: Path) -> Path:
+    """Location of the sidecar index for `blt_path`."""
+    return blt_path.with_name(f"{blt_path.name}{INDEX_SUFFIX}")
+
+
+def build_line_index(blt_path: Path) -> Path:
+    """
+    Write the sidecar index of ballot line offsets for `blt_path`.
+
+    Raises:
+        ValueError: If the file is compressed or malformed
+    """
+    if detect_compression(blt_path) is not None:
+        raise ValueError("Line indexes need an uncompressed .blt file")
+
+    stat = blt_path.stat()
+    offsets = array("Q")
+    with map_blt(blt_path) as data:
+        layout = scan_layout(data)
+        offsets.extend(
+            match.start() + 1
+            for match in _BALLOT_START_RE.finditer(
+                data, layout.ballots_start - 1, layout.ballots_end
+            )
+        )
+
+    output_path = index_path_for(blt_path)
+    tmp_path = output_path.with_name(f".{output_path.name}.tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(_HEADER.pack(INDEX_MAGIC, stat.st_size, stat.st_mtime_ns, len(offsets)))
+        offsets.tofile(f)
+    tmp_path.replace(output_path)
+
+    logger.info(f"Indexed {len(offsets)} ballots of {blt_path} in {output_path}")
+    return output_path
+
+
+def _indexed_offset(blt_path: Path, ballot: int) -> tuple[int | None, int] | None:
+    """
+    Look up ballot `ballot` in a fresh sidecar index. Returns (byte offset, or `None`
+    past the last ballot; ballot count), or `None` without a usable index.
+    """
+    index_path = index_path_for(blt_path)
+    if not index_path.is_file():
+        return None
+
+    stat = blt_path.stat()
+    with open(index_path, "rb") as f:
+        header = f.read(_HEADER.size)
+        if len(header) != _HEADER.size:
+            logger.warning(f"Ignoring truncated line index {index_path}")
+            return None
+        magic, size, mtime_ns, count = _HEADER.unpack(header)
+        if magic != INDEX_MAGIC or (size, mtime_ns) != (stat.st_size, stat.st_mtime_ns):
+            logger.info(f"Ignoring stale line index {index_path}")
+            return None
+        if ballot >= count:
+            return None, count
+        f.seek(_HEADER.size + ballot * _OFFSET.size)
+        (offset,) = _OFFSET.unpack(f.read(_OFFSET.size))
+    return offset, count
+
+
+def parse_ballot_line(line: bytes, candidate_lookup: dict[int, Candidate]) -> dict[str, Any]:
+    """
+    Parse one ballot line such as `3 1 2=4 0` into the ballot dict `parse_ballots`
+    builds.
+
+    Raises:
+        ValueError: If the weight is not a positive integer or a candidate ID is unknown
+    """
+    weight_field, *preferences = split_ballot_line(line)
+    weight = int(weight_field)
+    if weight <= 0:
+        raise ValueError(f"Ballot weight must be positive, got {weight}")
+
+    rankings: list[list[Candidate]] = []
+    for preference in preferences:
+        if preference == b"0":
+            break
+        level = []
+        for candidate_id in map(int, preference.split(b"=")):
+            if candidate_id not in candidate_lookup:
+                raise ValueError(f"Invalid candidate ID {candidate_id} not found in candidate list")
+            level.append(candidate_lookup[candidate_id])
+        rankings.append(level)
+    return {"weight": weight, "rankings": rankings}
+
+
+def read_ballots(blt_path: Path, offset: int = 0, limit: int = 10) -> BallotPage:
+    """
+    Parse up to `limit` ballots starting at ballot `offset`, without touching the rest.
+
+    Uses the sidecar index for `offset` when a fresh one exists. Files whose names do
+    not match the header are parsed in full instead.
+
+    Raises:
+        ValueError: If the file is malformed or a returned ballot line is invalid
+    """
+    try:
+        return _read_page(blt_path, offset, limit)
+    except LayoutMismatchError as e:
+        logger.info(f"Falling back to a full parse of {blt_path}: {e}")
+
+    from fresh_blt.parse import load_blt
+
+    _, candidates, ballots = load_blt(blt_path)
+    page = ballots[offset : offset + limit]
+    return BallotPage(candidates, page, offset, len(ballots), offset + limit < len(ballots))
+
+
+def _read_page(blt_path: Path, offset: int, limit: int) -> BallotPage:
+    with stage("read_ballots"), map_blt(blt_path) as data:
+        layout = scan_layout(data)
+        candidates = layout.candidates()
+        candidate_lookup = {candidate.id: candidate for candidate in candidates}
+
+        total = None
+        position: int | None
+        if isinstance(data, mmap.mmap) and (indexed := _indexed_offset(blt_path, offset)):
+            position, total = indexed
+        else:
+            position = _skip_ballot_lines(data, layout.ballots_start, layout.ballots_end, offset)
+
+        ballots: list[dict[str, Any]] = []
+        has_more = False
+        while position is not None and position < layout.ballots_end:
+            line_end = data.find(b"\n", position, layout.ballots_end)
+            line = data[position:line_end].strip()
+            if line:
+                if len(ballots) == limit:
+                    has_more = True
+                    break
+                try:
+                    ballots.append(parse_ballot_line(line, candidate_lookup))
+                except ValueError as e:
+                    line_number = data[:line_end].count(b"\n") + 1
+                    raise ValueError(f"Line {line_number}: {e}") from e
+            position = line_end + 1
+
+    return BallotPage(candidates, ballots, offset, total, has_more)
+
+
+def _skip_ballot_lines(data: bytes | mmap.mmap, start: int, end: int, count: int) -> int | None:
+    """Offset of the ballot line after skipping `count` ballots from `start`, if any."""
+    for match in _BALLOT_START_RE.finditer(data, start - 1, end):
+        if count == 0:
+            return match.start() + 1
+        count -= 1
+    return None
@@ -0,0 +1,227 @@
+"""
+Metadata-only reader for .blt files.
+
+Reads everything `info` needs without building the parse tree or any per-ranking
+objects:
+
+- the header, from the start of the file;
+- the candidate names and title, by scanning backwards from the end to the `0` line
+  that closes the ballots, which must come after exactly as many names as the header
+  gives candidates, plus the title (a name may itself be `0`);
+- the withdrawn IDs, from the lines right after the header;
+- the ballot count and weight sum, from a regex pass that only looks at the first
+  number on each ballot line, in line-aligned chunks so memory stays bounded.
+
+Plain files are memory-mapped. Compressed files are decompressed into memory first,
+since they cannot be read backwards.
+"""
+
+from __future__ import annotations
+
+import logging
+import mmap
+import re
+from collections import Counter
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from fresh_blt.compression import detect_compression, open_stream
+from fresh_blt.grammar import unquote_name
+from fresh_blt.models.candidate import Candidate
+from fresh_blt.timing import stage
+
+logger = logging.getLogger(__name__)
+
+SCAN_CHUNK_SIZE = 8 * 1024 * 1024
+
+# The weight is the first number on a ballot line. Anchoring on the preceding newline
+# is much faster than a MULTILINE `^`.
+_WEIGHT_RE = re.compile(rb"\n[ \t]*(\d+)[ \t]")
+
+
+class LayoutMismatchError(ValueError):
+    """
+    The names section cannot be located from the header alone, because the number of
+    names does not match the header. The full parse still reads such files.
+    """
+
+
+@dataclass(frozen=True)
+class BltLayout:
+    """
+    Everything in a .blt file except the ballots, plus where the ballots are.
+
+    Ballot lines occupy bytes `ballots_start:ballots_end` of the file; `ballots_end`
+    is the start of the `0` line that closes them.
+    """
+
+    num_candidates: int
+    num_positions: int
+    withdrawn_candidate_ids: list[int]
+    candidate_names: list[str]
+    title: str
+    ballots_start: int
+    ballots_end: int
+
+    def candidates(self) -> list[Candidate]:
+        """Candidates numbered from 1 in file order, as `load_blt` builds them."""
+        return [
+            Candidate.from_dict(
+                {"id": i, "name": name, "withdrawn": i in self.withdrawn_candidate_ids}
+            )
+            for i, name in enumerate(self.candidate_names, 1)
+        ]
+
+
+@contextmanager
+def map_blt(blt_path: Path) -> Iterator[bytes | mmap.mmap]:
+    """
+    Expose the bytes of a .blt file: memory-mapped for plain files, decompressed into
+    memory for compressed ones, since those cannot be read backwards.
+    """
+    compression = detect_compression(blt_path)
+    if compression is not None:
+        with open_stream(blt_path, "rb", compression) as f:
+            yield f.read()
+        return
+
+    with open(blt_path, "rb") as f:
+        if blt_path.stat().st_size == 0:
+            raise ValueError("Empty .blt file")
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            yield data
+
+
+def scan_layout(data: bytes | mmap.mmap) -> BltLayout:
+    """
+    Read the header, withdrawn IDs, names and title of a mapped .blt file.
+
+    Raises:
+        LayoutMismatchError: If the names section or closing `0` line cannot be
+            located from the header
+        ValueError: If the header is malformed
+    """
+    header_end = data.find(b"\n")
+    if header_end == -1:
+        raise ValueError("Missing newline after header")
+    header = data[:header_end].split()
+    if len(header) != 2 or not all(field.isdigit() for field in header):
+        raise ValueError(f"Invalid header: {data[:header_end].decode('utf-8', 'replace')!r}")
+    num_candidates, num_positions = (int(field) for field in header)
+
+    names, body_end = _scan_names_backwards(data, header_end + 1, num_candidates + 1)
+    *candidate_names, title = names
+
+    withdrawn_candidate_ids: list[int] = []
+    line_start = header_end + 1
+    while line_start < body_end and data[line_start : line_start + 1] in (b"-", b" ", b"\t"):
+        line_end = data.find(b"\n", line_start, body_end)
+        line = data[line_start:line_end]
+        if not line.lstrip().startswith(b"-"):
+            break
+        withdrawn_candidate_ids.extend(int(entry.lstrip(b"-")) for entry in line.split())
+        line_start = line_end + 1
+
+    return BltLayout(
+        num_candidates=num_candidates,
+        num_positions=num_positions,
+        withdrawn_candidate_ids=withdrawn_candidate_ids,
+        candidate_names=candidate_names,
+        title=title,
+        ballots_start=line_start,
+        ballots_end=body_end,
+    )
+
+
+def load_blt_metadata(blt_path: Path) -> tuple[dict[str, Any], list[Candidate]]:
+    """
+    Read election info and candidates from a .blt file without parsing its ballots.
+
+    Args:
+        blt_path: Path to the BLT file, optionally gzip, bz2, xz or zstd compressed
+
+    Returns:
+        Tuple of (election_info, candidate_list), with the same values `load_blt`
+        returns for a well-formed file. Files whose names do not match the header
+        fall back to the full parse.
+
+    Raises:
+        ValueError: If the header is malformed
+        UnexpectedInput: If the file falls back to the full parse and fails it
+    """
+    try:
+        return _scan_metadata(blt_path)
+    except LayoutMismatchError as e:
+        logger.info(f"Falling back to a full parse of {blt_path}: {e}")
+
+    from fresh_blt.parse import load_blt
+
+    election_info, candidate_list, _ = load_blt(blt_path)
+    return election_info, candidate_list
+
+
+def _scan_metadata(blt_path: Path) -> tuple[dict[str, Any], list[Candidate]]:
+    with stage("scan_metadata"), map_blt(blt_path) as data:
+        layout = scan_layout(data)
+
+        # Tally weights by value; far fewer int() calls than ballots.
+        weight_counts: Counter[bytes] = Counter()
+        start = layout.ballots_start - 1
+        while start < layout.ballots_end:
+            end = data.find(
+                b"\n", min(start + SCAN_CHUNK_SIZE, layout.ballots_end), layout.ballots_end
+            )
+            end = layout.ballots_end if end == -1 else end
+            weight_counts.update(_WEIGHT_RE.findall(data, start, end))
+            start = end
+
+    total_ballots = sum(weight_counts.values())
+    total_votes = sum(int(weight) * count for weight, count in weight_counts.items())
+    candidate_list = layout.candidates()
+    election_info = {
+        "title": layout.title,
+        "num_candidates": layout.num_candidates,
+        "num_positions": layout.num_positions,
+        "withdrawn_candidate_ids": layout.withdrawn_candidate_ids,
+        "total_ballots": total_ballots,
+        "total_votes": total_votes,
+    }
+    logger.info(f"Scanned metadata: {total_ballots} ballots, {len(candidate_list)} candidates")
+    return election_info, candidate_list
+
+
+def _scan_names_backwards(
+    data: bytes | mmap.mmap, body_start: int, num_names: int
+) -> tuple[list[str], int]:
+    """
+    Collect the `num_names` names after the closing `0` line, reading lines from the
+    end. A `0` line with fewer names after it is itself a name.
+
+    Returns the names in file order and the offset where the `0` line starts.
+
+    Raises:
+        LayoutMismatchError: If no `0` line comes exactly `num_names` names from the end
+    """
+    names: list[str] = []
+    end = len(data)
+    while end > body_start:
+        start = data.rfind(b"\n", body_start, end) + 1 or body_start
+        line = data[start:end].strip()
+        end = start - 1
+        if not line:
+            continue
+        if line == b"0" and len(names) == num_names:
+            names.reverse()
+            return names, start
+        if len(names) == num_names:
+            raise LayoutMismatchError(
+                f"No 0 line before the last {num_names} names (the header's candidates "
+                "and the title)"
+            )
+        names.append(unquote_name(line.decode("utf-8")))
+    raise LayoutMismatchError(
+        f"Fewer than {num_names} lines (the header's candidates and the title) after the header"
+    )
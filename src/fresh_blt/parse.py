@@ -1,13 +1,19 @@
 from __future__ import annotations
 
 import logging
+from collections.abc import Sequence
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
-from lark import Tree
-
-from fresh_blt.grammar import blt_parser
+from fresh_blt.cache import load_cache
+from fresh_blt.compression import read_blt_text
+from fresh_blt.grammar import get_blt_parser, unquote_name
 from fresh_blt.models.candidate import Candidate
+from fresh_blt.progress import log_progress
+from fresh_blt.timing import stage
+
+if TYPE_CHECKING:
+    from lark import Tree
 
 logger = logging.getLogger(__name__)
 
@@ -17,13 +23,60 @@ def parse_blt_file(blt_path: Path) -> Tree[Any]:
     Parse .blt file into a syntax tree.
 
     Args:
-        blt_path: Path to the BLT file
+        blt_path: Path to the BLT file, optionally gzip, bz2, xz or zstd compressed
 
     Returns:
         Parse tree representing the .blt file structure
     """
     logger.info(f"Parsing BLT file: {blt_path}")
-    return blt_parser.parse(blt_path.read_text(encoding="utf-8"))
+    return get_blt_parser().parse(read_blt_text(blt_path))
+
+
+def load_blt(
+    blt_path: Path, use_cache: bool = True
+) -> tuple[dict[str, Any], list[Candidate], Sequence[dict[str, Any]]]:
+    """
+    Load a .blt file into election info, candidates and parsed ballots.
+
+    Args:
+        blt_path: Path to the BLT file
+        use_cache: Whether to read a fresh binary cache instead of parsing, if one exists
+
+    Returns:
+        Tuple of (election_info, candidate_list, ballot_list)
+    """
+    if use_cache:
+        with stage("load_cache"):
+            cached = load_cache(blt_path)
+        if cached is not None:
+            return cached
+
+    with stage("parse_blt_file"):
+        blt_tree = parse_blt_file(blt_path)
+
+    # Extract basic information
+    num_candidates, num_positions, withdrawn_candidate_ids = extract_header_info(blt_tree)
+    title = extract_title(blt_tree)
+
+    # Extract candidates
+    with stage("extract_candidates"):
+        candidate_list = extract_candidates(blt_tree, withdrawn_candidate_ids)
+    candidate_lookup = {candidate.id: candidate for candidate in candidate_list}
+
+    # Parse ballots
+    with stage("parse_ballots"):
+        ballot_list = parse_ballots(blt_tree, candidate_lookup)
+
+    election_info = {
+        "title": title,
+        "num_candidates": num_candidates,
+        "num_positions": num_positions,
+        "withdrawn_candidate_ids": withdrawn_candidate_ids,
+        "total_ballots": len(ballot_list),
+        "total_votes": sum(ballot["weight"] for ballot in ballot_list),
+    }
+
+    return election_info, candidate_list, ballot_list
 
 
 def extract_header_info(blt_tree: Tree[Any]) -> tuple[int, int, list[int]]:
@@ -64,7 +117,7 @@ def extract_title(blt_tree: Tree[Any]) -> str:
     Returns:
         Election title as string
     """
-    title = next(blt_tree.find_data("title")).children[0].value.strip('"')  # pyright: ignore
+    title = unquote_name(next(blt_tree.find_data("title")).children[0].value)  # pyright: ignore
     logger.info(f"Extracted election title: {title}")
     return title
 
@@ -82,20 +135,19 @@ def extract_candidates(blt_tree: Tree[Any], withdrawn_candidate_ids: list[int])
     """
     logger.info("Extracting candidates from parse tree")
     candidates: list[tuple[str, int]] = [
-        (candidate.value.strip('"'), candidate.end_line)  # pyright: ignore
+        (unquote_name(candidate.value), candidate.end_line)  # pyright: ignore
         for candidate in list(blt_tree.find_data("candidate_names"))[0].children  # pyright: ignore
     ]
     ided_candidates: list[tuple[str, int]] = [
         (x[0], i + 1) for i, x in enumerate(sorted(candidates, key=lambda x: x[1]))
     ]
 
-    candidate_list = []
-    for candidate_name, id in ided_candidates:
-        is_withdrawn = id in withdrawn_candidate_ids
-        candidate_list.append(
-            Candidate.from_dict({"id": id, "name": candidate_name, "withdrawn": is_withdrawn})
+    candidate_list = [
+        Candidate.from_dict(
+            {"id": id, "name": candidate_name, "withdrawn": id in withdrawn_candidate_ids}
         )
-        logger.debug(f"Created candidate: {candidate_name} (ID: {id}, Withdrawn: {is_withdrawn})")
+        for candidate_name, id in ided_candidates
+    ]
 
     logger.info(
         f"Created {len(candidate_list)} candidates, {len(withdrawn_candidate_ids)} withdrawn"
@@ -123,11 +175,10 @@ def parse_ballots(
     ballot_list: list[dict[str, Any]] = []
 
     logger.info(f"Parsing {len(ballots_trees)} ballots")
-    for ballot_index, ballot_tree in enumerate(ballots_trees):
+    ballot_trees = log_progress(ballots_trees, logger, "Parsing ballots", len(ballots_trees))
+    for ballot_index, ballot_tree in enumerate(ballot_trees):
         try:
-            parsed_ballot = parse_ballot(ballot_tree, candidate_lookup)
-            ballot_list.append(parsed_ballot)
-            logger.debug(f"Successfully parsed ballot {ballot_index + 1}")
+            ballot_list.append(parse_ballot(ballot_tree, candidate_lookup))
         except ValueError as e:
             logger.error(f"Error parsing ballot {ballot_index + 1}: {e}")
             raise ValueError(f"Error parsing ballot {ballot_index + 1}: {e}") from e
@@ -197,13 +248,11 @@ def parse_ballot_candidates(
                 raise ValueError(f"Invalid candidate ID {candidate_id} not found in candidate list")
             candidates_at_level.append(candidate_lookup[candidate_id])
     else:
-        # Single candidate at this preference level
-        if not candidates_node.children:
-            return candidates_at_level  # Empty preference level
-
-        candidate_id = int(candidates_node.children[0].value)  # pyright: ignore[reportAttributeAccessIssue]
-        if candidate_id not in candidate_lookup:
-            raise ValueError(f"Invalid candidate ID {candidate_id} not found in candidate list")
-        candidates_at_level.append(candidate_lookup[candidate_id])
+        # One ballot_pref node: a single candidate, or several joined by "=" for a tie
+        for candidate_node in candidates_node.children:
+            candidate_id = int(candidate_node.value)  # pyright: ignore[reportAttributeAccessIssue]
+            if candidate_id not in candidate_lookup:
+                raise ValueError(f"Invalid candidate ID {candidate_id} not found in candidate list")
+            candidates_at_level.append(candidate_lookup[candidate_id])
 
     return candidates_at_level
@@ -0,0 +1,70 @@
+"""
+Periodic progress logging for long loops.
+
+Logging one message per item costs a string format per ballot even when nobody reads
+it. `log_progress` instead emits an INFO summary at most every
+`PROGRESS_INTERVAL_SECONDS`, checking the clock only once per `PROGRESS_CHECK_EVERY`
+items, and hands the iterable back untouched when INFO is disabled for the logger.
+Each summary carries `progress_label`, `progress_done` and `progress_total` as record
+attributes for structured handlers.
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from collections.abc import Iterable, Iterator
+from typing import TypeVar
+
+T = TypeVar("T")
+
+PROGRESS_INTERVAL_SECONDS = 5.0
+PROGRESS_CHECK_EVERY = 4096
+
+
+def log_progress(
+    items: Iterable[T],
+    logger: logging.Logger,
+    label: str,
+    total: int | None = None,
+    interval: float = PROGRESS_INTERVAL_SECONDS,
+) -> Iterable[T]:
+    """
+    Yield `items`, logging "`label`: N/total done" at INFO level every `interval`
+    seconds.
+
+    Args:
+        items: Items to iterate over
+        logger: Logger to report through
+        label: What is being processed, e.g. "Parsing ballots"
+        total: Number of items, if known
+        interval: Minimum seconds between summaries
+    """
+    if not logger.isEnabledFor(logging.INFO):
+        return items
+    return _iter_progress(items, logger, label, total, interval)
+
+
+def _iter_progress(
+    items: Iterable[T], logger: logging.Logger, label: str, total: int | None, interval: float
+) -> Iterator[T]:
+    start = time.perf_counter()
+    next_report = start + interval
+    done = 0
+    for item in items:
+        yield item
+        done += 1
+        if done % PROGRESS_CHECK_EVERY == 0 and (now := time.perf_counter()) >= next_report:
+            next_report = now + interval
+            rate = done / (now - start)
+            if total:
+                message = "%s: %d/%d done (%.1f%%, %.0f/s)"
+                args: tuple[object, ...] = (label, done, total, 100 * done / total, rate)
+            else:
+                message = "%s: %d done (%.0f/s)"
+                args = (label, done, rate)
+            logger.info(
+                message,
+                *args,
+                extra={"progress_label": label, "progress_done": done, "progress_total": total},
+            )
@@ -0,0 +1,305 @@
+"""
+Bitmap-indexed ballot queries.
+
+`BallotIndex` indexes columnar ballots once, as the per-candidate postings of a
+`CandidateIndex`. Each query expands the postings of the candidates it names into a
+rank-position array over all ballots, giving the preference level of that candidate on
+every ballot, or a packed bitmap of the ballots that rank them. Queries then evaluate
+as comparisons and bitwise operations over whole bitmaps, plus one weighted sum,
+instead of a Python loop over ballot dicts.
+
+Query syntax:
+
+- `A`: ballots ranking A anywhere;
+- `A > B`: ballots ranking A above B, where any ranked candidate is above an unranked
+  one; chains such as `A > B > C` require each step;
+- `A = B`: ballots ranking A and B at the same level;
+- `A in top 3`: ballots ranking A within their first three preference levels;
+- `not`, `and`, `or` and parentheses combine queries.
+
+Candidates are written as `#3` for an ID, or as a name, quoted if it contains a
+keyword or one of `"()<>=#`. Names match case-insensitively, in full or by a unique
+prefix, so `Adam` finds "Adam Cocks". Withdrawn candidates are queried like any other,
+as cast.
+"""
+
+from __future__ import annotations
+
+import functools
+from collections.abc import Sequence
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+import numpy as np
+from numpy.typing import NDArray
+
+from fresh_blt.candidate_index import CandidateIndex
+from fresh_blt.columnar import BallotArrays, exact_sum
+from fresh_blt.models.candidate import Candidate
+from fresh_blt.timing import stage
+
+if TYPE_CHECKING:
+    from lark import Lark, Transformer
+
+query_grammar = r"""
+?start: disjunction
+
+?disjunction: conjunction (_OR conjunction)*
+?conjunction: negation (_AND negation)*
+?negation: _NOT negation -> negate
+         | atom
+
+?atom: "(" disjunction ")"
+     | candidate -> ranked
+     | candidate (">" candidate)+ -> above
+     | candidate ("=" candidate)+ -> tied
+     | candidate _IN _TOP INT -> in_top
+
+candidate: CANDIDATE_ID | ESCAPED_STRING | NAME+
+
+CANDIDATE_ID: "#" INT
+_OR.2: /or\b/i
+_AND.2: /and\b/i
+_NOT.2: /not\b/i
+_IN.2: /in\b/i
+_TOP.2: /top\b/i
+NAME: /[^\s"()<>=#]+/
+
+%import common.INT
+%import common.ESCAPED_STRING
+%import common.WS
+%ignore WS
+"""
+
+Bitmap = NDArray[np.uint8]
+
+
+class QueryError(ValueError):
+    """A query that does not parse or names an unknown or ambiguous candidate."""
+
+
+@functools.cache
+def get_query_parser() -> Lark:
+    """Return the query parser, building it on the first call."""
+    from lark import Lark
+
+    return Lark(query_grammar, start="start", parser="lalr")
+
+
+@dataclass(frozen=True)
+class QueryResult:
+    """Ballots matching a query, as a packed bitmap, with their count and total weight."""
+
+    query: str
+    ballots: int
+    weight: int
+    total_ballots: int
+    total_weight: int
+    matches: Bitmap
+
+    @property
+    def ballot_share(self) -> float:
+        return self.ballots / self.total_ballots if self.total_ballots else 0.0
+
+    @property
+    def weight_share(self) -> float:
+        return self.weight / self.total_weight if self.total_weight else 0.0
+
+    def ballot_indices(self) -> NDArray[np.int64]:
+        """Zero-based positions of the matching ballots, in file order."""
+        return np.flatnonzero(np.unpackbits(self.matches, count=self.total_ballots))
+
+    def to_dict(self) -> dict[str, Any]:
+        """JSON-ready summary, without the bitmap."""
+        return {
+            "query": self.query,
+            "ballots": self.ballots,
+            "weight": self.weight,
+            "total_ballots": self.total_ballots,
+            "total_weight": self.total_weight,
+            "ballot_share": self.ballot_share,
+            "weight_share": self.weight_share,
+        }
+
+
+@dataclass(frozen=True)
+class BallotIndex:
+    """
+    Rank positions and ballot bitmaps for a set of ballots, derived per candidate from
+    the sparse postings of a `CandidateIndex`, so the index takes memory proportional
+    to the ranking entries rather than to candidates times ballots.
+
+    `ranks(c)[i]` is the zero-based preference level at which ballot `i` ranks
+    candidate `c`, or `unranked` (the largest value of `rank_dtype`) if it does not;
+    `rank_dtype` is the smallest unsigned type that fits. `ranked_anywhere(c)` packs
+    `ranks(c) != unranked` eight ballots to a byte. Both are built when a query needs
+    them, in time proportional to the number of ballots.
+    """
+
+    candidates: list[Candidate]
+    weights: NDArray[Any]
+    postings: CandidateIndex
+    rank_dtype: type[np.unsignedinteger[Any]]
+
+    @classmethod
+    def from_arrays(cls, arrays: BallotArrays, candidates: list[Candidate]) -> BallotIndex:
+        """Index columnar ballots whose candidate IDs run from 1 to `len(candidates)`."""
+        with stage("build_ballot_index"):
+            return cls._from_arrays(arrays, candidates)
+
+    @classmethod
+    def from_ballots(
+        cls, ballots: Sequence[dict[str, Any]], candidates: list[Candidate]
+    ) -> BallotIndex:
+        """Index the ballot dicts returned by `load_blt`."""
+        return cls.from_arrays(BallotArrays.from_ballots(ballots), candidates)
+
+    @classmethod
+    def _from_arrays(cls, arrays: BallotArrays, candidates: list[Candidate]) -> BallotIndex:
+        max_levels = int(np.diff(arrays.level_offsets).max(initial=0))
+        return cls(
+            candidates=candidates,
+            weights=arrays.weights,
+            postings=CandidateIndex.from_arrays(arrays, candidates),
+            rank_dtype=next(
+                t for t in (np.uint8, np.uint16, np.uint32) if max_levels < np.iinfo(t).max
+            ),
+        )
+
+    def __len__(self) -> int:
+        return len(self.weights)
+
+    @property
+    def unranked(self) -> int:
+        return int(np.iinfo(self.rank_dtype).max)
+
+    def ranks(self, candidate_id: int) -> NDArray[np.unsignedinteger[Any]]:
+        """The level at which each ballot ranks the candidate, or `unranked`."""
+        ballots, levels = self.postings.postings(candidate_id)
+        ranks = np.full(len(self), self.unranked, dtype=self.rank_dtype)
+        ranks[ballots] = levels
+        return ranks
+
+    def candidate_id(self, name: str) -> int:
+        """
+        Resolve a full or unique-prefix candidate name, ignoring case, to its ID.
+
+        Raises:
+            QueryError: If no candidate, or more than one, matches
+        """
+        folded = name.casefold()
+        exact = [c for c in self.candidates if c.name.casefold() == folded]
+        matches = exact or [c for c in self.candidates if c.name.casefold().startswith(folded)]
+        if not matches:
+            raise QueryError(f"No candidate matches {name!r}")
+        if len(matches) > 1:
+            names = ", ".join(repr(c.name) for c in matches[:5])
+            raise QueryError(f"{name!r} matches several candidates: {names}")
+        return matches[0].id
+
+    def ranked_anywhere(self, candidate_id: int) -> Bitmap:
+        ballots, _ = self.postings.postings(candidate_id)
+        ranked = np.zeros(len(self), dtype=bool)
+        ranked[ballots] = True
+        return np.packbits(ranked)
+
+    def ranked_above(self, first_id: int, second_id: int) -> Bitmap:
+        """Ballots ranking the first candidate above the second, or the second not at all."""
+        return np.packbits(self.ranks(first_id) < self.ranks(second_id))
+
+    def tied(self, first_id: int, second_id: int) -> Bitmap:
+        first = self.ranks(first_id)
+        return np.packbits((first == self.ranks(second_id)) & (first != self.unranked))
+
+    def in_top(self, candidate_id: int, levels: int) -> Bitmap:
+        return np.packbits(self.ranks(candidate_id) < min(levels, self.unranked))
+
+    def negate(self, bitmap: Bitmap) -> Bitmap:
+        # Bits past the last ballot stay clear, so popcounts need no masking.
+        return np.packbits(~np.unpackbits(bitmap, count=len(self)).view(bool))
+
+    def count(self, bitmap: Bitmap) -> int:
+        return int(np.bitwise_count(bitmap).sum(dtype=np.int64))
+
+    def weight(self, bitmap: Bitmap) -> int:
+        return exact_sum(self.weights[np.unpackbits(bitmap, count=len(self)).view(bool)])
+
+    def evaluate(self, query: str) -> Bitmap:
+        """
+        Bitmap of the ballots matching `query`.
+
+        Raises:
+            QueryError: If the query does not parse or names an unknown candidate
+        """
+        from lark.exceptions import LarkError, VisitError
+
+        try:
+            tree = get_query_parser().parse(query)
+            return _query_evaluator(self).transform(tree)
+        except VisitError as e:
+            if isinstance(e.orig_exc, QueryError):
+                raise e.orig_exc from None
+            raise
+        except LarkError as e:
+            raise QueryError(f"Invalid query {query!r}: {e}") from None
+
+    def query(self, query: str) -> QueryResult:
+        """
+        Count and weigh the ballots matching `query`.
+
+        Raises:
+            QueryError: If the query does not parse or names an unknown candidate
+        """
+        with stage("query"):
+            matches = self.evaluate(query)
+            return QueryResult(
+                query=query,
+                ballots=self.count(matches),
+                weight=self.weight(matches),
+                total_ballots=len(self),
+                total_weight=exact_sum(self.weights),
+                matches=matches,
+            )
+
+
+def _query_evaluator(index: BallotIndex) -> Transformer[Any, Bitmap]:
+    from lark import Transformer
+
+    class QueryEvaluator(Transformer[Any, Bitmap]):
+        """Evaluate a parsed query bottom-up into bitmaps."""
+
+        def candidate(self, children: list[Any]) -> int:
+            token = children[0]
+            if token.type == "CANDIDATE_ID":
+                candidate_id = int(token[1:])
+                if not 1 <= candidate_id <= len(index.candidates):
+                    raise QueryError(f"No candidate with ID {candidate_id}")
+                return candidate_id
+            if token.type == "ESCAPED_STRING":
+                return index.candidate_id(token[1:-1])
+            # Unquoted names may span several words.
+            return index.candidate_id(" ".join(children))
+
+        def ranked(self, children: list[Any]) -> Bitmap:
+            return index.ranked_anywhere(children[0])
+
+        def above(self, children: list[Any]) -> Bitmap:
+            return functools.reduce(np.bitwise_and, map(index.ranked_above, children, children[1:]))
+
+        def tied(self, children: list[Any]) -> Bitmap:
+            return functools.reduce(np.bitwise_and, map(index.tied, children, children[1:]))
+
+        def in_top(self, children: list[Any]) -> Bitmap:
+            candidate_id, levels = children
+            return index.in_top(candidate_id, int(levels))
+
+        def negate(self, children: list[Any]) -> Bitmap:
+            return index.negate(children[0])
+
+        def conjunction(self, children: list[Any]) -> Bitmap:
+            return functools.reduce(np.bitwise_and, children)
+
+        def disjunction(self, children: list[Any]) -> Bitmap:
+            return functools.reduce(np.bitwise_or, children)
+
+    return QueryEvaluator()
@@ -0,0 +1,136 @@
+"""
+JSON serializer backends for exports.
+
+`orjson` and `msgspec` encode large exports several times faster than the standard
+library and are used automatically when installed (`pip install fresh_blt[fast]`).
+Every backend encodes to UTF-8, with non-ASCII text kept as is, and can either return
+bytes or write to a binary file; the stdlib backend streams to the file instead of
+building the whole document in memory first.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import IO, Any
+
+logger = logging.getLogger(__name__)
+
+JSON_BACKENDS = ("orjson", "msgspec", "stdlib")
+_WRITE_CHUNK = 1 << 16
+
+
+@dataclass(frozen=True)
+class JsonBackend:
+    """
+    A named JSON encoder. `dumps(obj, indent)` returns the encoded bytes and
+    `dump(obj, fp, indent)` writes them to the binary file `fp`; both indent by two
+    spaces when `indent` is set.
+    """
+
+    name: str
+    dumps: Callable[[Any, bool], bytes]
+    dump: Callable[[Any, IO[bytes], bool], None]
+
+
+def _stdlib_options(indent: bool) -> dict[str, Any]:
+    if indent:
+        return {"indent": 2, "ensure_ascii": False}
+    return {"separators": (",", ":"), "ensure_ascii": False}
+
+
+def _stdlib_dumps(obj: Any, indent: bool) -> bytes:
+    return json.dumps(obj, **_stdlib_options(indent)).encode("utf-8")
+
+
+def _stdlib_dump(obj: Any, fp: IO[bytes], indent: bool) -> None:
+    # iterencode yields the document in small pieces as it goes; join them into
+    # writes of about _WRITE_CHUNK characters so only one chunk is held at a time.
+    pieces: list[str] = []
+    size = 0
+    for piece in json.JSONEncoder(**_stdlib_options(indent)).iterencode(obj):
+        pieces.append(piece)
+        size += len(piece)
+        if size >= _WRITE_CHUNK:
+            fp.write("".join(pieces).encode("utf-8"))
+            pieces.clear()
+            size = 0
+    fp.write("".join(pieces).encode("utf-8"))
+
+
+def _fallback_backend(name: str, encode: Callable[[Any, bool], bytes | None]) -> JsonBackend:
+    """A backend using `encode`, or the stdlib encoder wherever `encode` returns `None`."""
+
+    def dumps(obj: Any, indent: bool) -> bytes:
+        encoded = encode(obj, indent)
+        return _stdlib_dumps(obj, indent) if encoded is None else encoded
+
+    def dump(obj: Any, fp: IO[bytes], indent: bool) -> None:
+        encoded = encode(obj, indent)
+        if encoded is None:
+            _stdlib_dump(obj, fp, indent)
+        else:
+            fp.write(encoded)
+
+    return JsonBackend(name, dumps, dump)
+
+
+def _orjson_backend() -> JsonBackend:
+    import orjson
+
+    def encode(obj: Any, indent: bool) -> bytes | None:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+        except orjson.JSONEncodeError:
+            # orjson rejects integers outside 64 bits; the stdlib encodes them fine.
+            logger.debug("orjson could not encode export, falling back to stdlib json")
+            return None
+
+    return _fallback_backend("orjson", encode)
+
+
+def _msgspec_backend() -> JsonBackend:
+    import msgspec
+
+    encoder = msgspec.json.Encoder()
+
+    def encode(obj: Any, indent: bool) -> bytes | None:
+        try:
+            encoded = encoder.encode(obj)
+        except (OverflowError, msgspec.EncodeError):
+            # Older msgspec releases reject integers outside 64 bits, as orjson does.
+            logger.debug("msgspec could not encode export, falling back to stdlib json")
+            return None
+        return msgspec.json.format(encoded, indent=2) if indent else encoded
+
+    return _fallback_backend("msgspec", encode)
+
+
+_BACKEND_FACTORIES: dict[str, Callable[[], JsonBackend]] = {
+    "orjson": _orjson_backend,
+    "msgspec": _msgspec_backend,
+    "stdlib": lambda: JsonBackend("stdlib", _stdlib_dumps, _stdlib_dump),
+}
+
+
+def get_json_backend(name: str = "auto") -> JsonBackend:
+    """
+    Return the JSON backend called `name`, or the fastest installed one for `auto`.
+
+    Raises `ValueError` for unknown names and `ImportError` if a named backend's
+    package is not installed.
+    """
+    name = name.lower()
+    if name == "auto":
+        for candidate in JSON_BACKENDS:
+            try:
+                return _BACKEND_FACTORIES[candidate]()
+            except ImportError:
+                continue
+    if name not in _BACKEND_FACTORIES:
+        raise ValueError(
+            f"Unsupported JSON backend: {name}. Use 'auto', {', '.join(map(repr, JSON_BACKENDS))}."
+        )
+    return _BACKEND_FACTORIES[name]()
@@ -0,0 +1,332 @@
+"""
+Local HTTP/JSON server that keeps parsed elections in memory.
+
+`ElectionServer` answers `GET` requests on a TCP port or a Unix socket:
+
+- `/health`: server and cache status
+- `/info?path=FILE`: election info and candidates
+- `/stats?path=FILE`: the `stats` command's figures
+- `/ballots?path=FILE&offset=0&limit=10`: a page of ballots, rankings as candidate IDs
+
+Parsing runs in a process pool so the event loop never blocks. Parsed elections are
+kept in an LRU cache with a memory budget, keyed by resolved path and validated by
+size and mtime; when only the mtime changed, the content hash decides whether the
+cached parse still holds, so touched-but-unchanged files are not re-parsed.
+
+The server reads any file the serving user can read; bind it to localhost or a Unix
+socket only.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import multiprocessing
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, replace
+from http import HTTPStatus
+from pathlib import Path
+from typing import Any
+from urllib.parse import parse_qs, urlsplit
+
+from fresh_blt.cache import fingerprint
+from fresh_blt.columnar import BallotArrays
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+DEFAULT_MEMORY_BUDGET = 512 * 1024 * 1024
+MAX_PAGE_SIZE = 1000
+MAX_REQUEST_HEAD = 16 * 1024
+
+
+@dataclass(frozen=True)
+class ParsedElection:
+    """A parsed election as the server keeps it: JSON-ready metadata plus ballot arrays."""
+
+    path: str
+    size: int
+    mtime_ns: int
+    sha256: str
+    election_info: dict[str, Any]
+    candidates: list[dict[str, Any]]
+    stats: dict[str, Any]
+    arrays: BallotArrays
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate memory held by the entry."""
+        arrays = sum(
+            array.nbytes
+            for array in (
+                self.arrays.weights,
+                self.arrays.level_offsets,
+                self.arrays.id_offsets,
+                self.arrays.candidate_ids,
+            )
+        )
+        # Python objects take several times their JSON size; this is only a budget.
+        metadata = len(json.dumps([self.election_info, self.candidates, self.stats]))
+        return arrays + 4 * metadata
+
+    def ballot_page(self, offset: int, limit: int) -> list[dict[str, Any]]:
+        """Ballots `offset` to `offset + limit`, with rankings as lists of candidate IDs."""
+        arrays = self.arrays
+        level_offsets = arrays.level_offsets
+        id_offsets = arrays.id_offsets
+        page = []
+        for i in range(offset, min(offset + limit, len(arrays))):
+            rankings = [
+                arrays.candidate_ids[id_offsets[j] : id_offsets[j + 1]].tolist()
+                for j in range(level_offsets[i], level_offsets[i + 1])
+            ]
+            page.append({"weight": int(arrays.weights[i]), "rankings": rankings})
+        return page
+
+
+def parse_election(path: str) -> ParsedElection:
+    """Parse `path` into a `ParsedElection`. Runs in a worker process."""
+    from fresh_blt.parse import load_blt
+    from fresh_blt.stats import compute_stats
+
+    source = fingerprint(Path(path))
+    election_info, candidates, ballots = load_blt(Path(path))
+    return ParsedElection(
+        path=path,
+        size=source["size"],
+        mtime_ns=source["mtime_ns"],
+        sha256=source["sha256"],
+        election_info=election_info,
+        candidates=[candidate.model_dump() for candidate in candidates],
+        stats=asdict(compute_stats(candidates, ballots)),
+        arrays=BallotArrays.from_ballots(ballots),
+    )
+
+
+def _file_sha256(path: Path) -> str:
+    with open(path, "rb") as f:
+        return hashlib.file_digest(f, "sha256").hexdigest()
+
+
+class ElectionCache:
+    """LRU cache of `ParsedElection`s by path, evicting once `max_bytes` is exceeded."""
+
+    def __init__(self, max_bytes: int = DEFAULT_MEMORY_BUDGET) -> None:
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self._entries: OrderedDict[str, ParsedElection] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, path: str) -> ParsedElection | None:
+        entry = self._entries.get(path)
+        if entry is not None:
+            self._entries.move_to_end(path)
+        return entry
+
+    def put(self, entry: ParsedElection) -> None:
+        """Store `entry`, evicting least recently used entries to stay within budget."""
+        self.discard(entry.path)
+        self._entries[entry.path] = entry
+        self.nbytes += entry.nbytes
+        # The newest entry stays even when it alone exceeds the budget.
+        while self.nbytes > self.max_bytes and len(self._entries) > 1:
+            _, evicted = self._entries.popitem(last=False)
+            self.nbytes -= evicted.nbytes
+            logger.info(f"Evicted {evicted.path} from the election cache")
+
+    def discard(self, path: str) -> None:
+        if (entry := self._entries.pop(path, None)) is not None:
+            self.nbytes -= entry.nbytes
+
+
+class RequestError(Exception):
+    """A request that cannot be answered, with the HTTP status to report."""
+
+    def __init__(self, status: HTTPStatus, message: str) -> None:
+        super().__init__(message)
+        self.status = status
+
+
+class ElectionServer:
+    """
+    Serves election queries from an `ElectionCache`, parsing misses in a pool of
+    `workers` processes (default: one per CPU).
+    """
+
+    def __init__(self, memory_budget: int = DEFAULT_MEMORY_BUDGET, workers: int | None = None):
+        self.cache = ElectionCache(memory_budget)
+        self.workers = workers
+        self.parses = 0
+        self._pool: ProcessPoolExecutor | None = None
+        self._pending: dict[str, asyncio.Task[ParsedElection]] = {}
+
+    async def start(
+        self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, socket_path: Path | None = None
+    ) -> asyncio.Server:
+        """Start listening on `socket_path` if given, otherwise on `host`:`port`."""
+        if self._pool is None:
+            # Forked workers would inherit open client sockets and hold connections open.
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers, mp_context=multiprocessing.get_context("spawn")
+            )
+        if socket_path is not None:
+            return await asyncio.start_unix_server(self.handle, path=socket_path)
+        return await asyncio.start_server(self.handle, host, port)
+
+    def close(self) -> None:
+        """Shut down the worker pool."""
+        if self._pool is not None:
+            self._pool.shutdown(cancel_futures=True)
+            self._pool = None
+
+    async def election(self, path: str) -> ParsedElection:
+        """The parsed election at `path`, from the cache when it is still current."""
+        resolved = Path(path).resolve()
+        try:
+            stat = resolved.stat()
+        except OSError as e:
+            raise RequestError(HTTPStatus.NOT_FOUND, f"Cannot read {path}: {e}") from None
+        key = str(resolved)
+
+        entry = self.cache.get(key)
+        if entry is not None and entry.size == stat.st_size:
+            if entry.mtime_ns == stat.st_mtime_ns:
+                return entry
+            loop = asyncio.get_running_loop()
+            if await loop.run_in_executor(None, _file_sha256, resolved) == entry.sha256:
+                entry = replace(entry, mtime_ns=stat.st_mtime_ns)
+                self.cache.put(entry)
+                return entry
+
+        task = self._pending.get(key)
+        if task is None:
+            task = asyncio.create_task(self._parse(key))
+            self._pending[key] = task
+            task.add_done_callback(lambda _: self._pending.pop(key, None))
+        # Shield the shared parse from a single client going away.
+        return await asyncio.shield(task)
+
+    async def _parse(self, path: str) -> ParsedElection:
+        loop = asyncio.get_running_loop()
+        try:
+            entry = await loop.run_in_executor(self._pool, parse_election, path)
+        except OSError as e:
+            raise RequestError(HTTPStatus.NOT_FOUND, f"Cannot read {path}: {e}") from None
+        except Exception as e:
+            raise RequestError(
+                HTTPStatus.UNPROCESSABLE_ENTITY, f"Cannot parse {path}: {e}"
+            ) from None
+        self.parses += 1
+        self.cache.put(entry)
+        logger.info(f"Parsed {path} ({entry.election_info['total_ballots']} ballots)")
+        return entry
+
+    async def respond(self, target: str) -> dict[str, Any]:
+        """Answer a request for `target`, a path with query string."""
+        url = urlsplit(target)
+        query = {name: values[-1] for name, values in parse_qs(url.query).items()}
+
+        if url.path == "/health":
+            return {
+                "status": "ok",
+                "cached_elections": len(self.cache),
+                "cache_bytes": self.cache.nbytes,
+                "memory_budget": self.cache.max_bytes,
+                "parses": self.parses,
+            }
+        if url.path not in ("/info", "/stats", "/ballots"):
+            raise RequestError(HTTPStatus.NOT_FOUND, f"Unknown endpoint {url.path}")
+        if "path" not in query:
+            raise RequestError(HTTPStatus.BAD_REQUEST, "Missing 'path' parameter")
+
+        # Reject bad paging parameters before paying for a parse.
+        offset = _int_param(query, "offset", 0)
+        limit = min(_int_param(query, "limit", 10), MAX_PAGE_SIZE)
+
+        entry = await self.election(query["path"])
+        if url.path == "/info":
+            return {"election_info": entry.election_info, "candidates": entry.candidates}
+        if url.path == "/stats":
+            return entry.stats
+
+        total = entry.election_info["total_ballots"]
+        return {
+            "offset": offset,
+            "total": total,
+            "has_more": offset + limit < total,
+            "ballots": entry.ballot_page(offset, limit),
+        }
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Serve one HTTP/1.1 request per connection."""
+        try:
+            head = await reader.readuntil(b"\r\n\r\n")
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+            writer.close()
+            return
+
+        try:
+            if len(head) > MAX_REQUEST_HEAD:
+                raise RequestError(HTTPStatus.REQUEST_HEADER_FIELDS_TOO_LARGE, "Request too large")
+            request_line = head.split(b"\r\n", 1)[0].decode("latin-1")
+            method, target, _ = request_line.split(" ", 2)
+            if method != "GET":
+                raise RequestError(HTTPStatus.METHOD_NOT_ALLOWED, "Only GET is supported")
+            status, body = HTTPStatus.OK, await self.respond(target)
+        except RequestError as e:
+            status, body = e.status, {"error": str(e)}
+        except ValueError:
+            status, body = HTTPStatus.BAD_REQUEST, {"error": "Malformed request line"}
+
+        payload = json.dumps(body).encode("utf-8")
+        writer.write(
+            f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+            "Content-Type: application/json\r\n"
+            f"Content-Length: {len(payload)}\r\n"
+            "Connection: close\r\n\r\n".encode("latin-1")
+            + payload
+        )
+        try:
+            await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+
+def _int_param(query: dict[str, str], name: str, default: int) -> int:
+    value = query.get(name)
+    if value is None:
+        return default
+    if not value.isdigit():
+        raise RequestError(HTTPStatus.BAD_REQUEST, f"'{name}' must be a non-negative integer")
+    return int(value)
+
+
+def run_server(
+    host: str = DEFAULT_HOST,
+    port: int = DEFAULT_PORT,
+    socket_path: Path | None = None,
+    memory_budget: int = DEFAULT_MEMORY_BUDGET,
+    workers: int | None = None,
+) -> None:
+    """Serve until interrupted."""
+
+    async def serve() -> None:
+        server = ElectionServer(memory_budget, workers)
+        try:
+            listener = await server.start(host, port, socket_path)
+            async with listener:
+                await listener.serve_forever()
+        finally:
+            server.close()
+            if socket_path is not None:
+                socket_path.unlink(missing_ok=True)
+
+    asyncio.run(serve())
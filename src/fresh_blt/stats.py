@@ -0,0 +1,109 @@
+"""
+Aggregate election statistics, computed in a single pass over the ballots, or
+directly on the arrays of ballots loaded from the binary cache.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
+
+from fresh_blt.models.candidate import Candidate
+from fresh_blt.timing import stage
+
+if TYPE_CHECKING:
+    from fresh_blt.columnar import BallotArrays
+
+
+@dataclass
+class ElectionStats:
+    """
+    Totals for an election. `first_preferences` maps each active candidate's ID to the
+    weight of ballots ranking them first; tied first choices each receive the full
+    weight.
+    """
+
+    total_ballots: int = 0
+    total_votes: int = 0
+    first_preferences: dict[int, int] = field(default_factory=dict)
+    ballots_with_ties: int = 0
+    max_rankings: int = 0
+
+
+def compute_stats(candidates: list[Candidate], ballots: Sequence[dict[str, Any]]) -> ElectionStats:
+    """Compute `ElectionStats` for parsed ballots in one pass."""
+    with stage("compute_stats"):
+        return _compute_stats(candidates, ballots)
+
+
+def _compute_stats(candidates: list[Candidate], ballots: Sequence[dict[str, Any]]) -> ElectionStats:
+    # Ballots loaded from the cache (`LazyBallots`) carry their arrays; use those
+    # rather than building a dict per ballot.
+    arrays = getattr(ballots, "arrays", None)
+    if arrays is not None:
+        return _compute_stats_columnar(candidates, arrays)
+
+    first_preferences = {c.id: 0 for c in candidates if not c.withdrawn}
+    total_ballots = 0
+    total_votes = 0
+    ballots_with_ties = 0
+    max_rankings = 0
+
+    for ballot in ballots:
+        weight = ballot["weight"]
+        rankings = ballot["rankings"]
+        total_ballots += 1
+        total_votes += weight
+        max_rankings = max(max_rankings, len(rankings))
+
+        if rankings:
+            for candidate in rankings[0]:
+                # Only count preferences for active (non-withdrawn) candidates
+                if candidate.id in first_preferences:
+                    first_preferences[candidate.id] += weight
+            if any(len(level) > 1 for level in rankings):
+                ballots_with_ties += 1
+
+    return ElectionStats(
+        total_ballots=total_ballots,
+        total_votes=total_votes,
+        first_preferences=first_preferences,
+        ballots_with_ties=ballots_with_ties,
+        max_rankings=max_rankings,
+    )
+
+
+def _compute_stats_columnar(candidates: list[Candidate], arrays: BallotArrays) -> ElectionStats:
+    """`_compute_stats` for ballots loaded from the cache, straight from their arrays."""
+    import numpy as np
+
+    from fresh_blt.columnar import exact_sum, weight_totals
+
+    levels_per_ballot = np.diff(arrays.level_offsets)
+    ids_per_level = np.diff(arrays.id_offsets)
+
+    # Candidates in the first level of each ballot that ranks anyone.
+    ranked = levels_per_ballot > 0
+    first_levels = arrays.level_offsets[:-1][ranked]
+    first_counts = ids_per_level[first_levels]
+    first_starts = arrays.id_offsets[first_levels]
+    within_level = np.arange(first_counts.sum()) - np.repeat(
+        np.cumsum(first_counts) - first_counts, first_counts
+    )
+    first_ids = arrays.candidate_ids[np.repeat(first_starts, first_counts) + within_level]
+    first_totals = weight_totals(
+        first_ids, np.repeat(arrays.weights[ranked], first_counts), len(candidates) + 1
+    )
+
+    ballot_of_level = np.repeat(np.arange(len(arrays)), levels_per_ballot)
+    has_tie = np.zeros(len(arrays), dtype=bool)
+    has_tie[ballot_of_level[ids_per_level > 1]] = True
+
+    return ElectionStats(
+        total_ballots=len(arrays),
+        total_votes=exact_sum(arrays.weights),
+        first_preferences={c.id: first_totals[c.id] for c in candidates if not c.withdrawn},
+        ballots_with_ties=int(has_tie.sum()),
+        max_rankings=int(levels_per_ballot.max(initial=0)),
+    )
@@ -0,0 +1,131 @@
+"""
+Per-stage timing instrumentation.
+
+Library code marks its expensive steps with `stage("name")`. Outside of
+`collect_timings` a stage costs one context-variable lookup; inside, each stage records
+its wall-clock time, CPU time and, when memory tracing is on, the peak memory traced
+by `tracemalloc` while it ran:
+
+    with collect_timings() as timings:
+        load_blt(path)
+    for metrics in timings.stages:
+        print(metrics.name, metrics.wall_seconds)
+
+Stages may nest; `depth` records how deeply. Stages run on other threads are not
+recorded, since they do not see the collector.
+"""
+
+from __future__ import annotations
+
+import time
+import tracemalloc
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass, field
+from typing import Any
+
+
+@dataclass
+class StageMetrics:
+    """
+    Measurements for one run of a stage. `peak_memory_bytes` is the highest memory
+    traced while the stage ran, or `None` when memory was not traced.
+    """
+
+    name: str
+    wall_seconds: float
+    cpu_seconds: float
+    peak_memory_bytes: int | None = None
+    depth: int = 0
+
+
+@dataclass
+class Timings:
+    """Stage metrics in the order the stages started."""
+
+    stages: list[StageMetrics] = field(default_factory=list)
+    trace_memory: bool = True
+    _peaks: list[int] = field(default_factory=list, repr=False)
+
+    def by_name(self, name: str) -> list[StageMetrics]:
+        """Every recorded run of stage `name`."""
+        return [metrics for metrics in self.stages if metrics.name == name]
+
+    def total_seconds(self) -> float:
+        """Wall-clock time of the top-level stages."""
+        return sum(metrics.wall_seconds for metrics in self.stages if metrics.depth == 0)
+
+    def to_dict(self) -> dict[str, Any]:
+        """JSON-ready form of the metrics."""
+        return {
+            "stages": [asdict(metrics) for metrics in self.stages],
+            "total_seconds": self.total_seconds(),
+        }
+
+    @contextmanager
+    def measure(self, name: str) -> Iterator[None]:
+        metrics = StageMetrics(name, 0.0, 0.0, depth=len(self._peaks))
+        self.stages.append(metrics)
+        tracing = self.trace_memory and tracemalloc.is_tracing()
+        if tracing:
+            # reset_peak() forgets the enclosing stage's peak, so carry it over first.
+            if self._peaks:
+                self._peaks[-1] = max(self._peaks[-1], tracemalloc.get_traced_memory()[1])
+            tracemalloc.reset_peak()
+            self._peaks.append(tracemalloc.get_traced_memory()[0])
+        else:
+            self._peaks.append(0)
+
+        start_wall = time.perf_counter()
+        start_cpu = time.process_time()
+        try:
+            yield
+        finally:
+            metrics.wall_seconds = time.perf_counter() - start_wall
+            metrics.cpu_seconds = time.process_time() - start_cpu
+            peak = self._peaks.pop()
+            if tracing:
+                peak = max(peak, tracemalloc.get_traced_memory()[1])
+                metrics.peak_memory_bytes = peak
+                if self._peaks:
+                    self._peaks[-1] = max(self._peaks[-1], peak)
+
+
+_active: ContextVar[Timings | None] = ContextVar("fresh_blt_timings", default=None)
+
+
+@contextmanager
+def collect_timings(trace_memory: bool = True) -> Iterator[Timings]:
+    """
+    Record every stage run inside the block.
+
+    Args:
+        trace_memory: Whether to record peak memory per stage. Starts `tracemalloc` if
+            it is not already running, which slows allocation-heavy code noticeably
+
+    Yields:
+        The `Timings` the stages are recorded into
+    """
+    timings = Timings(trace_memory=trace_memory)
+    started_tracing = trace_memory and not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+    token = _active.set(timings)
+    try:
+        yield timings
+    finally:
+        _active.reset(token)
+        if started_tracing:
+            tracemalloc.stop()
+
+
+@contextmanager
+def stage(name: str) -> Iterator[None]:
+    """Record the block as stage `name` if timings are being collected."""
+    timings = _active.get()
+    if timings is None:
+        yield
+        return
+    with timings.measure(name):
+        yield
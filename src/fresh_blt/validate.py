@@ -0,0 +1,243 @@
+"""
+Streaming validation of .blt files.
+
+`validate_blt` reads the file once, line by line, and records every problem it finds
+with its line number instead of stopping at the first one. Memory use does not grow
+with the file: only the current ballot's candidate IDs, the withdrawn IDs and up to
+`max_errors` error records are kept.
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any
+
+from fresh_blt.compression import detect_compression, open_stream
+from fresh_blt.grammar import split_ballot_line
+from fresh_blt.timing import stage
+
+DEFAULT_MAX_ERRORS = 1000
+
+_NAME_RE = re.compile(rb'"(?:[^"\\]|\\.)*"|[^\s"\']+')
+
+
+@dataclass(frozen=True)
+class ValidationIssue:
+    """A problem found on line `line` (1-based)."""
+
+    line: int
+    message: str
+
+
+@dataclass
+class ValidationReport:
+    """
+    Result of validating one file. `errors` holds the first `max_errors` problems;
+    `error_count` counts all of them.
+    """
+
+    path: str
+    errors: list[ValidationIssue] = field(default_factory=list)
+    error_count: int = 0
+    num_candidates: int | None = None
+    num_positions: int | None = None
+    num_names: int = 0
+    withdrawn_candidate_ids: list[int] = field(default_factory=list)
+    total_ballots: int = 0
+    total_votes: int = 0
+    max_errors: int = DEFAULT_MAX_ERRORS
+
+    @property
+    def is_valid(self) -> bool:
+        return self.error_count == 0
+
+    def add_error(self, line: int, message: str) -> None:
+        self.error_count += 1
+        if len(self.errors) < self.max_errors:
+            self.errors.append(ValidationIssue(line, message))
+
+    def to_dict(self) -> dict[str, Any]:
+        """JSON-ready form of the report."""
+        report = asdict(self)
+        del report["max_errors"]
+        report["valid"] = self.is_valid
+        report["truncated"] = self.error_count > len(self.errors)
+        return report
+
+
+def validate_blt(blt_path: Path, max_errors: int = DEFAULT_MAX_ERRORS) -> ValidationReport:
+    """
+    Validate a .blt file in a single streaming pass.
+
+    Checks the header, withdrawn lines, every ballot (positive weight, known candidate
+    IDs, no candidate ranked twice, nothing after the `0` terminator), the closing `0`
+    line, the name and title lines, and that the number of names matches the header.
+
+    Args:
+        blt_path: Path to the BLT file, optionally gzip, bz2, xz or zstd compressed
+        max_errors: Maximum number of errors to keep in the report; all are counted
+
+    Returns:
+        The validation report
+
+    Raises:
+        OSError: If the file cannot be read
+    """
+    report = ValidationReport(path=str(blt_path), max_errors=max_errors)
+    with stage("validate"), open_stream(blt_path, "rb", detect_compression(blt_path)) as f:
+        _validate_lines(f, report)
+    return report
+
+
+def _validate_lines(lines: Any, report: ValidationReport) -> None:
+    section = "header"
+    withdrawn: set[int] = set()
+    last_name_line = 0
+    closing_line = 0
+    line_number = 0
+
+    for line_number, raw_line in enumerate(lines, 1):
+        line = raw_line.strip()
+        if not line:
+            if section == "header":
+                report.add_error(line_number, "Blank line before the header")
+            continue
+
+        if section == "header":
+            _check_header(line, line_number, report)
+            section = "withdrawn"
+        elif section in ("withdrawn", "ballots") and line.startswith(b"-"):
+            if section == "ballots":
+                report.add_error(line_number, "Withdrawn candidate line after ballots")
+            _check_withdrawn(line, line_number, report, withdrawn)
+        elif section in ("withdrawn", "ballots"):
+            if line == b"0":
+                section = "names"
+                closing_line = line_number
+                continue
+            section = "ballots"
+            _check_ballot(line, line_number, report)
+        else:
+            if not _NAME_RE.fullmatch(line):
+                report.add_error(line_number, f"Invalid name line: {_show(line)}")
+            try:
+                line.decode("utf-8")
+            except UnicodeDecodeError:
+                report.add_error(line_number, "Name is not valid UTF-8")
+            report.num_names += 1
+            last_name_line = line_number
+
+    if section == "header":
+        report.add_error(1, "Missing header")
+        return
+    if section != "names":
+        report.add_error(line_number, "Missing 0 line closing the ballots")
+        return
+
+    # The last name line is the title.
+    if report.num_names < 2:
+        report.add_error(last_name_line or closing_line, "Expected candidate names and a title")
+    report.num_names = max(report.num_names - 1, 0)
+    if report.num_candidates is not None and report.num_names != report.num_candidates:
+        report.add_error(
+            1,
+            f"Header declares {report.num_candidates} candidates but "
+            f"{report.num_names} names are given",
+        )
+    report.withdrawn_candidate_ids = sorted(withdrawn)
+
+
+def _check_header(line: bytes, line_number: int, report: ValidationReport) -> None:
+    fields = line.split()
+    if len(fields) != 2 or not all(f.isdigit() for f in fields):
+        report.add_error(
+            line_number, f"Header must be two non-negative integers, got {_show(line)}"
+        )
+        return
+    report.num_candidates, report.num_positions = (int(f) for f in fields)
+    if report.num_positions > report.num_candidates:
+        report.add_error(
+            line_number,
+            f"Header declares {report.num_positions} positions for "
+            f"{report.num_candidates} candidates",
+        )
+
+
+def _check_withdrawn(
+    line: bytes, line_number: int, report: ValidationReport, withdrawn: set[int]
+) -> None:
+    fields = line.split()
+    if len(fields) != 1:
+        report.add_error(line_number, "Expected one withdrawn candidate per line")
+    for entry in fields:
+        if not (entry.startswith(b"-") and entry[1:].isdigit()):
+            report.add_error(line_number, f"Invalid withdrawn candidate {_show(entry)}")
+            continue
+        candidate_id = int(entry[1:])
+        if not _known_candidate(candidate_id, report):
+            report.add_error(line_number, f"Unknown withdrawn candidate ID {candidate_id}")
+        elif candidate_id in withdrawn:
+            report.add_error(line_number, f"Candidate {candidate_id} withdrawn more than once")
+        withdrawn.add(candidate_id)
+
+
+def _check_ballot(line: bytes, line_number: int, report: ValidationReport) -> None:
+    weight_field, *preferences = split_ballot_line(line)
+    weight = int(weight_field) if weight_field.isdigit() else 0
+    if weight > 0:
+        report.total_votes += weight
+    else:
+        report.add_error(
+            line_number, f"Ballot weight must be a positive integer, got {_show(weight_field)}"
+        )
+    report.total_ballots += 1
+
+    if preferences and preferences[-1] == b"0":
+        preferences.pop()
+    if not preferences:
+        report.add_error(line_number, "Ballot ranks no candidates")
+
+    # Fast path for the common case: every entry is a known ID, written canonically,
+    # and none repeats.
+    if b"=" in line:
+        entries = [entry for preference in preferences for entry in preference.split(b"=")]
+    else:
+        entries = preferences
+    num_candidates = report.num_candidates
+    if (
+        num_candidates is not None
+        and len(set(entries)) == len(entries)
+        and all(
+            entry.isdigit() and not entry.startswith(b"0") and int(entry) <= num_candidates
+            for entry in entries
+        )
+    ):
+        return
+
+    seen: set[int] = set()
+    for preference in preferences:
+        for entry in preference.split(b"="):
+            if not entry.isdigit():
+                report.add_error(line_number, f"Invalid candidate ID {_show(entry)}")
+                continue
+            candidate_id = int(entry)
+            if candidate_id == 0:
+                report.add_error(line_number, "Preferences after the 0 terminator")
+            elif not _known_candidate(candidate_id, report):
+                report.add_error(line_number, f"Unknown candidate ID {candidate_id}")
+            elif candidate_id in seen:
+                report.add_error(line_number, f"Candidate {candidate_id} ranked more than once")
+            seen.add(candidate_id)
+
+
+def _known_candidate(candidate_id: int, report: ValidationReport) -> bool:
+    if report.num_candidates is None:
+        return candidate_id >= 1
+    return 1 <= candidate_id <= report.num_candidates
+
+
+def _show(text: bytes) -> str:
+    shown = text.decode("utf-8", "replace")
+    return repr(shown if len(shown) <= 40 else f"{shown[:37]}...")
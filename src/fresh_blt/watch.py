@@ -0,0 +1,172 @@
+"""
+Incremental export of a directory of .blt files.
+
+`Watcher.poll` finds the .blt files that are new or changed since they were last
+exported and exports only those, through the bounded process pool of
+`fresh_blt.batch`. A file whose size and mtime are unchanged is skipped without being
+read; one whose mtime changed is hashed, and skipped if its content is the same.
+
+What has been exported is recorded in a JSON state file in the output directory, so a
+restarted watcher (or a cron job running `--once`) picks up where the last run
+stopped. Changing the export settings invalidates the recorded state.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import time
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from fresh_blt.batch import BatchResult, export_batch, find_blt_files
+from fresh_blt.compression import COMPRESSIONS
+from fresh_blt.export import EXPORT_SUFFIXES
+
+logger = logging.getLogger(__name__)
+
+STATE_FILE_NAME = ".fresh_blt_watch.json"
+STATE_FORMAT_VERSION = 1
+DEFAULT_POLL_INTERVAL = 2.0
+
+
+@dataclass
+class Watcher:
+    """
+    Exports the changed .blt files in `directory` to `output_dir` on each `poll`.
+
+    The export settings are passed to `export_batch` unchanged.
+
+    Raises:
+        ValueError: If the format or compression is not supported
+    """
+
+    directory: Path
+    output_dir: Path
+    format: str = "json"
+    canonicalize: bool = False
+    json_schema: str = "full"
+    compression: str | None = None
+    workers: int | None = None
+    files: dict[str, dict[str, Any]] = field(default_factory=dict, init=False)
+
+    def __post_init__(self) -> None:
+        if self.format.lower() not in EXPORT_SUFFIXES:
+            raise ValueError(f"Unsupported format: {self.format}. Use 'json', 'csv' or 'blt'.")
+        if self.compression is not None and self.compression not in COMPRESSIONS:
+            raise ValueError(
+                f"Unsupported compression: {self.compression}. "
+                f"Use {', '.join(map(repr, COMPRESSIONS))}."
+            )
+        self.load_state()
+
+    @property
+    def state_path(self) -> Path:
+        return self.output_dir / STATE_FILE_NAME
+
+    @property
+    def settings(self) -> dict[str, Any]:
+        return {
+            "format": self.format.lower(),
+            "canonicalize": self.canonicalize,
+            "json_schema": self.json_schema,
+            "compression": self.compression,
+        }
+
+    def load_state(self) -> None:
+        """Read the state file, ignoring it if it is missing, unreadable or for other settings."""
+        try:
+            state = json.loads(self.state_path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable watch state {self.state_path}: {e}")
+            return
+        if state.get("version") != STATE_FORMAT_VERSION or state.get("settings") != self.settings:
+            logger.info(f"Export settings changed; re-exporting everything in {self.directory}")
+            return
+        self.files = state["files"]
+
+    def save_state(self) -> None:
+        """Write the state file atomically."""
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        state = {"version": STATE_FORMAT_VERSION, "settings": self.settings, "files": self.files}
+        tmp_path = self.state_path.with_name(f"{self.state_path.name}.tmp")
+        tmp_path.write_text(json.dumps(state, indent=2), encoding="utf-8")
+        tmp_path.replace(self.state_path)
+
+    def changed_files(self) -> dict[Path, dict[str, Any]]:
+        """
+        Map each new or changed .blt file to its fingerprint (size, mtime_ns, sha256).
+        Records new mtimes for touched-but-unchanged files and forgets deleted ones.
+        """
+        changed = {}
+        present = set()
+        for source in find_blt_files(self.directory):
+            key = str(source.resolve())
+            present.add(key)
+            try:
+                stat = source.stat()
+                recorded = self.files.get(key)
+                if recorded and (recorded["size"], recorded["mtime_ns"]) == (
+                    stat.st_size,
+                    stat.st_mtime_ns,
+                ):
+                    continue
+                with open(source, "rb") as f:
+                    digest = hashlib.file_digest(f, "sha256").hexdigest()
+            except OSError as e:
+                # Most likely deleted or still being written; try again next poll.
+                logger.warning(f"Skipping {source}: {e}")
+                continue
+
+            fingerprint = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "sha256": digest}
+            if recorded and recorded["sha256"] == digest:
+                recorded.update(fingerprint)
+            else:
+                changed[source] = fingerprint
+
+        for key in self.files.keys() - present:
+            del self.files[key]
+        return changed
+
+    def poll(self) -> Iterator[BatchResult]:
+        """Export every changed file, yielding results as they finish, then save state."""
+        changed = self.changed_files()
+        by_source = {source.resolve(): fingerprint for source, fingerprint in changed.items()}
+        try:
+            if changed:
+                for result in export_batch(
+                    sorted(changed),
+                    self.output_dir,
+                    self.format,
+                    self.canonicalize,
+                    self.json_schema,
+                    self.compression,
+                    self.workers,
+                ):
+                    # Failures are recorded too, so a broken file is retried once it
+                    # changes rather than on every poll.
+                    self.files[str(result.source.resolve())] = {
+                        **by_source[result.source.resolve()],
+                        "outputs": [str(path) for path in result.outputs],
+                        "error": result.error,
+                    }
+                    yield result
+        finally:
+            self.save_state()
+
+    def run(
+        self,
+        interval: float = DEFAULT_POLL_INTERVAL,
+        on_result: Callable[[BatchResult], None] | None = None,
+    ) -> None:
+        """Poll every `interval` seconds until interrupted."""
+        while True:
+            for result in self.poll():
+                if on_result is not None:
+                    on_result(result)
+            time.sleep(interval)
@@ -15,6 +15,14 @@ Ballot.model_rebuild()
 Candidate.model_rebuild()
 
 
+@pytest.fixture(autouse=True)
+def isolated_cache_dir(tmp_path_factory, monkeypatch):
+    """Keep tests away from the user's real fresh_blt cache directory."""
+    cache_dir = tmp_path_factory.mktemp("fresh_blt_cache")
+    monkeypatch.setenv("FRESH_BLT_CACHE_DIR", str(cache_dir))
+    return cache_dir
+
+
 @pytest.fixture
 def faker():
     """Faker instance with .blt provider for testing."""
@@ -244,3 +252,14 @@ def grammar_blt_file_no_zero_terminators(grammar_blt_content_no_zero_terminators
 
     yield temp_path
     temp_path.unlink()
+
+
+@pytest.fixture
+def huge_weight_blt_file():
+    """Create temporary .blt file with a ballot weight beyond the int64 range."""
+    with tempfile.NamedTemporaryFile(mode="w", suffix=".blt", delete=False) as f:
+        f.write('2 1\n99999999999999999999 1 2 0\n1 2 0\n0\n"Adam"\n"Basil"\n"Big Election"\n')
+        temp_path = Path(f.name)
+
+    yield temp_path
+    temp_path.unlink()
@@ -0,0 +1,85 @@
+"""
+Tests for batch export across worker processes.
+"""
+
+from __future__ import annotations
+
+import json
+import shutil
+
+import pytest
+from typer.testing import CliRunner
+
+from fresh_blt.batch import export_batch, export_file, find_blt_files
+from fresh_blt.cli import app
+
+
+@pytest.fixture
+def contest_dir(tmp_path, grammar_blt_file_withdrawn, grammar_blt_file_no_withdrawn):
+    """Directory holding two valid contests, one invalid file and one non-.blt file."""
+    directory = tmp_path / "contests"
+    directory.mkdir()
+    shutil.copy(grammar_blt_file_withdrawn, directory / "alpha.blt")
+    shutil.copy(grammar_blt_file_no_withdrawn, directory / "beta.blt")
+    (directory / "broken.blt").write_text("not a blt file\n")
+    (directory / "notes.txt").write_text("ignored\n")
+    return directory
+
+
+class TestBatchExport:
+    """Test the batch export functions."""
+
+    def test_find_blt_files(self, contest_dir):
+        assert [p.name for p in find_blt_files(contest_dir)] == [
+            "alpha.blt",
+            "beta.blt",
+            "broken.blt",
+        ]
+
+    def test_export_file_reports_errors_instead_of_raising(self, contest_dir, tmp_path):
+        result = export_file(contest_dir / "broken.blt", tmp_path, "json")
+
+        assert result.outputs == []
+        assert result.error
+
+    def test_export_batch_writes_each_contest(self, contest_dir, tmp_path):
+        output_dir = tmp_path / "out"
+
+        results = list(export_batch(find_blt_files(contest_dir), output_dir, "json", workers=2))
+
+        by_name = {r.source.name: r for r in results}
+        assert set(by_name) == {"alpha.blt", "beta.blt", "broken.blt"}
+        assert by_name["broken.blt"].error
+        assert by_name["alpha.blt"].outputs == [output_dir / "alpha.json"]
+        data = json.loads((output_dir / "beta.json").read_text())
+        assert data["election_info"]["title"] == "Cool Election"
+
+    def test_export_batch_rejects_unknown_format(self, contest_dir, tmp_path):
+        with pytest.raises(ValueError, match="Unsupported format"):
+            list(export_batch(find_blt_files(contest_dir), tmp_path, "xml"))
+
+
+class TestBatchExportCommand:
+    """Test export --batch on the command line."""
+
+    def test_batch_csv_summary(self, contest_dir, tmp_path):
+        output_dir = tmp_path / "out"
+
+        result = CliRunner().invoke(
+            app, ["export", "--batch", str(contest_dir), "-o", str(output_dir), "-f", "csv"]
+        )
+
+        assert result.exit_code == 1
+        assert "Exported 2 of 3 contests" in result.output
+        assert "broken.blt" in result.output
+        assert (output_dir / "alpha_ballots.csv").exists()
+        assert (output_dir / "beta_candidates.csv").exists()
+
+    def test_batch_and_file_are_exclusive(self, contest_dir, grammar_blt_file_withdrawn, tmp_path):
+        result = CliRunner().invoke(
+            app,
+            ["export", str(grammar_blt_file_withdrawn), "--batch", str(contest_dir), "-o", "x"],
+        )
+
+        assert result.exit_code == 1
+        assert "not both" in result.output
@@ -0,0 +1,83 @@
+"""
+Tests for the on-host benchmark.
+"""
+
+from __future__ import annotations
+
+import os
+
+from fresh_blt.bench import (
+    ScalingResult,
+    recommend_workers,
+    run_bench,
+    worker_counts,
+)
+
+
+class TestRecommendWorkers:
+    """Test choosing a worker count from scaling and memory measurements."""
+
+    def test_worker_counts(self):
+        assert worker_counts(1) == [1]
+        assert worker_counts(6) == [1, 2, 4, 6]
+        assert worker_counts(8) == [1, 2, 4, 8]
+
+    def test_fewest_workers_near_best_throughput(self):
+        scaling = [
+            ScalingResult(1, 16, 16.0),
+            ScalingResult(2, 16, 8.0),
+            ScalingResult(4, 16, 4.2),
+            ScalingResult(8, 16, 4.0),
+        ]
+
+        workers, reason = recommend_workers(scaling, None, None)
+
+        assert workers == 4
+        assert "90%" in reason
+
+    def test_capped_by_memory(self):
+        scaling = [ScalingResult(1, 8, 8.0), ScalingResult(8, 8, 1.0)]
+
+        workers, reason = recommend_workers(scaling, 1000, 3000)
+
+        assert workers == 2
+        assert "memory" in reason
+
+
+class TestRunBench:
+    """Test a small end-to-end benchmark run."""
+
+    def test_run_bench(self, tmp_path):
+        steps = []
+
+        report = run_bench(300, 4, max_workers=1, directory=tmp_path, on_stage=steps.append)
+
+        assert [stage.name for stage in report.stages] == [
+            "generate",
+            "parse",
+            "load (binary cache)",
+            "stats",
+            "export json",
+            "export csv",
+        ]
+        assert all(stage.ballots_per_second > 0 for stage in report.stages)
+        assert [result.workers for result in report.scaling] == [1]
+        assert report.recommended_workers == 1
+        assert steps[0] == "generate" and steps[-1] == "scaling"
+        # The binary cache stays in the benchmark directory, and its size is what the
+        # load stage reads.
+        cache_sizes = [path.stat().st_size for path in (tmp_path / "cache").glob("*.npz")]
+        assert report.stages[2].bytes in cache_sizes
+        assert report.stages[2].bytes != report.stages[1].bytes
+        assert os.environ["FRESH_BLT_CACHE_DIR"] != str(tmp_path / "cache")
+        assert report.to_dict()["stages"][1]["mb_per_second"] > 0
+
+    def test_memory_per_worker_after_earlier_peak(self, tmp_path):
+        # ru_maxrss never drops, so a larger earlier peak used to hide the parse's memory.
+        ballast = bytearray(64 * 2**20)
+        del ballast
+
+        report = run_bench(300, 4, max_workers=1, directory=tmp_path)
+
+        assert report.memory_per_worker is not None
+        assert 0 < report.memory_per_worker < 64 * 2**20
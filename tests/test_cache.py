@@ -0,0 +1,200 @@
+"""
+Tests for the binary cache of parsed .blt files.
+"""
+
+from __future__ import annotations
+
+import os
+
+import pytest
+from typer.testing import CliRunner
+
+from fresh_blt.cache import cache_path_for, load_cache, write_cache
+from fresh_blt.cli import app, load_blt_data
+from fresh_blt.columnar import BallotArrays, LazyBallots, exact_sum
+from fresh_blt.fixtures.vectorized import generate_ballot_arrays
+from fresh_blt.models.candidate import Candidate
+from fresh_blt.parse import load_blt
+from fresh_blt.stats import compute_stats
+
+
+def generated_election(num_candidates, num_ballots, seed=1):
+    """Candidates (the second one withdrawn) and lazy ballots of a generated election."""
+    candidates = [
+        Candidate(id=i, name=f"Candidate {i}", withdrawn=i == 2)
+        for i in range(1, num_candidates + 1)
+    ]
+    arrays = generate_ballot_arrays(num_candidates, num_ballots, seed=seed)
+    return candidates, LazyBallots(arrays, {c.id: c for c in candidates})
+
+
+class TestBallotArrays:
+    """Test the columnar ballot representation."""
+
+    def test_round_trip_preserves_ties_and_weights(self, predictable_election):
+        candidates = predictable_election.candidates
+        lookup = {c.id: c for c in candidates}
+        ballots = [
+            {"weight": b.weight, "rankings": b.rankings} for b in predictable_election.ballots
+        ]
+
+        arrays = BallotArrays.from_ballots(ballots)
+
+        assert len(arrays) == 2
+        assert arrays.to_ballots(lookup) == ballots
+        assert arrays.candidate_ids.tolist() == [1, 2, 4, 3, 2, 1, 4]
+
+    def test_weights_beyond_int64_are_exact(self):
+        arrays = BallotArrays.from_ballots(
+            [{"weight": 2**63, "rankings": []}, {"weight": 1, "rankings": []}]
+        )
+
+        assert arrays.weights.tolist() == [2**63, 1]
+        assert exact_sum(arrays.weights) == 2**63 + 1
+
+    def test_empty_ballot_list(self):
+        arrays = BallotArrays.from_ballots([])
+
+        assert len(arrays) == 0
+        assert arrays.to_ballots({}) == []
+
+    def test_concatenate_matches_single_build(self, predictable_election):
+        lookup = {c.id: c for c in predictable_election.candidates}
+        ballots = [
+            {"weight": b.weight, "rankings": b.rankings} for b in predictable_election.ballots
+        ]
+        parts = [BallotArrays.from_ballots(ballots[:1]), BallotArrays.from_ballots(ballots[1:])]
+
+        joined = BallotArrays.concatenate(parts)
+
+        assert joined.to_ballots(lookup) == ballots
+        assert len(BallotArrays.concatenate([])) == 0
+
+
+class TestLazyBallots:
+    """Test the ballot-dict view over `BallotArrays`."""
+
+    def test_matches_built_ballots(self):
+        candidates, lazy = generated_election(6, 25_000)
+        built = lazy.arrays.to_ballots(lazy.candidate_lookup)
+
+        assert len(lazy) == len(built)
+        assert list(lazy) == built
+        assert lazy == built and built == lazy
+        assert lazy[0] == built[0] and lazy[-1] == built[-1]
+        assert lazy[100:250] == built[100:250]
+        assert lazy[::7] == built[::7]
+        assert lazy[5:2] == []
+        with pytest.raises(IndexError):
+            lazy[len(built)]
+
+    def test_arrays_are_not_rebuilt(self):
+        _, lazy = generated_election(4, 100)
+
+        assert BallotArrays.from_ballots(lazy) is lazy.arrays
+
+    def test_stats_match_ballot_dicts(self, huge_weight_blt_file):
+        candidates, lazy = generated_election(6, 5000)
+        built = lazy.arrays.to_ballots(lazy.candidate_lookup)
+
+        assert compute_stats(candidates, lazy) == compute_stats(candidates, built)
+        assert compute_stats(candidates, lazy).ballots_with_ties > 0
+        assert 2 not in compute_stats(candidates, lazy).first_preferences
+
+        parsed = load_blt(huge_weight_blt_file, use_cache=False)
+        write_cache(huge_weight_blt_file, *parsed)
+        _, cached_candidates, cached_ballots = load_blt(huge_weight_blt_file)
+        assert isinstance(cached_ballots, LazyBallots)
+        assert compute_stats(cached_candidates, cached_ballots) == compute_stats(
+            parsed[1], parsed[2]
+        )
+
+
+class TestCache:
+    """Test writing, loading and invalidating cache files."""
+
+    def test_load_without_cache_returns_none(self, grammar_blt_file_withdrawn):
+        assert load_cache(grammar_blt_file_withdrawn) is None
+
+    def test_cache_round_trip_matches_parse(self, grammar_blt_file_withdrawn):
+        parsed = load_blt_data(grammar_blt_file_withdrawn)
+        write_cache(grammar_blt_file_withdrawn, *parsed)
+
+        cached = load_cache(grammar_blt_file_withdrawn)
+
+        assert cached is not None
+        assert cached == parsed
+        assert cached[1][1].withdrawn
+
+    def test_modified_source_invalidates_cache(self, grammar_blt_file_withdrawn):
+        write_cache(grammar_blt_file_withdrawn, *load_blt_data(grammar_blt_file_withdrawn))
+
+        content = grammar_blt_file_withdrawn.read_text()
+        grammar_blt_file_withdrawn.write_text(content.replace("Cool Election", "New Election"))
+
+        assert load_cache(grammar_blt_file_withdrawn) is None
+        assert load_blt_data(grammar_blt_file_withdrawn)[0]["title"] == "New Election"
+
+    def test_touched_source_invalidates_cache(self, grammar_blt_file_withdrawn):
+        write_cache(grammar_blt_file_withdrawn, *load_blt_data(grammar_blt_file_withdrawn))
+
+        stat = grammar_blt_file_withdrawn.stat()
+        os.utime(grammar_blt_file_withdrawn, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+        assert load_cache(grammar_blt_file_withdrawn) is None
+
+    def test_corrupt_cache_is_ignored(self, grammar_blt_file_withdrawn):
+        cache_path = write_cache(
+            grammar_blt_file_withdrawn, *load_blt_data(grammar_blt_file_withdrawn)
+        )
+        cache_path.write_bytes(b"not a cache")
+
+        assert load_cache(grammar_blt_file_withdrawn) is None
+
+    def test_million_ballot_reload_stays_columnar(self, tmp_path, monkeypatch):
+        candidates, ballots = generated_election(10, 1_000_000)
+        source = tmp_path / "million.blt"
+        source.write_text("stands in for the parsed file\n")
+        write_cache(source, {"title": "Million"}, candidates, ballots)
+
+        def build_dicts(*args):
+            raise AssertionError("the reload built ballot dicts")
+
+        monkeypatch.setattr(BallotArrays, "to_ballots", build_dicts)
+        _, loaded_candidates, loaded_ballots = load_blt(source)
+        election_stats = compute_stats(loaded_candidates, loaded_ballots)
+
+        assert len(loaded_ballots) == 1_000_000
+        assert election_stats.total_votes == exact_sum(ballots.arrays.weights)
+
+    def test_cache_dir_honors_environment(self, grammar_blt_file_withdrawn, isolated_cache_dir):
+        assert cache_path_for(grammar_blt_file_withdrawn).parent == isolated_cache_dir
+
+
+class TestConvertCommand:
+    """Test the convert CLI command."""
+
+    def test_convert_to_cache(self, grammar_blt_file_withdrawn):
+        result = CliRunner().invoke(
+            app, ["convert", str(grammar_blt_file_withdrawn), "--to", "cache"]
+        )
+
+        assert result.exit_code == 0
+        assert "Wrote cache" in result.output
+        assert cache_path_for(grammar_blt_file_withdrawn).exists()
+
+    def test_convert_weight_beyond_int64(self, huge_weight_blt_file):
+        result = CliRunner().invoke(app, ["convert", str(huge_weight_blt_file), "--to", "cache"])
+
+        assert result.exit_code == 0
+        cached = load_cache(huge_weight_blt_file)
+        assert cached is not None
+        assert [b["weight"] for b in cached[2]] == [99999999999999999999, 1]
+
+    def test_convert_unsupported_target(self, grammar_blt_file_withdrawn):
+        result = CliRunner().invoke(
+            app, ["convert", str(grammar_blt_file_withdrawn), "--to", "xml"]
+        )
+
+        assert result.exit_code == 1
+        assert "Unsupported conversion target" in result.output
@@ -0,0 +1,94 @@
+"""
+Tests for the inverted candidate index and preference profiles.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from fresh_blt.candidate_index import CandidateIndex
+from fresh_blt.columnar import BallotArrays
+from fresh_blt.fixtures.vectorized import generate_ballot_arrays
+from fresh_blt.models.candidate import Candidate
+from fresh_blt.parse import load_blt
+from fresh_blt.stats import compute_stats
+
+
+@pytest.fixture
+def election(grammar_blt_file_withdrawn):
+    _, candidates, ballots = load_blt(grammar_blt_file_withdrawn, use_cache=False)
+    return candidates, ballots
+
+
+class TestCandidateIndex:
+    """Test postings and profiles against the fixture election and a plain loop."""
+
+    def test_postings(self, election):
+        index = CandidateIndex.from_ballots(election[1], election[0])
+
+        ballots, levels = index.postings(1)
+
+        assert ballots.tolist() == [0, 1, 2, 4]
+        assert levels.tolist() == [0, 0, 1, 1]
+        assert [index.ranked_count(c.id) for c in election[0]] == [4, 4, 5, 4]
+
+    def test_profiles(self, election):
+        candidates, ballots = election
+
+        adam, basil, _, _ = CandidateIndex.from_ballots(ballots, candidates).profiles()
+
+        assert (adam.ballots, adam.weight) == (4, 11)
+        assert adam.level_ballots == [2, 2]
+        assert adam.level_weights == [7, 4]
+        assert adam.average_rank == pytest.approx(15 / 11)
+        assert basil.level_weights == [3, 0, 5]
+
+    def test_matches_loop_over_ballots(self):
+        candidates = [Candidate(id=i, name=f"Candidate {i}") for i in range(1, 9)]
+        arrays = generate_ballot_arrays(8, 2000, seed=3)
+        ballots = arrays.to_ballots({c.id: c for c in candidates})
+
+        profiles = CandidateIndex.from_arrays(arrays, candidates).profiles()
+
+        stats = compute_stats(candidates, ballots)
+        for profile in profiles:
+            expected: dict[int, int] = {}
+            for ballot in ballots:
+                for level, ranking in enumerate(ballot["rankings"]):
+                    if profile.candidate in ranking:
+                        expected[level] = expected.get(level, 0) + ballot["weight"]
+            assert dict(enumerate(profile.level_weights)) == {
+                level: expected.get(level, 0) for level in range(len(profile.level_weights))
+            }
+            assert profile.level_weights[0] == stats.first_preferences[profile.candidate.id]
+
+    def test_unranked_candidate(self):
+        candidates = [Candidate(id=1, name="A"), Candidate(id=2, name="B")]
+        ballots = [{"weight": 1, "rankings": [[candidates[0]]]}]
+
+        profile = CandidateIndex.from_ballots(ballots, candidates).profile(2)
+
+        assert (profile.ballots, profile.weight, profile.average_rank) == (0, 0, None)
+        assert profile.level_weights == []
+
+    def test_repeated_candidate_posts_first_level(self):
+        candidates = [Candidate(id=1, name="A"), Candidate(id=2, name="B")]
+        a, b = candidates
+        ballots = [{"weight": 1, "rankings": [[b], [a], [b]]}]
+
+        profile = CandidateIndex.from_ballots(ballots, candidates).profile(2)
+
+        assert (profile.ballots, profile.level_ballots) == (1, [1])
+
+    def test_weights_beyond_int64_sum(self):
+        arrays = BallotArrays(
+            weights=np.full(4, 2**62, dtype=np.int64),
+            level_offsets=np.arange(5, dtype=np.int64),
+            id_offsets=np.arange(5, dtype=np.int64),
+            candidate_ids=np.ones(4, dtype=np.int32),
+        )
+
+        profile = CandidateIndex.from_arrays(arrays, [Candidate(id=1, name="A")]).profile(1)
+
+        assert profile.weight == profile.level_weights[0] == 2**64
@@ -1,14 +1,19 @@
 from __future__ import annotations
 
 import json
+import os
+import subprocess
+import sys
 from pathlib import Path
 from unittest.mock import patch
 
 import pytest
 from typer.testing import CliRunner
 
+import fresh_blt
 from fresh_blt.cli import app, load_blt_data, main
 from fresh_blt.models.candidate import Candidate
+from fresh_blt.parse import load_blt
 
 
 @pytest.fixture
@@ -219,6 +224,23 @@ class TestStatsCommand:
         assert "Election Statistics" in result.output
         assert "Withdrawn: 0" in result.output
 
+    def test_stats_profiles(self, runner, grammar_blt_file_withdrawn):
+        result = runner.invoke(
+            app, ["stats", str(grammar_blt_file_withdrawn), "--profiles", "--profile-ranks", "2"]
+        )
+
+        assert result.exit_code == 0
+        assert "Preference Profiles" in result.output
+        assert "84.6%" in result.output  # Adam is ranked on ballots worth 11 of 13 votes
+        assert "1.36" in result.output
+
+    def test_stats_profiles_weight_beyond_int64(self, runner, huge_weight_blt_file):
+        result = runner.invoke(app, ["stats", str(huge_weight_blt_file), "--profiles"])
+
+        assert result.exit_code == 0
+        assert "Preference Profiles" in result.output
+        assert "Adam" in result.output
+
     def test_stats_invalid_file(self, runner, invalid_blt_file):
         """Test stats command with invalid file."""
         result = runner.invoke(app, ["stats", str(invalid_blt_file)])
@@ -227,6 +249,206 @@ class TestStatsCommand:
         assert "Error loading .blt file:" in result.output
 
 
+class TestWatchCommand:
+    """Test the watch command in --once mode."""
+
+    def test_watch_once(self, runner, grammar_blt_file_withdrawn, temp_dir):
+        """Test that a second run skips files exported by the first."""
+        contests = Path(temp_dir) / "contests"
+        contests.mkdir()
+        (contests / "a.blt").write_text(grammar_blt_file_withdrawn.read_text())
+        out = Path(temp_dir) / "out"
+        args = ["watch", str(contests), "--export", "csv", "--out", str(out), "--once"]
+
+        first = runner.invoke(app, [*args, "--workers", "1"])
+        second = runner.invoke(app, [*args, "--workers", "1"])
+
+        assert first.exit_code == 0
+        assert "Exported a.blt" in first.output
+        assert (out / "a_ballots.csv").exists()
+        assert second.exit_code == 0
+        assert "Processed 0 changed files" in second.output
+
+
+class TestGenerateCommand:
+    """Test the generate command."""
+
+    def test_generate(self, runner, temp_dir):
+        out = Path(temp_dir) / "corpus"
+        args = ["generate", "--count", "2", "--ballots", "50", "--candidates", "4"]
+
+        result = runner.invoke(app, [*args, "--seed", "1", "--out", str(out), "--workers", "1"])
+
+        assert result.exit_code == 0
+        assert "Generated 2 files" in result.output
+        info, candidates, ballots = load_blt(out / "election_2.blt", use_cache=False)
+        assert len(candidates) == 4
+        assert len(ballots) == 50
+
+    def test_generate_with_model(self, runner, temp_dir):
+        args = ["generate", "--ballots", "200", "--model", "spatial-1d", "--out", temp_dir]
+
+        result = runner.invoke(app, [*args, "--workers", "1"])
+
+        assert result.exit_code == 0
+        assert (
+            load_blt(Path(temp_dir) / "election_1.blt", use_cache=False)[0]["total_ballots"] == 200
+        )
+
+    def test_generate_unknown_model(self, runner, temp_dir):
+        result = runner.invoke(app, ["generate", "--out", temp_dir, "--model", "zipf"])
+
+        assert result.exit_code == 1
+        assert "Unknown preference model" in result.output
+
+    def test_generate_bad_compression(self, runner, temp_dir):
+        result = runner.invoke(app, ["generate", "--out", temp_dir, "--compress", "rar"])
+
+        assert result.exit_code == 1
+        assert "Unsupported compression" in result.output
+
+
+class TestQueryCommand:
+    """Test the query command."""
+
+    def test_query(self, runner, grammar_blt_file_withdrawn):
+        result = runner.invoke(
+            app, ["query", str(grammar_blt_file_withdrawn), "Adam > Basil", "#3 in top 1"]
+        )
+
+        assert result.exit_code == 0
+        assert "Adam > Basil" in result.output
+        assert "69.2%" in result.output  # weight 9 of 13
+
+    def test_query_json(self, runner, grammar_blt_file_withdrawn):
+        result = runner.invoke(
+            app, ["query", str(grammar_blt_file_withdrawn), "not Adam", "--json"]
+        )
+
+        assert result.exit_code == 0
+        (report,) = json.loads(result.output)
+        assert (report["ballots"], report["weight"], report["total_weight"]) == (2, 2, 13)
+
+    def test_query_weight_beyond_int64(self, runner, huge_weight_blt_file):
+        result = runner.invoke(app, ["query", str(huge_weight_blt_file), "Adam > Basil", "--json"])
+
+        assert result.exit_code == 0
+        (report,) = json.loads(result.output)
+        assert report["weight"] == 99999999999999999999
+        assert report["total_weight"] == 100000000000000000000
+
+    def test_query_with_markup_is_shown_verbatim(self, runner, temp_dir):
+        blt_file = temp_dir / "markup.blt"
+        blt_file.write_text('2 1\n1 1 2 0\n0\n"[bold]Adam"\n"Basil"\n"Title"\n')
+
+        result = runner.invoke(app, ["query", str(blt_file), '"[bold]Adam" > Basil'])
+
+        assert result.exit_code == 0
+        assert '"[bold]Adam" > Basil' in result.output
+
+    def test_query_unknown_candidate(self, runner, grammar_blt_file_withdrawn):
+        result = runner.invoke(app, ["query", str(grammar_blt_file_withdrawn), "Zed > Adam"])
+
+        assert result.exit_code == 1
+        assert "No candidate matches 'Zed'" in result.output
+
+
+class TestBenchCommand:
+    """Test the bench command."""
+
+    def test_bench_json(self, runner):
+        result = runner.invoke(
+            app, ["bench", "--ballots", "2e2", "--candidates", "3", "--max-workers", "1", "--json"]
+        )
+
+        assert result.exit_code == 0
+        report = json.loads(result.stdout)
+        assert report["ballots"] == 200
+        assert report["recommended_workers"] == 1
+
+    def test_bench_invalid_ballots(self, runner):
+        result = runner.invoke(app, ["bench", "--ballots", "lots"])
+
+        assert result.exit_code == 1
+        assert "--ballots must be a positive number" in result.output
+
+
+class TestGlobalOptions:
+    """Test the --timings and --profile options."""
+
+    def test_timings_prints_stages(self, runner, grammar_blt_file_withdrawn):
+        """Test that --timings reports each stage on stderr."""
+        result = runner.invoke(app, ["--timings", "stats", str(grammar_blt_file_withdrawn)])
+
+        assert result.exit_code == 0
+        assert "Stage Timings" in result.stderr
+        assert "parse_ballots" in result.stderr
+        assert "compute_stats" in result.stderr
+        assert "Stage Timings" not in result.stdout
+
+    def test_profile_writes_stats(self, runner, grammar_blt_file_withdrawn, temp_dir):
+        """Test that --profile writes a pstats file covering the command."""
+        import io
+        import pstats
+
+        profile_path = Path(temp_dir) / "out.pstats"
+        result = runner.invoke(
+            app, ["--profile", str(profile_path), "info", str(grammar_blt_file_withdrawn)]
+        )
+
+        assert result.exit_code == 0
+        output = io.StringIO()
+        pstats.Stats(str(profile_path), stream=output).print_stats()
+        assert "(load_blt_metadata)" in output.getvalue()
+
+
+class TestReportCommand:
+    """Test the report command."""
+
+    def test_report_shows_all_sections(self, runner, grammar_blt_file_withdrawn):
+        """Test that report prints info, candidates and statistics."""
+        result = runner.invoke(app, ["report", str(grammar_blt_file_withdrawn)])
+
+        assert result.exit_code == 0
+        assert "Election Title:" in result.output
+        assert "Candidates" in result.output
+        assert "First Preferences:" in result.output
+        assert "Adam: 7 votes (53.8%)" in result.output
+        assert "Ballots with ties: 2" in result.output
+        assert "Longest ranking: 3 preferences" in result.output
+
+    def test_report_parses_once_and_exports(self, runner, grammar_blt_file_withdrawn, temp_dir):
+        """Test that report loads the file once for all outputs and exports."""
+        output = Path(temp_dir) / "nightly"
+
+        with patch("fresh_blt.cli.load_blt", wraps=load_blt) as mock_load:
+            result = runner.invoke(
+                app,
+                [
+                    "report",
+                    str(grammar_blt_file_withdrawn),
+                    "-f",
+                    "json",
+                    "-f",
+                    "csv",
+                    "-o",
+                    str(output),
+                ],
+            )
+
+        assert result.exit_code == 0
+        mock_load.assert_called_once()
+        assert (Path(temp_dir) / "nightly.json").exists()
+        assert (Path(temp_dir) / "nightly_ballots.csv").exists()
+
+    def test_report_format_requires_output(self, runner, grammar_blt_file_withdrawn):
+        """Test that exporting from report needs an output prefix."""
+        result = runner.invoke(app, ["report", str(grammar_blt_file_withdrawn), "-f", "json"])
+
+        assert result.exit_code == 1
+        assert "--output is required" in result.output
+
+
 class TestExportCommand:
     """Test the export command."""
 
@@ -268,6 +490,31 @@ class TestExportCommand:
         assert candidates_file.exists()
         assert ballots_file.exists()
 
+    def test_export_blt_canonicalized(self, runner, temp_dir):
+        """Test export command with BLT format and canonicalization."""
+        blt_file = temp_dir / "unsorted.blt"
+        blt_file.write_text('3 1\n2 2=1 3 0\n1 3 0\n1 1=2 3 0\n4 3 0\n0\n"A"\n"B"\n"C"\n"Title"\n')
+        output_file = temp_dir / "export.blt"
+
+        result = runner.invoke(
+            app,
+            [
+                "export",
+                str(blt_file),
+                "--output",
+                str(output_file),
+                "--format",
+                "blt",
+                "--canonicalize",
+            ],
+        )
+
+        assert result.exit_code == 0
+        # Ties ordered by ID, equal rankings merged, ballots sorted by ranking.
+        lines = output_file.read_text().splitlines()
+        assert lines[:4] == ["3 1", "3 1=2 3 0", "5 3 0", "0"]
+        assert load_blt_data(output_file)[0]["total_votes"] == 8
+
     def test_export_unsupported_format(self, runner, valid_blt_file, temp_dir):
         """Test export command with unsupported format."""
         output_file = temp_dir / "export.txt"
@@ -365,6 +612,45 @@ class TestCliEntryPoint:
         assert "No such command" in result.output
 
 
+class TestColdStart:
+    """Test that CLI start-up only imports what the command needs."""
+
+    HEAVY_MODULES = ("pandas", "faker", "numpy", "lark")
+
+    # Runs the code given in argv[1] in a fresh interpreter, then prints the heavy
+    # modules it imported.
+    SNIPPET = """
+import sys
+exec(sys.argv[1])
+print("heavy:" + ",".join(name for name in {modules!r} if name in sys.modules))
+"""
+
+    def _heavy_imports(self, code: str) -> list[str]:
+        env = {**os.environ, "PYTHONPATH": str(Path(fresh_blt.__file__).parents[1])}
+        result = subprocess.run(
+            [sys.executable, "-c", self.SNIPPET.format(modules=self.HEAVY_MODULES), code],
+            capture_output=True,
+            text=True,
+            env=env,
+            check=True,
+        )
+        heavy = result.stdout.rpartition("heavy:")[2].strip()
+        return heavy.split(",") if heavy else []
+
+    def test_cli_import_skips_heavy_imports(self):
+        """Test that importing the CLI does not import pandas, Faker, NumPy or Lark."""
+        assert self._heavy_imports("import fresh_blt.cli") == []
+
+    def test_info_skips_heavy_imports(self, valid_blt_file):
+        """Test that info does not import pandas, Faker, NumPy or Lark."""
+        code = (
+            "from fresh_blt.cli import app\n"
+            f"app(['info', {str(valid_blt_file)!r}], standalone_mode=False)"
+        )
+
+        assert self._heavy_imports(code) == []
+
+
 class TestErrorHandling:
     """Test comprehensive error handling scenarios."""
 
@@ -0,0 +1,130 @@
+"""
+Tests for compressed .blt input and compressed export output.
+"""
+
+from __future__ import annotations
+
+import gzip
+import json
+import time
+
+import pytest
+from typer.testing import CliRunner
+
+from fresh_blt.batch import contest_name, find_blt_files
+from fresh_blt.cli import app, load_blt_data
+from fresh_blt.compression import (
+    COMPRESSIONS,
+    compressed_path,
+    detect_compression,
+    open_stream,
+    read_blt_text,
+)
+from fresh_blt.export import export_to_csv, export_to_json, write_blt
+
+
+def _available_compressions() -> list[str]:
+    try:
+        import zstandard  # noqa: F401
+    except ImportError:
+        return [c for c in COMPRESSIONS if c != "zstd"]
+    return list(COMPRESSIONS)
+
+
+class TestCompressedInput:
+    """Test reading compressed .blt files."""
+
+    def test_read_each_compression(self, grammar_blt_content_withdrawn, tmp_path):
+        for compression in _available_compressions():
+            path = compressed_path(tmp_path / "election.blt", compression)
+            with open_stream(path, "wt", compression, encoding="utf-8") as f:
+                f.write(grammar_blt_content_withdrawn)
+
+            assert detect_compression(path) == compression
+            assert read_blt_text(path) == grammar_blt_content_withdrawn
+
+    def test_detects_by_magic_bytes_not_suffix(self, grammar_blt_content_withdrawn, tmp_path):
+        path = tmp_path / "misnamed.blt"
+        path.write_bytes(gzip.compress(grammar_blt_content_withdrawn.encode()))
+
+        blt_data, candidates, ballots = load_blt_data(path)
+
+        assert blt_data["title"] == "Cool Election"
+        assert len(ballots) == 6
+
+    def test_plain_file_is_not_compressed(self, grammar_blt_file_withdrawn):
+        assert detect_compression(grammar_blt_file_withdrawn) is None
+
+    def test_compressed_contests_found_in_batch(self, grammar_blt_content_withdrawn, tmp_path):
+        (tmp_path / "a.blt.gz").write_bytes(gzip.compress(grammar_blt_content_withdrawn.encode()))
+        (tmp_path / "b.blt").write_text(grammar_blt_content_withdrawn)
+
+        sources = find_blt_files(tmp_path)
+
+        assert [p.name for p in sources] == ["a.blt.gz", "b.blt"]
+        assert [contest_name(p) for p in sources] == ["a", "b"]
+
+
+class TestCompressedOutput:
+    """Test writing compressed exports."""
+
+    def test_compressed_json(self, grammar_blt_file_withdrawn, tmp_path):
+        loaded = load_blt_data(grammar_blt_file_withdrawn)
+
+        for compression in _available_compressions():
+            path = export_to_json(*loaded, tmp_path / "out.json", compression=compression)
+
+            assert path == compressed_path(tmp_path / "out.json", compression)
+            with open_stream(path, "rb", detect_compression(path)) as f:
+                assert json.load(f)["election_info"]["title"] == "Cool Election"
+
+    def test_compressed_blt_round_trips(self, grammar_blt_file_withdrawn, tmp_path):
+        loaded = load_blt_data(grammar_blt_file_withdrawn)
+
+        path = write_blt(*loaded, tmp_path / "out.blt", compression="xz")
+
+        assert path.name == "out.blt.xz"
+        assert load_blt_data(path) == loaded
+
+    def test_compressed_csv(self, grammar_blt_file_withdrawn, tmp_path):
+        files = export_to_csv(
+            *load_blt_data(grammar_blt_file_withdrawn), tmp_path / "out", compression="bz2"
+        )
+
+        assert [f.name for f in files] == [
+            "out_election.csv.bz2",
+            "out_candidates.csv.bz2",
+            "out_ballots.csv.bz2",
+        ]
+        with open_stream(files[1], "rt", "bz2", encoding="utf-8") as f:
+            assert f.read().splitlines()[:2] == ["id,name,withdrawn", "1,Adam,False"]
+
+    def test_gzip_output_is_reproducible(self, tmp_path, monkeypatch):
+        outputs = []
+        for clock, name in ((1_000_000_000, "a.blt.gz"), (2_000_000_000, "b.blt.gz")):
+            monkeypatch.setattr(time, "time", lambda clock=clock: clock)
+            with open_stream(tmp_path / name, "wt", "gzip", encoding="utf-8") as f:
+                f.write("2 1\n1 1 0\n0\n")
+            outputs.append((tmp_path / name).read_bytes())
+
+        assert outputs[0] == outputs[1]
+        assert outputs[0][4:8] == b"\x00\x00\x00\x00"  # header mtime
+        assert gzip.decompress(outputs[0]) == b"2 1\n1 1 0\n0\n"
+
+    def test_suffix_not_duplicated(self, tmp_path):
+        assert compressed_path(tmp_path / "a.json.gz", "gzip").name == "a.json.gz"
+
+    def test_unknown_compression(self, tmp_path):
+        with pytest.raises(ValueError, match="Unsupported compression"):
+            compressed_path(tmp_path / "a.json", "rar")
+
+    def test_export_command_compress(self, grammar_blt_file_withdrawn, tmp_path):
+        output = tmp_path / "out.json"
+
+        result = CliRunner().invoke(
+            app,
+            ["export", str(grammar_blt_file_withdrawn), "-o", str(output), "--compress", "gzip"],
+        )
+
+        assert result.exit_code == 0
+        assert json.loads(gzip.decompress((tmp_path / "out.json.gz").read_bytes()))
@@ -11,7 +11,10 @@ from pathlib import Path
 
 import pytest
 
+from fresh_blt.cli import load_blt_data
+from fresh_blt.columnar import BallotArrays
 from fresh_blt.export import (
+    canonicalize_ballots,
     create_ballots_dataframe,
     create_candidates_dataframe,
     create_election_dataframe,
@@ -19,7 +22,10 @@ from fresh_blt.export import (
     export_to_dataframes,
     export_to_json,
     export_with_format,
+    write_blt,
+    write_blt_stream,
 )
+from fresh_blt.models.candidate import Candidate
 
 
 class TestDataFrameCreation:
@@ -406,3 +412,155 @@ class TestExportWithFormat:
                 export_with_format(
                     election_data, sample_election.candidates, ballots, output_path, "xml"
                 )
+
+
+class TestBLTExport:
+    """Test cases for the .blt writer."""
+
+    def test_write_blt_round_trips(self, grammar_blt_file_withdrawn, tmp_path):
+        """Test that a written file parses back to identical data, ties included."""
+        original = load_blt_data(grammar_blt_file_withdrawn)
+        output_path = tmp_path / "round_trip.blt"
+
+        write_blt(*original, output_path)
+
+        assert load_blt_data(output_path) == original
+        ballots = load_blt_data(output_path)[2]
+        assert [[c.id for c in level] for level in ballots[4]["rankings"]] == [[2, 4, 3], [1]]
+
+    def test_write_blt_output_format(self, grammar_blt_file_withdrawn, tmp_path):
+        """Test the exact text layout of the written file."""
+        output_path = tmp_path / "out.blt"
+
+        write_blt(*load_blt_data(grammar_blt_file_withdrawn), output_path)
+
+        lines = output_path.read_text().splitlines()
+        assert lines[:3] == ["4 2", "-2", "3 1 3 4 0"]
+        assert lines[6] == "2 2=4=3 1 0"
+        assert lines[-6:] == [
+            "0",
+            '"Adam"',
+            '"Basil"',
+            '"Charlotte"',
+            '"Donald"',
+            '"Cool Election"',
+        ]
+
+    def test_write_blt_canonicalized_round_trips(self, grammar_blt_file_withdrawn, tmp_path):
+        """Test that canonicalized output still parses and preserves total weight."""
+        info, candidates, ballots = load_blt_data(grammar_blt_file_withdrawn)
+        output_path = tmp_path / "canonical.blt"
+
+        write_blt(
+            info,
+            candidates,
+            list(ballots) + list(ballots),
+            output_path,
+            aggregate=True,
+            sort_ballots=True,
+            normalize_ties=True,
+        )
+
+        reloaded_info, _, reloaded_ballots = load_blt_data(output_path)
+        assert reloaded_info["total_ballots"] == len(ballots)
+        assert reloaded_info["total_votes"] == 2 * info["total_votes"]
+        assert "2 2 0" in output_path.read_text().splitlines()
+        assert [[c.id for c in level] for level in reloaded_ballots[3]["rankings"]] == [
+            [2, 3, 4],
+            [1],
+        ]
+
+    def test_write_blt_rejects_unrepresentable_names(self, grammar_blt_file_withdrawn, tmp_path):
+        """Test that names .blt cannot quote raise instead of silently corrupting the file."""
+        info, candidates, ballots = load_blt_data(grammar_blt_file_withdrawn)
+        candidates[0] = Candidate(id=1, name="Adam\nCocks")
+
+        with pytest.raises(ValueError, match="Cannot write name"):
+            write_blt(info, candidates, ballots, tmp_path / "bad.blt")
+
+    def test_write_blt_round_trips_escaped_names(self, grammar_blt_content_withdrawn, tmp_path):
+        """Test that escaped quotes and backslashes in names survive a round trip."""
+        source = tmp_path / "escaped.blt"
+        source.write_text(
+            grammar_blt_content_withdrawn.replace('"Adam"', '"Adam \\"The Axe\\" Cocks"')
+            .replace('"Basil"', '"C:\\\\Basil\\\\"')
+            .replace('"Cool Election"', '"Cool \\"Election\\""')
+        )
+        info, candidates, ballots = load_blt_data(source)
+        output_path = tmp_path / "round_trip.blt"
+
+        write_blt(info, candidates, ballots, output_path)
+
+        assert [c.name for c in candidates[:2]] == ['Adam "The Axe" Cocks', "C:\\Basil\\"]
+        assert info["title"] == 'Cool "Election"'
+        assert output_path.read_text() == source.read_text()
+        assert load_blt_data(output_path) == (info, candidates, ballots)
+
+    def test_write_blt_stream_round_trips(self, grammar_blt_file_withdrawn, tmp_path):
+        """Test that ballots streamed in batches parse back to the same data."""
+        info, candidates, ballots = load_blt_data(grammar_blt_file_withdrawn)
+        batches = [BallotArrays.from_ballots(ballots[:4]), BallotArrays.from_ballots(ballots[4:])]
+
+        output_path = write_blt_stream(
+            tmp_path / "streamed.blt",
+            info["title"],
+            [c.name for c in candidates],
+            iter(batches),
+            num_positions=info["num_positions"],
+            withdrawn_candidate_ids=info["withdrawn_candidate_ids"],
+            compression="gzip",
+        )
+
+        assert output_path.name == "streamed.blt.gz"
+        assert load_blt_data(output_path) == (info, candidates, ballots)
+
+    def test_write_blt_stream_output_format(self, grammar_blt_file_withdrawn, tmp_path):
+        """Test that streamed output matches write_blt byte for byte."""
+        original = load_blt_data(grammar_blt_file_withdrawn)
+        info, candidates, ballots = original
+
+        write_blt(*original, tmp_path / "list.blt")
+        write_blt_stream(
+            tmp_path / "stream.blt",
+            info["title"],
+            [c.name for c in candidates],
+            [BallotArrays.from_ballots(ballots)],
+            num_positions=info["num_positions"],
+            withdrawn_candidate_ids=info["withdrawn_candidate_ids"],
+        )
+
+        assert (tmp_path / "stream.blt").read_text() == (tmp_path / "list.blt").read_text()
+
+
+class TestCanonicalizeBallots:
+    """Test cases for ballot canonicalization."""
+
+    def test_aggregate_merges_equal_ties(self):
+        """Test that tie order only matters for aggregation when ties are not normalized."""
+        alice = Candidate(id=1, name="Alice")
+        bob = Candidate(id=2, name="Bob")
+        ballots = [
+            {"weight": 1, "rankings": [[alice, bob]]},
+            {"weight": 2, "rankings": [[bob, alice]]},
+        ]
+
+        assert len(canonicalize_ballots(ballots, aggregate=True)) == 2
+
+        merged = canonicalize_ballots(ballots, aggregate=True, normalize_ties=True)
+        assert merged == [{"weight": 3, "rankings": [[alice, bob]]}]
+        assert ballots[0]["weight"] == 1
+
+    def test_sort_orders_by_rankings_then_weight(self):
+        """Test canonical ballot ordering."""
+        alice = Candidate(id=1, name="Alice")
+        bob = Candidate(id=2, name="Bob")
+        ballots = [
+            {"weight": 1, "rankings": [[bob]]},
+            {"weight": 1, "rankings": [[alice], [bob]]},
+            {"weight": 5, "rankings": [[alice], [bob]]},
+        ]
+
+        result = canonicalize_ballots(ballots, sort_ballots=True)
+
+        assert [b["weight"] for b in result] == [5, 1, 1]
+        assert result[2]["rankings"] == [[bob]]
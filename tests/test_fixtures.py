@@ -0,0 +1,338 @@
+"""
+Tests for the vectorized election generators.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any, cast
+
+import numpy as np
+import pytest
+
+from fresh_blt.fixtures.preferences import (
+    Mallows,
+    PlackettLuce,
+    PreferenceModel,
+    Spatial,
+    Uniform,
+)
+from fresh_blt.fixtures.vectorized import (
+    BATCH_CELLS,
+    DEFAULT_BATCH_SIZE,
+    default_batch_size,
+    generate_ballot_arrays,
+    iter_ballot_arrays,
+)
+from fresh_blt.parse import load_blt
+
+
+def ballots_as_lists(arrays):
+    ids = arrays.candidate_ids.tolist()
+    id_offsets = arrays.id_offsets.tolist()
+    level_offsets = arrays.level_offsets.tolist()
+    return [
+        [
+            ids[id_offsets[j] : id_offsets[j + 1]]
+            for j in range(level_offsets[i], level_offsets[i + 1])
+        ]
+        for i in range(len(arrays))
+    ]
+
+
+class TestVectorizedGenerator:
+    """Test the NumPy ballot generator against the BLTProvider.ballot distributions."""
+
+    def test_ballots_are_well_formed(self):
+        arrays = generate_ballot_arrays(6, 2000, seed=1)
+
+        assert len(arrays) == 2000
+        for rankings in ballots_as_lists(arrays):
+            ranked = [cid for level in rankings for cid in level]
+            assert 1 <= len(ranked) <= 6
+            assert len(set(ranked)) == len(ranked)
+            assert set(ranked) <= set(range(1, 7))
+            assert all(1 <= len(level) <= 3 for level in rankings)
+        assert set(arrays.weights.tolist()) <= set(range(1, 11))
+
+    def test_statistical_knobs(self):
+        arrays = generate_ballot_arrays(8, 100_000, seed=2)
+        ranked_counts = np.add.reduceat(np.diff(arrays.id_offsets), arrays.level_offsets[:-1])
+
+        assert (ranked_counts == 8).mean() == pytest.approx(0.7, abs=0.01)
+        assert (arrays.weights > 1).mean() == pytest.approx(0.15, abs=0.01)
+        # A tie starts at 30% of the levels that have more than one candidate left.
+        ballots = ballots_as_lists(arrays)[:20_000]
+        starts = ties = 0
+        for rankings in ballots:
+            remaining = sum(len(level) for level in rankings)
+            for level in rankings:
+                if remaining > 1:
+                    starts += 1
+                    ties += len(level) > 1
+                remaining -= len(level)
+        assert ties / starts == pytest.approx(0.3, abs=0.01)
+
+    def test_seed_is_reproducible(self):
+        first = generate_ballot_arrays(5, 1000, seed=7)
+        second = generate_ballot_arrays(5, 1000, seed=7)
+        other = generate_ballot_arrays(5, 1000, seed=8)
+
+        assert ballots_as_lists(first) == ballots_as_lists(second)
+        assert np.array_equal(first.weights, second.weights)
+        assert ballots_as_lists(first) != ballots_as_lists(other)
+
+    def test_batches_bound_memory(self):
+        batches = list(iter_ballot_arrays(4, 2500, seed=3, batch_size=1000))
+
+        assert [len(batch) for batch in batches] == [1000, 1000, 500]
+
+    def test_default_batches_shrink_with_candidates(self):
+        few = default_batch_size(10)
+        many = default_batch_size(500)
+
+        assert few == DEFAULT_BATCH_SIZE
+        assert many * 500 <= BATCH_CELLS < (many + 1) * 500
+        assert len(next(iter_ballot_arrays(500, many + 1, seed=1))) == many
+
+    def test_no_candidates(self):
+        arrays = generate_ballot_arrays(0, 3, seed=1)
+
+        assert ballots_as_lists(arrays) == [[], [], []]
+
+    def test_fast_election_round_trips(self, faker, tmp_path):
+        election = faker.fast_election(num_candidates=5, num_ballots=300)
+        path = tmp_path / "fast.blt"
+        path.write_text(faker.blt_content(election))
+
+        info, candidates, ballots = load_blt(path, use_cache=False)
+
+        assert info["total_ballots"] == 300
+        assert [c.name for c in candidates] == [c["name"] for c in election["candidates"]]
+        assert [[[c.id for c in level] for level in b["rankings"]] for b in ballots] == [
+            [[c["id"] for c in level] for level in b["rankings"]] for b in election["ballots"]
+        ]
+
+
+def duplicate_rate(arrays):
+    rankings = [tuple(map(tuple, ballot)) for ballot in ballots_as_lists(arrays)]
+    return 1 - len(set(rankings)) / len(rankings)
+
+
+class TestPreferenceModels:
+    """Test the vectorized preference models."""
+
+    def test_base_model_is_abstract(self):
+        with pytest.raises(TypeError):
+            cast(Any, PreferenceModel)()
+
+    @pytest.mark.parametrize(
+        "model", [Uniform(), Mallows(0.7), PlackettLuce(), Spatial(1), Spatial(2)]
+    )
+    def test_orders_are_permutations(self, model):
+        orders = model.sampler(np.random.default_rng(1), 30)(500)
+
+        assert orders.shape == (500, 30)
+        assert (np.sort(orders, axis=1) == np.arange(1, 31)).all()
+
+    def test_default_model_is_uniform(self):
+        default = generate_ballot_arrays(5, 300, seed=2)
+        uniform = generate_ballot_arrays(5, 300, seed=2, model=Uniform())
+
+        assert ballots_as_lists(default) == ballots_as_lists(uniform)
+
+    def test_mallows_dispersion(self):
+        reference = [3, 1, 4, 2]
+        exact = Mallows(0, reference).sampler(np.random.default_rng(1), 4)(50)
+        orders = Mallows(0.5).sampler(np.random.default_rng(1), 4)(100_000)
+        identity = (orders == [1, 2, 3, 4]).all(axis=1).mean()
+        one_swap = (orders == [2, 1, 3, 4]).all(axis=1).mean()
+
+        assert (exact == reference).all()
+        # Each adjacent swap costs one factor of the dispersion.
+        assert one_swap / identity == pytest.approx(0.5, rel=0.1)
+
+    def test_plackett_luce_first_choices_follow_support(self):
+        orders = PlackettLuce([6, 3, 1]).sampler(np.random.default_rng(1), 3)(100_000)
+        first = np.bincount(orders[:, 0], minlength=4)[1:] / len(orders)
+
+        assert first == pytest.approx([0.6, 0.3, 0.1], abs=0.01)
+
+    def test_spatial_1d_limits_orderings(self):
+        orders = Spatial(1).sampler(np.random.default_rng(1), 6)(5000)
+
+        # Distances along a line allow at most C(6, 2) + 1 distinct orderings.
+        assert len({tuple(order) for order in orders.tolist()}) <= 16
+
+    def test_models_repeat_more_than_uniform(self):
+        uniform = generate_ballot_arrays(8, 5000, seed=1, model=Uniform())
+        for model in (Mallows(0.3), PlackettLuce((0.5 ** np.arange(8)).tolist()), Spatial(2)):
+            arrays = generate_ballot_arrays(8, 5000, seed=1, model=model)
+            assert duplicate_rate(arrays) > duplicate_rate(uniform) + 0.05
+
+    def test_spatial_positions_fixed_across_batches(self):
+        batches = iter_ballot_arrays(
+            3, 4000, seed=1, full_ranking_rate=1, tie_rate=0, batch_size=1000, model=Spatial(1)
+        )
+        orders = {tuple(map(tuple, b)) for batch in batches for b in ballots_as_lists(batch)}
+
+        # Three candidates on a line admit 4 orderings; redrawing positions per batch
+        # would allow all 6.
+        assert len(orders) <= 4
+
+    def test_invalid_parameters(self):
+        rng = np.random.default_rng(1)
+        with pytest.raises(ValueError, match="dispersion"):
+            Mallows(1.5)
+        with pytest.raises(ValueError, match="reference"):
+            Mallows(0.5, [1, 1, 2]).sampler(rng, 3)
+        with pytest.raises(ValueError, match="support"):
+            PlackettLuce([1, 0, 2]).sampler(rng, 3)
+        with pytest.raises(ValueError, match="positions"):
+            Spatial(2, [[0, 0]]).sampler(rng, 3)
+
+
+class TestStreamBltFile:
+    """Test generating .blt files batch by batch."""
+
+    def test_stream_blt_file_parses(self, faker, tmp_path):
+        path = faker.stream_blt_file(
+            tmp_path / "stream.blt", num_candidates=6, num_ballots=2500, batch_size=1000
+        )
+
+        info, candidates, ballots = load_blt(path, use_cache=False)
+
+        assert info["num_candidates"] == 6
+        assert info["total_ballots"] == 2500
+        assert len(candidates) == 6
+        assert all(1 <= sum(len(level) for level in b["rankings"]) <= 6 for b in ballots)
+
+    def test_stream_blt_file_is_reproducible(self, tmp_path):
+        from faker import Faker
+
+        from fresh_blt.fixtures import BLTProvider
+
+        contents = []
+        for name in ("a.blt", "b.blt"):
+            fake = Faker()
+            fake.seed_instance(5)
+            fake.add_provider(BLTProvider)
+            contents.append(fake.stream_blt_file(tmp_path / name, 4, 300).read_bytes())
+
+        assert contents[0] == contents[1]
+
+
+class TestBatchGenerate:
+    """Test seeded, parallel batch generation."""
+
+    @pytest.mark.parametrize("model", [None, Uniform()])
+    @pytest.mark.parametrize("compression", [None, "gzip"])
+    def test_output_independent_of_worker_count(self, tmp_path, compression, model):
+        from fresh_blt.fixtures import BLTGenerators
+
+        suffix = ".gz" if compression else ""
+        contents = []
+        for workers in (1, 2):
+            out = tmp_path / str(workers)
+            out.mkdir()
+            paths = BLTGenerators(seed=11).batch_generate(
+                4,
+                str(out / "e_{}.blt"),
+                num_candidates=5,
+                num_ballots=200,
+                workers=workers,
+                compression=compression,
+                model=model,
+            )
+            assert paths == [str(out / f"e_{i}.blt{suffix}") for i in range(1, 5)]
+            contents.append([Path(path).read_bytes() for path in paths])
+
+        assert contents[0] == contents[1]
+        assert len(set(contents[0])) == 4
+
+    def test_seed_is_respected(self, tmp_path):
+        from fresh_blt.fixtures import BLTGenerators
+
+        def generate(seed, name):
+            (path,) = BLTGenerators(seed=seed).batch_generate(1, str(tmp_path / name), workers=1)
+            return Path(path).read_bytes()
+
+        assert generate(3, "a_{}.blt") == generate(3, "b_{}.blt")
+        assert generate(3, "c_{}.blt") != generate(4, "d_{}.blt")
+        assert BLTGenerators(seed=3).small_election() == BLTGenerators(seed=3).small_election()
+
+    def test_defaults_match_parallel_output(self, tmp_path):
+        from fresh_blt.fixtures import BLTGenerators
+
+        default = BLTGenerators(seed=7).batch_generate(3, str(tmp_path / "a_{}.blt"))
+        parallel = BLTGenerators(seed=7).batch_generate(3, str(tmp_path / "b_{}.blt"), workers=2)
+
+        assert [Path(p).read_bytes() for p in default] == [Path(p).read_bytes() for p in parallel]
+
+    def test_custom_faker(self, tmp_path):
+        from faker import Faker
+
+        from fresh_blt.fixtures import BLTGenerators, BLTProvider
+
+        def custom_faker():
+            faker = Faker("de_DE")
+            faker.add_provider(BLTProvider)
+            return faker
+
+        (path,) = BLTGenerators(custom_faker(), seed=2).batch_generate(1, str(tmp_path / "{}.blt"))
+        faker = custom_faker()
+        faker.seed_instance(2)
+
+        assert Path(path).read_text(encoding="utf-8") == faker.blt_content(faker.election())
+        with pytest.raises(ValueError, match="cannot use the faker"):
+            BLTGenerators(custom_faker()).batch_generate(2, str(tmp_path / "{}.blt"), workers=2)
+
+    def test_pattern_needs_placeholder(self, tmp_path):
+        from fresh_blt.fixtures import BLTGenerators
+
+        with pytest.raises(ValueError, match="needs a"):
+            BLTGenerators(seed=1).batch_generate(2, str(tmp_path / "same.blt"))
+
+
+class TestStressCorpus:
+    """Test that the adversarial stress corpora are valid and parse back intact."""
+
+    def test_extremes_round_trip(self, tmp_path):
+        from fresh_blt.fixtures.stress import stress_name, write_stress_blt
+
+        path = write_stress_blt(
+            tmp_path / "stress.blt",
+            num_candidates=60,
+            num_ballots=300,
+            max_depth=60,
+            tie_heavy_rate=0.5,
+            name_length=200,
+            max_weight=2**53,
+            withdrawn_rate=0.5,
+            line_ending="\r\n",
+            seed=5,
+        )
+        info, candidates, ballots = load_blt(path, use_cache=False)
+
+        rng = np.random.default_rng(5)
+        assert [c.name for c in candidates] == [stress_name(rng, i, 200) for i in range(1, 61)]
+        assert 0 < len(info["withdrawn_candidate_ids"]) < 60
+        assert len(ballots) == 300
+        assert max(ballot["weight"] for ballot in ballots) > 2**32
+        assert max(len(level) for ballot in ballots for level in ballot["rankings"]) >= 15
+        assert max(len(ballot["rankings"]) for ballot in ballots) > 30
+        assert path.read_bytes().count(b"\n") == path.read_bytes().count(b"\r\n")
+
+    def test_profiles_are_seeded(self, tmp_path):
+        from fresh_blt.fixtures.stress import write_stress_profile
+
+        first = write_stress_profile(tmp_path / "a.blt", "crlf", seed=1).read_bytes()
+        second = write_stress_profile(tmp_path / "b.blt", "crlf", seed=1).read_bytes()
+
+        assert first == second
+
+    def test_unknown_profile(self, tmp_path):
+        from fresh_blt.fixtures.stress import write_stress_profile
+
+        with pytest.raises(ValueError, match="Unknown stress profile"):
+            write_stress_profile(tmp_path / "x.blt", "nonsense")
@@ -6,9 +6,9 @@ organized by component using test classes for better maintainability and structu
 """
 
 import pytest
-from lark import ParseTree, UnexpectedInput
+from lark import ParseTree, Tree, UnexpectedInput
 
-from fresh_blt.grammar import blt_parser
+from fresh_blt.grammar import blt_parser, build_blt_parser, grammar_cache_path
 
 
 class TestGrammarParser:
@@ -203,6 +203,11 @@ class TestGrammarErrorHandling:
         with pytest.raises(UnexpectedInput):
             blt_parser.parse('1 1\n-1 1 0\n0\n"Candidate"\n"Test"')
 
+    def test_grammar_positive_withdrawn_entry_rejected(self):
+        """Test that withdrawn candidates must be written as negative IDs."""
+        with pytest.raises(UnexpectedInput):
+            blt_parser.parse('2 1\n2\n1 1 2 0\n0\n"A"\n"B"\n"Test"')
+
     def test_grammar_ballot_without_zero_terminator_parses_correctly(self):
         """Test that parser handles ballot lines without 0 terminator correctly."""
         # This should now parse successfully since we made terminators optional
@@ -322,3 +327,39 @@ Unquoted_Name
 
         assert ballots is not None, "Ballots section not found"
         assert len(ballots.children) == 6, f"Expected 6 ballot lines, got {len(ballots.children)}"  # pyright: ignore[reportAttributeAccessIssue]
+
+
+class TestGrammarCache:
+    """Test cases for the compiled grammar cache."""
+
+    BLT = '2 1\n-2\n3 1 2 0\n1 2=1 0\n0\n"Adam"\n"Basil"\n"Cool Election"\n'
+
+    def test_build_writes_cache(self, isolated_cache_dir):
+        """Test that building the parser writes the compiled tables to the cache dir."""
+        build_blt_parser()
+
+        assert grammar_cache_path().parent == isolated_cache_dir
+        assert grammar_cache_path().is_file()
+
+    def test_cached_parser_matches_uncached(self):
+        """Test that a parser loaded from the cache produces the same tree."""
+        build_blt_parser()
+        cached = build_blt_parser()
+        uncached = build_blt_parser(cache=False)
+
+        assert cached.parse(self.BLT) == uncached.parse(self.BLT)
+        title = cached.parse(self.BLT).children[-1]
+        assert isinstance(title, Tree)
+        assert title.children[0] == '"Cool Election"'
+
+    def test_build_without_cache(self):
+        """Test that cache=False leaves the cache dir untouched."""
+        build_blt_parser(cache=False)
+
+        assert not grammar_cache_path().exists()
+
+    def test_cache_key_includes_lark_version(self):
+        """Test that the cache file name changes with the Lark version."""
+        import lark
+
+        assert f"lark-{lark.__version__}" in grammar_cache_path().name
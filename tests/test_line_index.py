@@ -0,0 +1,128 @@
+"""
+Tests for paged ballot reading and the sidecar line index.
+"""
+
+from __future__ import annotations
+
+import gzip
+import os
+
+import pytest
+from typer.testing import CliRunner
+
+from fresh_blt.cli import app
+from fresh_blt.line_index import build_line_index, index_path_for, read_ballots
+from fresh_blt.parse import load_blt
+
+
+@pytest.fixture
+def blt_path(grammar_blt_content_withdrawn, tmp_path):
+    """A .blt file in its own directory, so sidecar indexes are cleaned up with it."""
+    path = tmp_path / "election.blt"
+    path.write_text(grammar_blt_content_withdrawn)
+    return path
+
+
+class TestReadBallots:
+    """Test reading pages of ballots without a full parse."""
+
+    def test_pages_match_full_parse(self, grammar_blt_file_withdrawn):
+        _, _, ballots = load_blt(grammar_blt_file_withdrawn, use_cache=False)
+
+        for offset in range(len(ballots) + 1):
+            page = read_ballots(grammar_blt_file_withdrawn, offset=offset, limit=2)
+
+            assert page.ballots == ballots[offset : offset + 2]
+            assert page.has_more == (offset + 2 < len(ballots))
+            assert page.total is None
+
+    def test_names_not_matching_header_fall_back(self, grammar_blt_content_withdrawn, tmp_path):
+        path = tmp_path / "extra.blt"
+        path.write_text(grammar_blt_content_withdrawn.replace('"Donald"\n', '"Donald"\n"Eve"\n'))
+        _, candidates, ballots = load_blt(path, use_cache=False)
+
+        page = read_ballots(path, offset=1, limit=2)
+
+        assert page.candidates == candidates
+        assert page.ballots == ballots[1:3]
+        assert (page.total, page.has_more) == (6, True)
+
+    def test_index_gives_same_pages(self, blt_path):
+        expected = [read_ballots(blt_path, o, 3) for o in range(7)]
+
+        assert build_line_index(blt_path) == index_path_for(blt_path)
+        for offset, page in enumerate(expected):
+            indexed = read_ballots(blt_path, offset, 3)
+            assert indexed.ballots == page.ballots
+            assert indexed.has_more == page.has_more
+            assert indexed.total == 6
+
+    def test_stale_index_is_ignored(self, blt_path):
+        build_line_index(blt_path)
+
+        blt_path.write_text(blt_path.read_text().replace("3 1 3 4", "\n3 1 3 4"))
+        os.utime(blt_path, ns=(0, 0))
+        page = read_ballots(blt_path, offset=1, limit=1)
+
+        assert page.total is None
+        assert page.ballots[0]["weight"] == 4
+
+    def test_compressed_input(self, grammar_blt_content_withdrawn, tmp_path):
+        path = tmp_path / "election.blt.gz"
+        path.write_bytes(gzip.compress(grammar_blt_content_withdrawn.encode()))
+
+        assert read_ballots(path, offset=5).ballots[0]["weight"] == 1
+        with pytest.raises(ValueError, match="uncompressed"):
+            build_line_index(path)
+
+    def test_spaced_ties_match_full_parse(self, tmp_path):
+        path = tmp_path / "spaced.blt"
+        path.write_text('3 1\n1 1 = 2 3 0\n2 3 =2= 1 0\n0\n"A"\n"B"\n"C"\n"Title"\n')
+        _, _, ballots = load_blt(path, use_cache=False)
+
+        page = read_ballots(path)
+
+        assert page.ballots == ballots
+        assert [len(level) for level in page.ballots[0]["rankings"]] == [2, 1]
+
+    def test_invalid_ballot_reports_line(self, tmp_path):
+        path = tmp_path / "bad.blt"
+        path.write_text('2 1\n1 1 2 0\n1 1 7 0\n0\n"A"\n"B"\n"Title"\n')
+
+        assert len(read_ballots(path, limit=1).ballots) == 1
+        with pytest.raises(ValueError, match="Line 3: Invalid candidate ID 7"):
+            read_ballots(path, limit=2)
+
+
+class TestBallotsPaging:
+    """Test the ballots command's --offset option and convert --to index."""
+
+    def test_ballots_offset(self, grammar_blt_file_withdrawn):
+        runner = CliRunner()
+
+        result = runner.invoke(
+            app, ["ballots", str(grammar_blt_file_withdrawn), "--offset", "4", "--limit", "1"]
+        )
+
+        assert result.exit_code == 0
+        assert "Showing ballots 5-5; more follow" in result.output
+
+    def test_more_candidates_than_names(self, tmp_path):
+        path = tmp_path / "short.blt"
+        path.write_text("5 1\n3 1 2 0\n0\nAdam\nBasil\nTitle\n")
+        runner = CliRunner()
+
+        result = runner.invoke(app, ["ballots", str(path)])
+
+        assert result.exit_code == 0
+        assert "Adam" in result.output
+
+    def test_convert_to_index(self, blt_path):
+        runner = CliRunner()
+
+        result = runner.invoke(app, ["convert", str(blt_path), "--to", "index"])
+        paged = runner.invoke(app, ["ballots", str(blt_path), "--offset", "4", "--limit", "1"])
+
+        assert result.exit_code == 0
+        assert index_path_for(blt_path).is_file()
+        assert "Showing ballots 5-5 of 6" in paged.output
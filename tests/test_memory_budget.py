@@ -0,0 +1,170 @@
+"""
+Memory budget tests: peak traced memory per ballot for the heavy code paths.
+
+Each budget is roughly 1.35x the peak measured when it was set. A failure means a
+change made the path hungrier; the message lists the allocation sites that dominated
+near the peak. If the increase is intended, raise the budget in the same change.
+"""
+
+from __future__ import annotations
+
+import gc
+import threading
+import tracemalloc
+from collections.abc import Callable
+from typing import Any
+
+import numpy as np
+import pytest
+
+from fresh_blt import export
+from fresh_blt.cli import load_blt_data
+from fresh_blt.export import create_ballots_dataframe, export_to_json, write_blt_stream
+from fresh_blt.fixtures.vectorized import iter_ballot_arrays
+
+NUM_BALLOTS = 1000
+NUM_CANDIDATES = 10
+
+# Peak traced bytes per ballot, for NUM_BALLOTS ballots over NUM_CANDIDATES candidates.
+BUDGETS = {
+    "load_blt_data": 6000,
+    "create_ballots_dataframe": 3000,
+    "export_to_json": 1900,
+}
+
+
+def peak_memory(func: Callable[[], Any]) -> tuple[Any, int]:
+    """Run `func`, returning its result and the peak memory it traced above the start."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        start = tracemalloc.get_traced_memory()[0]
+        result = func()
+        return result, tracemalloc.get_traced_memory()[1] - start
+    finally:
+        tracemalloc.stop()
+
+
+def peak_allocation_sites(func: Callable[[], Any], limit: int = 10) -> str:
+    """
+    Run `func` again, snapshotting whenever traced memory grows 10% past its previous
+    high, and describe the `limit` largest allocation sites of the last snapshot.
+    tracemalloc cannot snapshot at the exact peak; this comes close.
+    """
+    gc.collect()
+    tracemalloc.start(10)
+    snapshots = [tracemalloc.take_snapshot()]
+    high = tracemalloc.get_traced_memory()[0]
+    done = threading.Event()
+
+    def sample() -> None:
+        nonlocal high
+        while not done.wait(0.001):
+            current = tracemalloc.get_traced_memory()[0]
+            if current > high * 1.1:
+                high = current
+                snapshots.append(tracemalloc.take_snapshot())
+
+    sampler = threading.Thread(target=sample, daemon=True)
+    sampler.start()
+    try:
+        func()
+    finally:
+        done.set()
+        sampler.join()
+        tracemalloc.stop()
+
+    ignored = [
+        tracemalloc.Filter(False, module.__file__)
+        for module in (tracemalloc, threading)
+        if module.__file__ is not None
+    ]
+    stats = (
+        snapshots[-1]
+        .filter_traces(ignored)
+        .compare_to(snapshots[0].filter_traces(ignored), "lineno")
+    )
+    return "\n".join(f"  {stat}" for stat in stats[:limit])
+
+
+def assert_within_budget(name: str, func: Callable[[], Any]) -> Any:
+    result, peak = peak_memory(func)
+    per_ballot = peak / NUM_BALLOTS
+    if per_ballot > BUDGETS[name]:
+        pytest.fail(
+            f"{name} peaked at {per_ballot:.0f} bytes per ballot, over its budget of "
+            f"{BUDGETS[name]}. Largest allocation sites near the peak:\n"
+            f"{peak_allocation_sites(func)}"
+        )
+    return result
+
+
+@pytest.fixture(scope="module")
+def election_file(tmp_path_factory):
+    path = tmp_path_factory.mktemp("memory") / "election.blt"
+    write_blt_stream(
+        path,
+        "Memory budget",
+        [f"Candidate {i}" for i in range(1, NUM_CANDIDATES + 1)],
+        iter_ballot_arrays(NUM_CANDIDATES, NUM_BALLOTS, np.random.default_rng(1)),
+    )
+    return path
+
+
+@pytest.fixture
+def warmed_up(tmp_path):
+    """Run every path once so one-off costs (imports, the parser build) stay out of the budgets."""
+    warm_up = tmp_path / "warm_up.blt"
+    warm_up.write_text('2 1\n1 1 0\n0\n"A"\n"B"\n"Warm up"\n')
+    data = load_blt_data(warm_up)
+    create_ballots_dataframe(data[2], data[1])
+    export_to_json(*data, tmp_path / "warm_up.json", backend="stdlib")
+
+
+@pytest.fixture
+def election_data(warmed_up, election_file):
+    return load_blt_data(election_file)
+
+
+@pytest.fixture(autouse=True)
+def quiet_export():
+    export.console.quiet = True
+    yield
+    export.console.quiet = False
+
+
+class TestMemoryBudgets:
+    """Peak traced memory per ballot stays within budget."""
+
+    def test_load_blt_data(self, warmed_up, election_file):
+        # The cache directory is fresh for each test, so this parses the file.
+        info, _, ballots = assert_within_budget(
+            "load_blt_data", lambda: load_blt_data(election_file)
+        )
+
+        assert info["total_ballots"] == len(ballots) == NUM_BALLOTS
+
+    def test_create_ballots_dataframe(self, election_data):
+        _, candidates, ballots = election_data
+
+        df = assert_within_budget(
+            "create_ballots_dataframe", lambda: create_ballots_dataframe(ballots, candidates)
+        )
+
+        assert len(df) == NUM_BALLOTS
+
+    def test_export_to_json(self, election_data, tmp_path):
+        info, candidates, ballots = election_data
+        # Pin the stdlib encoder, which a plain install gets, so the budget does not
+        # depend on whether the optional orjson or msgspec extra is installed.
+        assert_within_budget(
+            "export_to_json",
+            lambda: export_to_json(
+                info, candidates, ballots, tmp_path / "e.json", backend="stdlib"
+            ),
+        )
+
+    def test_report_names_allocation_sites(self):
+        sites = peak_allocation_sites(lambda: [bytearray(1000) for _ in range(10_000)])
+
+        assert "test_memory_budget.py" in sites.splitlines()[0]
@@ -0,0 +1,126 @@
+"""
+Tests for the metadata-only .blt reader.
+"""
+
+from __future__ import annotations
+
+import gzip
+
+import pytest
+from lark import UnexpectedInput
+
+from fresh_blt import metadata
+from fresh_blt.metadata import load_blt_metadata
+from fresh_blt.parse import load_blt
+
+
+class TestLoadBltMetadata:
+    """Test that metadata scanning agrees with the full parse."""
+
+    def test_matches_full_parse(self, grammar_blt_file_withdrawn):
+        info, candidates = load_blt_metadata(grammar_blt_file_withdrawn)
+        full_info, full_candidates, _ = load_blt(grammar_blt_file_withdrawn, use_cache=False)
+
+        assert info == full_info
+        assert candidates == full_candidates
+        assert info["total_ballots"] == 6
+        assert info["total_votes"] == 13
+
+    def test_matches_generated_files(self, faker, tmp_path):
+        for seed in range(5):
+            faker.seed_instance(seed)
+            election = faker.election(num_candidates=6, num_ballots=50, withdrawn_rate=0.0)
+            path = tmp_path / f"election_{seed}.blt"
+            path.write_text(faker.blt_content(election))
+
+            full_info, full_candidates, _ = load_blt(path, use_cache=False)
+            assert load_blt_metadata(path) == (full_info, full_candidates)
+
+    def test_crlf_and_blank_lines(self, grammar_blt_content_withdrawn, tmp_path):
+        path = tmp_path / "crlf.blt"
+        path.write_bytes((grammar_blt_content_withdrawn + "\n\n").replace("\n", "\r\n").encode())
+
+        info, candidates = load_blt_metadata(path)
+
+        assert info["title"] == "Cool Election"
+        assert [c.name for c in candidates] == ["Adam", "Basil", "Charlotte", "Donald"]
+        assert info["withdrawn_candidate_ids"] == [2]
+
+    def test_escaped_names(self, grammar_blt_content_withdrawn, tmp_path):
+        path = tmp_path / "escaped.blt"
+        path.write_text(grammar_blt_content_withdrawn.replace('"Adam"', '"Adam \\"The Axe\\""'))
+
+        info, candidates = load_blt_metadata(path)
+
+        assert candidates[0].name == 'Adam "The Axe"'
+        assert (info, candidates) == load_blt(path, use_cache=False)[:2]
+
+    def test_name_of_zero(self, grammar_blt_content_withdrawn, tmp_path):
+        path = tmp_path / "zero.blt"
+        path.write_text(grammar_blt_content_withdrawn.replace('"Basil"', "0"))
+
+        info, candidates = load_blt_metadata(path)
+
+        assert [c.name for c in candidates] == ["Adam", "0", "Charlotte", "Donald"]
+        assert (info, candidates) == load_blt(path, use_cache=False)[:2]
+
+    def test_names_not_matching_header_fall_back(self, grammar_blt_content_withdrawn, tmp_path):
+        path = tmp_path / "extra.blt"
+        path.write_text(grammar_blt_content_withdrawn.replace('"Donald"\n', '"Donald"\n0\n'))
+
+        info, candidates = load_blt_metadata(path)
+
+        assert [c.name for c in candidates][-2:] == ["Donald", "0"]
+        assert (info, candidates) == load_blt(path, use_cache=False)[:2]
+
+    def test_more_candidates_than_names_fall_back(self, tmp_path):
+        path = tmp_path / "short.blt"
+        path.write_text("5 1\n3 1 2 0\n0\nAdam\nBasil\nTitle\n")
+
+        info, candidates = load_blt_metadata(path)
+
+        assert [c.name for c in candidates] == ["Adam", "Basil"]
+        assert info["num_candidates"] == 5
+        assert (info, candidates) == load_blt(path, use_cache=False)[:2]
+
+    def test_compressed_input(self, grammar_blt_content_withdrawn, tmp_path):
+        path = tmp_path / "election.blt.gz"
+        path.write_bytes(gzip.compress(grammar_blt_content_withdrawn.encode()))
+
+        info, _ = load_blt_metadata(path)
+
+        assert info["total_votes"] == 13
+
+    def test_small_chunks(self, grammar_blt_file_withdrawn, monkeypatch):
+        expected = load_blt_metadata(grammar_blt_file_withdrawn)
+        monkeypatch.setattr(metadata, "SCAN_CHUNK_SIZE", 1)
+
+        assert load_blt_metadata(grammar_blt_file_withdrawn) == expected
+
+    @pytest.mark.parametrize(
+        "content",
+        [
+            "",
+            "This is not a valid BLT file\nJust some random text\n123\n",
+        ],
+    )
+    def test_malformed_files(self, content, tmp_path):
+        path = tmp_path / "bad.blt"
+        path.write_text(content)
+
+        with pytest.raises(ValueError):
+            load_blt_metadata(path)
+
+    @pytest.mark.parametrize(
+        "content",
+        [
+            '4 2\n1 1 2 0\n"Adam"\n"Title"\n',
+            '4 2\n1 1 2 0\n0\n"Title"\n',
+        ],
+    )
+    def test_malformed_names_fail_full_parse(self, content, tmp_path):
+        path = tmp_path / "bad.blt"
+        path.write_text(content)
+
+        with pytest.raises(UnexpectedInput):
+            load_blt_metadata(path)
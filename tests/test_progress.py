@@ -0,0 +1,68 @@
+"""
+Tests for periodic progress logging.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import fresh_blt
+from fresh_blt import progress
+from fresh_blt.progress import log_progress
+
+logger = logging.getLogger("fresh_blt.tests.progress")
+
+
+class TestLogProgress:
+    """Test log_progress summaries and its disabled fast path."""
+
+    def test_returns_items_unchanged_when_info_disabled(self):
+        items = [1, 2, 3]
+        logger.setLevel(logging.WARNING)
+        try:
+            assert log_progress(items, logger, "Counting") is items
+        finally:
+            logger.setLevel(logging.NOTSET)
+
+    def test_logs_periodic_summaries(self, caplog, monkeypatch):
+        monkeypatch.setattr(progress, "PROGRESS_CHECK_EVERY", 2)
+
+        with caplog.at_level(logging.INFO, logger=logger.name):
+            items = list(log_progress(range(4), logger, "Counting", total=4, interval=0))
+
+        assert items == [0, 1, 2, 3]
+        records = [r for r in caplog.records if r.name == logger.name]
+        assert [r.progress_done for r in records] == [2, 4]
+        assert records[-1].progress_total == 4
+        assert records[-1].getMessage().startswith("Counting: 4/4 done (100.0%")
+
+    def test_no_per_item_messages(self, caplog, grammar_blt_file_withdrawn):
+        from fresh_blt.parse import load_blt
+
+        with caplog.at_level(logging.DEBUG, logger="fresh_blt"):
+            load_blt(grammar_blt_file_withdrawn, use_cache=False)
+
+        messages = [r.getMessage() for r in caplog.records]
+        assert not any("ballot 1" in message for message in messages)
+        assert not any("Created candidate:" in message for message in messages)
+
+
+class TestLibraryLogging:
+    """Test that importing the package leaves logging configuration alone."""
+
+    def test_import_does_not_configure_root_logger(self):
+        code = (
+            "import logging, fresh_blt.parse; "
+            "root = logging.getLogger(); "
+            "print(len(root.handlers), root.level)"
+        )
+        env = {**os.environ, "PYTHONPATH": str(Path(fresh_blt.__file__).parents[1])}
+        result = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, check=True, env=env
+        )
+
+        assert result.stdout.split() == ["0", str(logging.WARNING)]
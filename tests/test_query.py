@@ -0,0 +1,146 @@
+"""
+Tests for the bitmap-indexed ballot query engine.
+"""
+
+from __future__ import annotations
+
+import tracemalloc
+
+import numpy as np
+import pytest
+
+from fresh_blt.columnar import BallotArrays
+from fresh_blt.fixtures.vectorized import generate_ballot_arrays
+from fresh_blt.models.candidate import Candidate
+from fresh_blt.parse import load_blt
+from fresh_blt.query import BallotIndex, QueryError
+
+
+def level_of(ballot, candidate_id):
+    for level, ranking in enumerate(ballot["rankings"]):
+        if any(candidate.id == candidate_id for candidate in ranking):
+            return level
+    return None
+
+
+@pytest.fixture
+def index(grammar_blt_file_withdrawn):
+    _, candidates, ballots = load_blt(grammar_blt_file_withdrawn, use_cache=False)
+    return BallotIndex.from_ballots(ballots, candidates)
+
+
+class TestBallotIndex:
+    """Test query results against the fixture election and a plain loop."""
+
+    @pytest.mark.parametrize(
+        ("query", "ballots", "weight"),
+        [
+            ("Adam", 4, 11),
+            ("Adam > Basil", 3, 9),
+            ("Basil > Adam", 3, 4),
+            ("#1 = #3", 1, 2),
+            ("Charlotte in top 1", 2, 3),
+            ("Charlotte in top 2", 5, 12),
+            ("not Adam", 2, 2),
+            ("Adam > Charlotte > Donald", 2, 7),
+            ("(Basil or Donald) and not Charlotte in top 2", 1, 1),
+        ],
+    )
+    def test_fixture_queries(self, index, query, ballots, weight):
+        result = index.query(query)
+
+        assert (result.ballots, result.weight) == (ballots, weight)
+        assert (result.total_ballots, result.total_weight) == (6, 13)
+
+    def test_matches_loop_over_ballots(self):
+        candidates = [Candidate(id=i, name=f"Candidate {i}") for i in range(1, 7)]
+        arrays = generate_ballot_arrays(6, 3000, seed=4)
+        ballots = arrays.to_ballots({c.id: c for c in candidates})
+        index = BallotIndex.from_arrays(arrays, candidates)
+
+        def rank(ballot, candidate_id):
+            level = level_of(ballot, candidate_id)
+            return float("inf") if level is None else level
+
+        checks = {
+            "#1 > #2": lambda b: rank(b, 1) < rank(b, 2),
+            "#3 = #4": lambda b: level_of(b, 3) is not None and level_of(b, 3) == level_of(b, 4),
+            "#5 in top 2 or not #6": lambda b: rank(b, 5) < 2 or level_of(b, 6) is None,
+        }
+        for query, predicate in checks.items():
+            expected = [i for i, ballot in enumerate(ballots) if predicate(ballot)]
+            result = index.query(query)
+
+            assert result.ballot_indices().tolist() == expected
+            assert result.weight == sum(ballots[i]["weight"] for i in expected)
+
+    def test_names(self, index):
+        assert index.candidate_id("donald") == 4
+        assert index.candidate_id("Char") == 3
+        assert index.query('"Basil" > "Adam"').ballots == 3
+
+        with pytest.raises(QueryError, match="No candidate matches"):
+            index.query("Zed")
+        with pytest.raises(QueryError, match="No candidate with ID 9"):
+            index.query("#9")
+
+    def test_multi_word_and_ambiguous_names(self):
+        candidates = [
+            Candidate(id=1, name="Adam Cocks"),
+            Candidate(id=2, name="Adrian Mole"),
+            Candidate(id=3, name="Basil and Sybil"),
+        ]
+        ballots = [{"weight": 1, "rankings": [[candidates[0]], [candidates[2]]]}]
+        index = BallotIndex.from_ballots(ballots, candidates)
+
+        assert index.query("Adam Cocks > Adrian").ballots == 1
+        assert index.query('Adam > "Basil and Sybil"').ballots == 1
+        with pytest.raises(QueryError, match="matches several candidates"):
+            index.query("Ad")
+
+    def test_invalid_query(self, index):
+        with pytest.raises(QueryError, match="Invalid query"):
+            index.query("Adam >")
+
+    def test_weights_beyond_int64_sum(self):
+        candidates = [Candidate(id=1, name="A")]
+        arrays = BallotArrays(
+            weights=np.full(4, 2**62, dtype=np.int64),
+            level_offsets=np.arange(5, dtype=np.int64),
+            id_offsets=np.arange(5, dtype=np.int64),
+            candidate_ids=np.ones(4, dtype=np.int32),
+        )
+
+        result = BallotIndex.from_arrays(arrays, candidates).query("A")
+
+        assert result.weight == result.total_weight == 2**64
+
+    def test_memory_scales_with_rankings_not_candidates(self):
+        # Dense ranks for 2,000 candidates by 20,000 ballots would take 40 MB.
+        num_candidates, num_ballots = 2000, 20_000
+        candidates = [Candidate(id=i, name=f"C{i}") for i in range(1, num_candidates + 1)]
+        arrays = BallotArrays(
+            weights=np.ones(num_ballots, dtype=np.int64),
+            level_offsets=np.arange(num_ballots + 1, dtype=np.int64),
+            id_offsets=np.arange(num_ballots + 1, dtype=np.int64),
+            candidate_ids=(np.arange(num_ballots) % num_candidates + 1).astype(np.int32),
+        )
+
+        tracemalloc.start()
+        try:
+            index = BallotIndex.from_arrays(arrays, candidates)
+            result = index.query("#1 > #2 or #3 = #4")
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        assert result.ballots == num_ballots // num_candidates
+        assert peak < 4 * 1024 * 1024
+
+    def test_repeated_candidate_keeps_first_level(self):
+        candidates = [Candidate(id=1, name="A"), Candidate(id=2, name="B")]
+        a, b = candidates
+        index = BallotIndex.from_ballots([{"weight": 1, "rankings": [[b], [a], [b]]}], candidates)
+
+        assert [index.ranks(1)[0], index.ranks(2)[0]] == [1, 0]
+        assert index.query("B > A").ballots == 1
@@ -0,0 +1,116 @@
+"""
+Tests for the JSON serializer backends and JSON export schemas.
+"""
+
+from __future__ import annotations
+
+import io
+import json
+
+import pytest
+
+from fresh_blt.cli import load_blt_data
+from fresh_blt.export import export_to_json
+from fresh_blt.serializers import JSON_BACKENDS, get_json_backend
+
+
+def _installed_backends() -> list[str]:
+    backends = []
+    for name in JSON_BACKENDS:
+        try:
+            get_json_backend(name)
+        except ImportError:
+            continue
+        backends.append(name)
+    return backends
+
+
+class TestJsonBackends:
+    """Test that every installed backend produces equivalent JSON."""
+
+    def test_backends_agree(self):
+        data = {"title": "Élection", "ids": [1, 2, 3], "nested": {"withdrawn": False}}
+
+        for name in _installed_backends():
+            backend = get_json_backend(name)
+            assert json.loads(backend.dumps(data, True)) == data
+            compact = backend.dumps(data, False)
+            assert b"\n" not in compact
+            assert "Élection".encode() in compact
+
+    def test_dump_matches_dumps(self):
+        data = {"title": "Élection", "ballots": [{"weight": 2**70, "rankings": [[1]]}] * 5000}
+
+        for name in _installed_backends():
+            backend = get_json_backend(name)
+            for indent in (True, False):
+                out = io.BytesIO()
+                backend.dump(data, out, indent)
+                assert out.getvalue() == backend.dumps(data, indent)
+
+    def test_auto_prefers_installed_fast_backend(self):
+        assert get_json_backend("auto").name == _installed_backends()[0]
+
+    def test_unknown_backend(self):
+        with pytest.raises(ValueError, match="Unsupported JSON backend"):
+            get_json_backend("yaml")
+
+    def test_orjson_falls_back_for_big_integers(self):
+        pytest.importorskip("orjson")
+        data = {"weight": 2**70}
+
+        assert json.loads(get_json_backend("orjson").dumps(data, False)) == data
+
+    def test_msgspec_falls_back_for_big_integers(self, monkeypatch):
+        msgspec = pytest.importorskip("msgspec")
+
+        class RejectingEncoder:
+            def encode(self, obj):
+                raise OverflowError("can't serialize ints outside 64 bits")
+
+        monkeypatch.setattr(msgspec.json, "Encoder", RejectingEncoder)
+        backend = get_json_backend("msgspec")
+        data = {"weight": 2**70}
+        out = io.BytesIO()
+        backend.dump(data, out, True)
+
+        assert json.loads(backend.dumps(data, False)) == data
+        assert json.loads(out.getvalue()) == data
+
+
+class TestJsonExportSchemas:
+    """Test the full and compact JSON export layouts."""
+
+    def test_compact_schema_uses_candidate_ids(self, grammar_blt_file_withdrawn, tmp_path):
+        output_path = tmp_path / "compact.json"
+
+        export_to_json(*load_blt_data(grammar_blt_file_withdrawn), output_path, schema="compact")
+
+        data = json.loads(output_path.read_text())
+        assert data["ballots"][4] == {"weight": 2, "rankings": [[2, 4, 3], [1]]}
+        assert data["candidates"][1] == {"id": 2, "name": "Basil", "withdrawn": True}
+        assert data["summary"]["total_vote_weight"] == 13
+
+    def test_compact_is_smaller_than_full(self, grammar_blt_file_withdrawn, tmp_path):
+        loaded = load_blt_data(grammar_blt_file_withdrawn)
+
+        full = export_to_json(*loaded, tmp_path / "full.json")
+        compact = export_to_json(*loaded, tmp_path / "compact.json", schema="compact")
+
+        assert compact.stat().st_size < full.stat().st_size / 3
+
+    def test_full_schema_identical_across_backends(self, grammar_blt_file_withdrawn, tmp_path):
+        loaded = load_blt_data(grammar_blt_file_withdrawn)
+
+        outputs = [
+            json.loads(export_to_json(*loaded, tmp_path / f"{name}.json", backend=name).read_text())
+            for name in _installed_backends()
+        ]
+
+        assert all(output == outputs[0] for output in outputs)
+
+    def test_unknown_schema(self, grammar_blt_file_withdrawn, tmp_path):
+        with pytest.raises(ValueError, match="Unsupported JSON schema"):
+            export_to_json(
+                *load_blt_data(grammar_blt_file_withdrawn), tmp_path / "x.json", schema="tiny"
+            )
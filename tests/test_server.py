@@ -0,0 +1,177 @@
+"""
+Tests for the local election server, driven through a local asyncio HTTP client.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from fresh_blt.parse import load_blt
+from fresh_blt.server import ElectionCache, ElectionServer, parse_election
+
+
+async def fetch(connect, target: str) -> tuple[int, dict[str, Any]]:
+    reader, writer = await connect()
+    writer.write(f"GET {target} HTTP/1.1\r\nHost: localhost\r\n\r\n".encode())
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    head, _, body = response.partition(b"\r\n\r\n")
+    return int(head.split()[1]), json.loads(body)
+
+
+def run_with_server(scenario, socket_path: Path | None = None):
+    """Run `scenario(server, connect)` against a server on a free port or `socket_path`."""
+
+    async def main():
+        server = ElectionServer(workers=1)
+        listener = await server.start(port=0, socket_path=socket_path)
+        if socket_path is not None:
+
+            def connect():
+                return asyncio.open_unix_connection(socket_path)
+        else:
+            port = listener.sockets[0].getsockname()[1]
+
+            def connect():
+                return asyncio.open_connection("127.0.0.1", port)
+
+        try:
+            return await scenario(server, connect)
+        finally:
+            listener.close()
+            await listener.wait_closed()
+            server.close()
+
+    return asyncio.run(main())
+
+
+class TestElectionServer:
+    """Test the HTTP endpoints and the parse cache behind them."""
+
+    def test_info_parses_once(self, grammar_blt_file_withdrawn):
+        target = f"/info?path={grammar_blt_file_withdrawn}"
+
+        async def scenario(server, connect):
+            first = await fetch(connect, target)
+            second = await fetch(connect, target)
+            return first, second, server.parses
+
+        (status, body), second, parses = run_with_server(scenario)
+
+        info, candidates, _ = load_blt(grammar_blt_file_withdrawn, use_cache=False)
+        assert status == 200
+        assert body["election_info"] == info
+        assert [c["name"] for c in body["candidates"]] == [c.name for c in candidates]
+        assert second == (status, body)
+        assert parses == 1
+
+    def test_concurrent_requests_share_one_parse(self, grammar_blt_file_withdrawn):
+        target = f"/stats?path={grammar_blt_file_withdrawn}"
+
+        async def scenario(server, connect):
+            responses = await asyncio.gather(*(fetch(connect, target) for _ in range(3)))
+            return responses, server.parses
+
+        responses, parses = run_with_server(scenario)
+
+        assert parses == 1
+        for status, body in responses:
+            assert status == 200
+            assert body["first_preferences"] == {"1": 7, "3": 3, "4": 4}
+            assert body["total_votes"] == 13
+
+    def test_ballots_page(self, grammar_blt_file_withdrawn):
+        target = f"/ballots?path={grammar_blt_file_withdrawn}&offset=2&limit=3"
+
+        async def scenario(server, connect):
+            return await fetch(connect, target)
+
+        status, body = run_with_server(scenario)
+
+        _, _, ballots = load_blt(grammar_blt_file_withdrawn, use_cache=False)
+        expected = [
+            {"weight": b["weight"], "rankings": [[c.id for c in level] for level in b["rankings"]]}
+            for b in ballots[2:5]
+        ]
+        assert status == 200
+        assert body == {"offset": 2, "total": 6, "has_more": True, "ballots": expected}
+
+    def test_touched_file_is_not_reparsed(self, grammar_blt_file_withdrawn):
+        path = grammar_blt_file_withdrawn
+        target = f"/info?path={path}"
+
+        async def scenario(server, connect):
+            await fetch(connect, target)
+            stat = path.stat()
+            os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+            await fetch(connect, target)
+            touched_parses = server.parses
+
+            path.write_text(path.read_text().replace("Cool Election", "Cooler Election"))
+            _, body = await fetch(connect, target)
+            return touched_parses, server.parses, body
+
+        touched_parses, parses, body = run_with_server(scenario)
+
+        assert touched_parses == 1
+        assert parses == 2
+        assert body["election_info"]["title"] == "Cooler Election"
+
+    def test_errors(self, invalid_blt_file, tmp_path):
+        async def scenario(server, connect):
+            return [
+                await fetch(connect, "/info"),
+                await fetch(connect, f"/info?path={tmp_path / 'missing.blt'}"),
+                await fetch(connect, f"/info?path={invalid_blt_file}"),
+                await fetch(connect, "/nope"),
+                await fetch(connect, f"/ballots?path={invalid_blt_file}&limit=x"),
+            ]
+
+        statuses = [status for status, _ in run_with_server(scenario)]
+
+        assert statuses == [400, 404, 422, 404, 400]
+
+    def test_unix_socket(self, grammar_blt_file_withdrawn, tmp_path):
+        socket_path = tmp_path / "fresh_blt.sock"
+
+        async def scenario(server, connect):
+            return await fetch(connect, "/health")
+
+        status, body = run_with_server(scenario, socket_path)
+
+        assert status == 200
+        assert body["status"] == "ok"
+
+
+class TestElectionCache:
+    """Test LRU eviction under the memory budget."""
+
+    def test_evicts_least_recently_used(self, grammar_blt_file_withdrawn, valid_blt_file):
+        first = parse_election(str(grammar_blt_file_withdrawn))
+        second = parse_election(str(valid_blt_file))
+        cache = ElectionCache(max_bytes=first.nbytes + second.nbytes)
+
+        cache.put(first)
+        cache.put(second)
+        assert len(cache) == 2
+
+        cache.get(first.path)
+        cache.max_bytes = max(first.nbytes, second.nbytes)
+        cache.put(first)
+
+        assert cache.get(second.path) is None
+        assert cache.get(first.path) is first
+        assert cache.nbytes == first.nbytes
+
+    @pytest.mark.parametrize("offset", [0, 5, 100])
+    def test_ballot_page_bounds(self, grammar_blt_file_withdrawn, offset):
+        entry = parse_election(str(grammar_blt_file_withdrawn))
+
+        assert len(entry.ballot_page(offset, 10)) == max(0, min(10, 6 - offset))
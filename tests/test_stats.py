@@ -0,0 +1,39 @@
+"""
+Tests for single-pass election statistics.
+"""
+
+from __future__ import annotations
+
+from fresh_blt.parse import load_blt
+from fresh_blt.stats import compute_stats
+
+
+class TestComputeStats:
+    """Test compute_stats against the parsed fixture elections."""
+
+    def test_totals_match_election_info(self, grammar_blt_file_withdrawn, valid_blt_file):
+        for path in (grammar_blt_file_withdrawn, valid_blt_file):
+            info, candidates, ballots = load_blt(path, use_cache=False)
+
+            stats = compute_stats(candidates, ballots)
+
+            assert stats.total_ballots == info["total_ballots"]
+            assert stats.total_votes == info["total_votes"]
+
+    def test_first_preferences(self, grammar_blt_file_withdrawn):
+        _, candidates, ballots = load_blt(grammar_blt_file_withdrawn, use_cache=False)
+
+        stats = compute_stats(candidates, ballots)
+
+        # Candidate 2 is withdrawn; ties at the first level give each candidate the weight.
+        assert stats.first_preferences == {1: 7, 3: 3, 4: 4}
+        assert stats.ballots_with_ties == 2
+        assert stats.max_rankings == 3
+
+    def test_empty_ballots(self, grammar_blt_file_withdrawn):
+        _, candidates, _ = load_blt(grammar_blt_file_withdrawn, use_cache=False)
+
+        stats = compute_stats(candidates, [])
+
+        assert stats.total_votes == 0
+        assert set(stats.first_preferences.values()) == {0}
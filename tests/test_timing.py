@@ -0,0 +1,73 @@
+"""
+Tests for per-stage timing instrumentation.
+"""
+
+from __future__ import annotations
+
+import tracemalloc
+
+from fresh_blt.parse import load_blt
+from fresh_blt.timing import collect_timings, stage
+
+
+class TestCollectTimings:
+    """Test collecting stage metrics through the Python API."""
+
+    def test_load_blt_stages(self, grammar_blt_file_withdrawn):
+        with collect_timings() as timings:
+            load_blt(grammar_blt_file_withdrawn, use_cache=False)
+
+        names = [metrics.name for metrics in timings.stages]
+        assert names == ["parse_blt_file", "extract_candidates", "parse_ballots"]
+        for metrics in timings.stages:
+            assert metrics.wall_seconds >= 0
+            assert metrics.cpu_seconds >= 0
+            assert metrics.peak_memory_bytes is not None
+
+    def test_nested_stages(self):
+        with collect_timings() as timings:
+            with stage("outer"):
+                with stage("inner"):
+                    data = bytearray(1024 * 1024)
+                del data
+
+        outer, inner = timings.stages
+        assert (outer.name, outer.depth) == ("outer", 0)
+        assert (inner.name, inner.depth) == ("inner", 1)
+        # The outer stage's peak includes allocations made inside the inner one.
+        assert outer.peak_memory_bytes is not None
+        assert inner.peak_memory_bytes is not None
+        assert inner.peak_memory_bytes >= 1024 * 1024
+        assert outer.peak_memory_bytes >= inner.peak_memory_bytes
+        assert timings.total_seconds() == outer.wall_seconds
+
+    def test_without_memory_tracing(self):
+        with collect_timings(trace_memory=False) as timings, stage("work"):
+            pass
+
+        assert timings.stages[0].peak_memory_bytes is None
+        assert not tracemalloc.is_tracing()
+
+    def test_stage_is_noop_outside_collection(self):
+        with collect_timings() as timings:
+            pass
+        with stage("ignored"):
+            pass
+
+        assert timings.stages == []
+        assert not tracemalloc.is_tracing()
+
+    def test_to_dict(self):
+        with collect_timings(trace_memory=False) as timings, stage("work"):
+            pass
+
+        report = timings.to_dict()
+        assert report["stages"][0]["name"] == "work"
+        assert set(report["stages"][0]) == {
+            "name",
+            "wall_seconds",
+            "cpu_seconds",
+            "peak_memory_bytes",
+            "depth",
+        }
+        assert report["total_seconds"] == timings.total_seconds()
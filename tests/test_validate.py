@@ -0,0 +1,135 @@
+"""
+Tests for the streaming .blt validator.
+"""
+
+from __future__ import annotations
+
+import gzip
+import json
+import tracemalloc
+
+import pytest
+from typer.testing import CliRunner
+
+from fresh_blt.cli import app
+from fresh_blt.parse import load_blt
+from fresh_blt.validate import ValidationIssue, validate_blt
+
+BAD_BLT = """3 1
+-2
+-5
+2 1 2 3 0
+0 1 2 0
+-1 3 0
+1 1 4 0
+1 2 2=3 0
+1 1 0 2
+0
+"A"
+"B"
+"Title"
+"""
+
+
+@pytest.fixture
+def bad_blt_file(tmp_path):
+    path = tmp_path / "bad.blt"
+    path.write_text(BAD_BLT)
+    return path
+
+
+class TestValidateBlt:
+    """Test the validation report."""
+
+    def test_valid_files(self, grammar_blt_file_withdrawn, valid_blt_file):
+        for path in (grammar_blt_file_withdrawn, valid_blt_file):
+            report = validate_blt(path)
+            info, candidates, _ = load_blt(path, use_cache=False)
+
+            assert report.is_valid, report.errors
+            assert report.num_names == len(candidates)
+            assert report.total_ballots == info["total_ballots"]
+            assert report.total_votes == info["total_votes"]
+            assert report.withdrawn_candidate_ids == sorted(info["withdrawn_candidate_ids"])
+
+    def test_reports_every_error_with_line(self, bad_blt_file):
+        report = validate_blt(bad_blt_file)
+
+        assert report.errors == [
+            ValidationIssue(3, "Unknown withdrawn candidate ID 5"),
+            ValidationIssue(5, "Ballot weight must be a positive integer, got '0'"),
+            ValidationIssue(6, "Withdrawn candidate line after ballots"),
+            ValidationIssue(6, "Expected one withdrawn candidate per line"),
+            ValidationIssue(6, "Invalid withdrawn candidate '3'"),
+            ValidationIssue(6, "Invalid withdrawn candidate '0'"),
+            ValidationIssue(7, "Unknown candidate ID 4"),
+            ValidationIssue(8, "Candidate 2 ranked more than once"),
+            ValidationIssue(9, "Preferences after the 0 terminator"),
+            ValidationIssue(1, "Header declares 3 candidates but 2 names are given"),
+        ]
+        assert report.total_ballots == 5
+
+    def test_spaced_ties(self, tmp_path):
+        path = tmp_path / "spaced.blt"
+        path.write_text('3 1\n1 1 = 2 3 0\n2 3 =2= 1 0\n0\n"A"\n"B"\n"C"\n"Title"\n')
+        load_blt(path, use_cache=False)
+
+        report = validate_blt(path)
+
+        assert report.is_valid, report.errors
+        assert report.total_votes == 3
+
+    def test_missing_closing_line(self, tmp_path):
+        path = tmp_path / "unterminated.blt"
+        path.write_text("2 1\n1 1 2 0\n")
+
+        report = validate_blt(path)
+
+        assert report.errors == [ValidationIssue(2, "Missing 0 line closing the ballots")]
+
+    def test_max_errors_truncates_but_counts(self, bad_blt_file):
+        report = validate_blt(bad_blt_file, max_errors=2)
+
+        assert len(report.errors) == 2
+        assert report.error_count == 10
+        assert report.to_dict()["truncated"] is True
+
+    def test_huge_header_count_stays_small(self, tmp_path):
+        path = tmp_path / "huge_header.blt"
+        path.write_text('100000000 1\n1 1 2 0\n1 01 1 0\n0\n"A"\n"Title"\n')
+
+        tracemalloc.start()
+        try:
+            report = validate_blt(path)
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+        assert peak < 10 * 2**20
+        assert report.errors[0] == ValidationIssue(3, "Candidate 1 ranked more than once")
+
+    def test_compressed_input(self, grammar_blt_content_withdrawn, tmp_path):
+        path = tmp_path / "election.blt.gz"
+        path.write_bytes(gzip.compress(grammar_blt_content_withdrawn.encode()))
+
+        assert validate_blt(path).is_valid
+
+
+class TestValidateCommand:
+    """Test validate's error listing and JSON report."""
+
+    def test_lists_errors(self, bad_blt_file):
+        result = CliRunner().invoke(app, ["validate", str(bad_blt_file)])
+
+        assert result.exit_code == 1
+        assert "✗ Validation failed: 10 errors" in result.output
+        assert "line 7: Unknown candidate ID 4" in result.output
+
+    def test_json_report(self, bad_blt_file):
+        result = CliRunner().invoke(app, ["validate", str(bad_blt_file), "--json"])
+        report = json.loads(result.output)
+
+        assert result.exit_code == 1
+        assert report["valid"] is False
+        assert report["error_count"] == 10
+        assert report["errors"][0] == {"line": 3, "message": "Unknown withdrawn candidate ID 5"}
@@ -0,0 +1,88 @@
+"""
+Tests for incremental directory export.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+
+import pytest
+
+from fresh_blt.watch import STATE_FILE_NAME, Watcher
+
+
+@pytest.fixture
+def contest_dir(tmp_path, grammar_blt_content_withdrawn):
+    directory = tmp_path / "contests"
+    directory.mkdir()
+    for name in ("a", "b"):
+        (directory / f"{name}.blt").write_text(grammar_blt_content_withdrawn)
+    return directory
+
+
+def exported(watcher):
+    return sorted(result.source.name for result in watcher.poll())
+
+
+class TestWatcher:
+    """Test change detection and the state file."""
+
+    def test_exports_only_changed_files(self, contest_dir, tmp_path):
+        out = tmp_path / "out"
+        watcher = Watcher(contest_dir, out, workers=1)
+
+        assert exported(watcher) == ["a.blt", "b.blt"]
+        assert (out / "a.json").exists()
+        assert exported(watcher) == []
+
+        # Touched but unchanged: hashed and skipped.
+        stat = (contest_dir / "a.blt").stat()
+        os.utime(contest_dir / "a.blt", ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        assert exported(watcher) == []
+
+        path = contest_dir / "b.blt"
+        path.write_text(path.read_text().replace("Cool Election", "Cooler Election"))
+        (contest_dir / "c.blt").write_text(path.read_text())
+        assert exported(watcher) == ["b.blt", "c.blt"]
+        assert json.loads((out / "b.json").read_text())["election_info"]["title"] == (
+            "Cooler Election"
+        )
+
+    def test_state_survives_restart(self, contest_dir, tmp_path):
+        out = tmp_path / "out"
+        assert exported(Watcher(contest_dir, out, workers=1)) == ["a.blt", "b.blt"]
+
+        state = json.loads((out / STATE_FILE_NAME).read_text())
+        assert len(state["files"]) == 2
+        assert exported(Watcher(contest_dir, out, workers=1)) == []
+
+        # Different export settings invalidate the recorded state.
+        assert exported(Watcher(contest_dir, out, format="blt", workers=1)) == [
+            "a.blt",
+            "b.blt",
+        ]
+
+    def test_deleted_files_are_forgotten(self, contest_dir, tmp_path):
+        watcher = Watcher(contest_dir, tmp_path / "out", workers=1)
+        exported(watcher)
+
+        (contest_dir / "a.blt").unlink()
+        exported(watcher)
+
+        assert [key.rsplit("/", 1)[-1] for key in watcher.files] == ["b.blt"]
+
+    def test_failures_retried_only_after_change(self, contest_dir, tmp_path):
+        (contest_dir / "bad.blt").write_text("not a blt file\n")
+        watcher = Watcher(contest_dir, tmp_path / "out", workers=1)
+
+        results = {result.source.name: result for result in watcher.poll()}
+        assert results["bad.blt"].error is not None
+        assert exported(watcher) == []
+
+        (contest_dir / "bad.blt").write_text("still not a blt file\n")
+        assert exported(watcher) == ["bad.blt"]
+
+    def test_rejects_unknown_format(self, contest_dir, tmp_path):
+        with pytest.raises(ValueError, match="Unsupported format"):
+            Watcher(contest_dir, tmp_path / "out", format="parquet")